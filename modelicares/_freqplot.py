@@ -120,22 +120,46 @@ def default_frequency_range(syslist, in_Hz=True):
              ...
              6.28318531e+03])
     """
-    # Find the list of all poles and zeros in the systems.
-    features = []
-
     # Put the single system in a list if necessary.
     if not getattr(syslist, '__iter__', False):
         syslist = [syslist, ]
 
-    for sys in syslist:
-        try:
-            # Add new features to the list.
-            features = np.concatenate((features, np.abs(sys.pole()) * rad / s))
-            features = np.concatenate((features, np.abs(sys.zero()) * rad / s))
-        except:
-            pass
+    # Find the list of all poles and zeros in the systems.
+    return frequency_range(np.concatenate([[]] + [get_features(sys)
+                                                  for sys in syslist]), in_Hz)
+
+
+def get_features(sys):
+    """Return the magnitudes of the poles and zeros of a system as an array in
+    rad/s.
+
+    The zeros are excluded if they can't be calculated (i.e., the system isn't
+    square and Slycot isn't available).
+
+    **Example:**
 
+    >>> from control.matlab import ss
+
+    >>> sys = ss("-1. 0; 0 -10.", "1.; 1", "1. 1", "0.")
+    >>> sorted(get_features(sys))
+    [1.0, 5.5, 10.0]
+    """
+    magnitudes = np.abs(sys.pole())
+    try:
+        magnitudes = np.concatenate((magnitudes, np.abs(sys.zero())))
+    except NotImplementedError:
+        pass
+    return magnitudes * rad / s
+
+
+def frequency_range(features, in_Hz=True):
+    """Return a reasonable frequency range for frequency domain plots given the
+    magnitudes of the poles and zeros of the systems (*features*, in rad/s).
+
+    See :func:`default_frequency_range`.
+    """
     # Get rid of poles and zeros at the origin.
+    features = np.asarray(features, float)
     features = features[features != 0]
 
     # Make sure there is at least one point in the range.
@@ -170,6 +194,42 @@ def require_SISO(func):
     return wrapped
 
 
+def get_frequencies(syslist, freqs=None, in_Hz=True):
+    """Return an array of frequencies in rad/s given a list of frequencies, a
+    tuple of (min, max) frequencies, or 'None' for the default range.
+
+    **Parameters:**
+
+    - *syslist*: List of linear input/output systems (single system is OK)
+
+         This is only used to determine the default range (see
+         :func:`default_frequency_range`).
+
+    - *freqs*: List of frequencies, tuple of (min, max) frequencies, or 'None'
+
+    - *in_Hz*: If `True`, the frequencies (*freqs*) are in Hz (otherwise,
+      rad/s)
+
+    **Example:**
+
+    >>> f = get_frequencies(None, (1, 10), in_Hz=False)
+    >>> len(f), f[0], f[-1]
+    (21, 1.0, 10.0)
+    """
+    if freqs is None:
+        return default_frequency_range(syslist, in_Hz)
+        # TODO: Do something smarter for discrete.
+    if isinstance(freqs, tuple):
+        # Interpolate between the minimum and maximum frequencies.
+        assert len(freqs) == 2, ("The freqs tuple must be a pair with the "
+                                 "minimum and maximum frequencies.")
+        e = np.log10(freqs)
+        return np.logspace(e[0], e[1], np.diff(e) * 20 + 1) * (Hz if in_Hz else
+                                                               rad / s)
+        # 20 matches the default skip in nyquist_plot().
+    return np.asarray(freqs) * (Hz if in_Hz else rad / s)
+
+
 def overload_freqs(func):
     """Decorate a function to accept frequencies via (min, max) or default
     ('None'), as well as a list of frequencies.
@@ -178,20 +238,7 @@ def overload_freqs(func):
     def wrapped(sys, freqs=None, in_Hz=True, *args, **kwargs):
         """Updated function
         """
-        if freqs is None:
-            f = default_frequency_range(sys, in_Hz)
-            # TODO: Do something smarter for discrete.
-        elif isinstance(freqs, tuple):
-            # Interpolate between the minimum and maximum frequencies.
-            assert len(freqs) == 2, ("The freqs tuple must be a pair with the "
-                                     "minimum and maximum frequencies.")
-            e = np.log10(freqs)
-            f = np.logspace(e[0], e[1], np.diff(e) * 20 + 1) * (Hz if in_Hz else
-                                                                rad / s)
-            # 20 matches the default skip in nyquist_plot().
-        else:
-            f = freqs * (Hz if in_Hz else rad / s)
-
+        f = get_frequencies(sys, freqs, in_Hz)
         return func(sys, f, in_Hz, *args, **kwargs)
 
     return wrapped
@@ -199,6 +246,10 @@ def overload_freqs(func):
 
 def via_system(func):
     """Decorate a function to accept magnitude and phase via a system.
+
+    The original function, which accepts the magnitude, phase, and frequencies
+    directly, is available as the *from_response* attribute of the decorated
+    function (and of any functions decorated from it).
     """
     @wraps(func)
     def wrapped(sys, f, *args, **kwargs):
@@ -210,6 +261,7 @@ def via_system(func):
 
         return func(mag, phase, f, *args, **kwargs)
 
+    wrapped.from_response = func
     return wrapped
 
 
@@ -65,7 +65,7 @@ class PreviewPanel(wx.Panel):
             text += '\n' + 'displayUnit: ' + sim[name].displayUnit
             self.display.SetLabel(text)
             self.axes.clear()
-            self.axes.plot(sim[name].times(), sim[name].values())
+            self.axes.plot(sim[name].raw_times(), sim[name].raw_values())
             self.axes.set_ylabel(name + " / $%s$" %
                                  unit2tex(sim[name].unit))
             self.axes.set_xlabel("Time / s")
@@ -10,8 +10,20 @@ Classes:
 - :class:`Samples` - Specialized namedtuple to store the time and value
   information of a variable from Dymola\ :sup:`®`-formatted simulation results
 
+- :class:`MappedSamples` - Specialized namedtuple to store the time information
+  of a variable and the location of its values in a memory-mapped file
+
+- :class:`MappedBlock` - View of a memory-mapped trajectory matrix that
+  converts the values as they are read
+
+- :class:`VariableInfo` - Specialized namedtuple to store the parsed name,
+  description, and unit information of a variable
+
 Functions:
 
+- :func:`probe` - Check the header of a file for Dymola\ :sup:`®`-formatted
+  simulation results.
+
 - :func:`read` - Read variables from a MATLAB\ :sup:`®` (*.mat) or text (*.txt)
   file with Dymola\ :sup:`®`-formatted results.
 
@@ -54,10 +66,13 @@ __license__ = "BSD-compatible (see LICENSE.txt)"
 # Other:
 # pylint: disable=I0011, C0103, C0301
 
+import hashlib
 import numpy as np
+import os
 import re
+import weakref
 
-from collections import namedtuple
+from collections import namedtuple, OrderedDict
 from control.matlab import ss
 from itertools import count
 from natu import core as nc
@@ -67,13 +82,15 @@ from natu.units import s as second
 from scipy.io import loadmat
 from scipy.io.matlab.mio_utils import chars_to_strings
 from six import PY2
+from threading import Lock
 
 #from .._display import default_display_units
-from ..simres import Variable
+from ..simres import TimeBase, Variable
 from ..util import next_nonblank
 
 
-class Samples(namedtuple('Samples', ['times', 'signed_values', 'negated'])):
+class Samples(namedtuple('Samples', ['timebase', 'signed_values', 'negated',
+                                     'block', 'column'])):
 
    """Specialized namedtuple to store the time and value information of a
    variable from Dymola\ :sup:`®`-formatted simulation results
@@ -83,9 +100,23 @@ class Samples(namedtuple('Samples', ['times', 'signed_values', 'negated'])):
    file size is achieved in active memory.  It stems from the fact that many
    Modelica_ variables have opposite sign due to flow balances.
 
+   If the signed values are a column of a trajectory matrix (data_1, data_2,
+   etc.), then *block* is that matrix and *column* is the index of the column.
+   This allows calculations to be vectorized across the variables that share a
+   matrix.  Otherwise, *block* and *column* are 'None'.
+
+   The recorded times are stored in a :class:`~modelicares.simres.TimeBase`
+   that is shared by all of the variables of a trajectory matrix.
+
 
    .. _Modelica: http://www.modelica.org/
    """
+   @property
+   def times(self):
+       """The recorded times of the variable
+       """
+       return self.timebase.times
+
    @property
    def values(self):
        """The values of the variable
@@ -93,6 +124,193 @@ class Samples(namedtuple('Samples', ['times', 'signed_values', 'negated'])):
        return -self.signed_values if self.negated else self.signed_values
 
 
+class MappedBlock(object):
+
+   """View of a memory-mapped trajectory matrix that converts the values to
+   *dtype* and multiplies them by *scale* (the value of the unit) as they are
+   read
+
+   Indexing the view reads only the selected rows and columns from the file.
+   This allows calculations to be vectorized across the variables that share
+   a matrix without loading all of their values (see :class:`MappedSamples`).
+
+   **Example:**
+
+   >>> traj = np.array([[0.0, 1.0, 2.0], [1.0, 3.0, 4.0]])
+   >>> block = MappedBlock(traj, float, 2)
+   >>> block[:, [1, 2]].tolist()
+   [[2.0, 4.0], [6.0, 8.0]]
+   """
+
+   def __init__(self, mapped, dtype, scale):
+       self.mapped = mapped
+       self.dtype = np.dtype(dtype)
+       self.scale = scale
+
+   def __getitem__(self, index):
+       """Read and convert selected values."""
+       values = np.array(self.mapped[index], self.dtype)
+       if self.scale != 1:
+           values *= self.scale
+       return values
+
+   def __len__(self):
+       """Return the number of rows."""
+       return len(self.mapped)
+
+   @property
+   def shape(self):
+       """The shape of the matrix"""
+       return self.mapped.shape
+
+
+# Views of memory-mapped matrices by the identity of the matrix, the type, and
+# the scale, so that the variables of a matrix share a view while it is in use
+# (see MappedSamples.block)
+_MAPPED_BLOCKS = weakref.WeakValueDictionary()
+
+
+class MappedSamples(namedtuple('MappedSamples', ['timebase', 'mapped', 'column',
+                                                 'negated', 'dtype', 'scale',
+                                                 'cache'])):
+
+   """Specialized namedtuple to store the time information of a variable and
+   the location of its values in a memory-mapped trajectory matrix
+
+   The values are read from column *column* of *mapped* (the memory-mapped
+   matrix) when they are needed, converted to *dtype*, and multiplied by
+   *scale* (the value of the unit).  They are kept in *cache* (a
+   :class:`~modelicares.simres.TrajectoryCache`), which limits the memory used
+   by the values of all the variables of a simulation.
+
+   The negated field indicates if the values should be negated upon access (as
+   in :class:`Samples`).  It is ignored for Integer and Boolean values (*dtype*
+   `int` or `bool`), as when the trajectories are loaded into memory.
+
+   Calculations across many variables (e.g., the statistics of
+   :class:`~modelicares.simres.SimResList`) read the columns through *block* (a
+   :class:`MappedBlock`) instead, so they don't cycle the cache.  As when the
+   trajectories are loaded into memory, Integer and Boolean values aren't in a
+   block.
+
+   **Example:**
+
+   >>> from modelicares.simres import TimeBase, TrajectoryCache
+   >>> traj = np.array([[0.0, 1.0], [1.0, 0.0]])
+   >>> samples = MappedSamples(TimeBase(traj[:, 0]), traj, 1, True, bool, 1,
+   ...                         TrajectoryCache('1 MB'))
+   >>> samples.values.tolist()
+   [True, False]
+   >>> samples.block is None
+   True
+   """
+   @property
+   def block(self):
+       """View of the trajectory matrix (:class:`MappedBlock`), or 'None' for
+       Integer and Boolean values
+       """
+       if self.dtype in (int, bool):
+           return None
+       key = id(self.mapped), self.dtype, self.scale
+       block = _MAPPED_BLOCKS.get(key)
+       if block is None:
+           # The view keeps the matrix (and so its identity) alive.
+           block = _MAPPED_BLOCKS[key] = MappedBlock(self.mapped, self.dtype,
+                                                     self.scale)
+       return block
+
+   @property
+   def times(self):
+       """The recorded times of the variable
+       """
+       return self.timebase.times
+
+   @property
+   def signed_values(self):
+       """The values of the variable before negation
+       """
+       return self.cache.get((id(self.mapped), self.column, self.dtype,
+                              self.scale), self._load)
+
+   @property
+   def values(self):
+       """The values of the variable
+       """
+       if self.negated and self.dtype not in (int, bool):
+           return -self.signed_values
+       return self.signed_values
+
+   def _load(self):
+       """Read the values from the file."""
+       values = np.array(self.mapped[:, self.column], self.dtype)
+       if self.scale != 1:
+           values *= self.scale
+       return values
+
+
+class VariableInfo(namedtuple('VariableInfo', ['name', 'description', 'dtype',
+                                               'unit', 'scale', 'dimension',
+                                               'display_unit', 'data_set',
+                                               'column', 'negated'])):
+
+   """Specialized namedtuple to store the parsed name, description, and unit
+   information of a variable from Dymola\ :sup:`®`-formatted simulation results
+
+   *dtype* is the type that the values are converted to (`int` for Integer
+   variables, `bool` for Boolean variables, and 'None' otherwise).  *unit* is
+   the unit of the recorded values (or 'None' if the values aren't scaled) and
+   *scale* is its value (or 'None' if it is a :class:`natu.core.LambdaUnit`).
+   *data_set* is the number of the trajectory matrix (1 for data_1, etc.),
+   *column* is the index of the column within it, and *negated* indicates if
+   the values are recorded with opposite sign.
+
+   These are shared among all the results with the same 'name', 'description',
+   and 'dataInfo' matrices (see :func:`readsim`), so they shouldn't be
+   modified.
+   """
+
+
+# Numeric types of MATLAB\ :sup:`®` v4 matrices by the "P" digit of the header
+_MAT4_DTYPES = {0: 'f8', 1: 'f4', 2: 'i4', 3: 'i2', 4: 'u2', 5: 'u1'}
+
+
+def _mat4_index(fname):
+    r"""Return a dictionary of the matrices in a MATLAB\ :sup:`®` v4 file.
+
+    The keys are the names of the matrices and the values are tuples of the
+    data type, shape, and byte offset of the data of each matrix.  A
+    **ValueError** is raised if the file isn't in the v4 format.
+    """
+    index = {}
+    size = os.path.getsize(fname)
+    offset = 0
+    with open(fname, 'rb') as f:
+        while offset < size:
+            f.seek(offset)
+            header = np.frombuffer(f.read(20), '<i4')
+            if len(header) < 5:
+                raise ValueError('"%s" ends within a header.' % fname)
+            if not 0 <= header[0] < 2000:
+                header = header.byteswap()
+            mopt, n_rows, n_cols, imagf, namlen = [int(n) for n in header]
+            endian, zero, precision, kind = [int(digit) for digit
+                                              in '%04i' % mopt]
+            if (endian > 1 or zero or precision not in _MAT4_DTYPES
+                    or kind > 2 or min(n_rows, n_cols, namlen) < 0):
+                raise ValueError('"%s" is not a MATLAB v4 file.' % fname)
+            name = f.read(namlen).rstrip(b'\0').decode('latin-1')
+            dtype = np.dtype(('>' if endian else '<')
+                             + _MAT4_DTYPES[precision])
+            data_offset = offset + 20 + namlen
+            offset = data_offset + (n_rows*n_cols*dtype.itemsize
+                                    *(2 if imagf else 1))
+            if offset > size:
+                raise ValueError('"%s" ends within the "%s" matrix.'
+                                 % (fname, name))
+            index[str(name)] = dtype, (n_rows, n_cols), data_offset
+    return index
+
+
 if PY2:
     # For most strings (those besides the description), Unicode isn't
     # necessary.  Unicode support is less integrated in Python 2; Unicode
@@ -197,7 +415,146 @@ def loadtxt(file_name, variable_names=None, skip_header=1):
     return data
 
 
-def read(fname, constants_only=False):
+def probe(fname):
+    r"""Return *True* if a file appears to contain Dymola\ :sup:`®`-formatted
+    simulation results.
+
+    Only the header of the file (the "Aclass" variable) is read.
+
+    **Example:**
+
+    >>> probe('examples/ChuaCircuit.mat')
+    True
+    >>> probe('examples/PID.mat')
+    False
+    """
+    try:
+        try:
+            Aclass = get_strings(loadmat(fname, variable_names=['Aclass'],
+                                         chars_as_strings=False,
+                                         appendmat=False)['Aclass'])
+        except ValueError:
+            Aclass = loadtxt(fname, variable_names=['Aclass'])['Aclass']
+    except (IndexError, IOError, KeyError, TypeError, ValueError):
+        return False
+    return len(Aclass) > 0 and Aclass[0] == 'Atrajectory'
+
+
+def _parse_description(description):
+    """Parse a variable description string into description, unit, and
+    displayUnit.
+
+    If the display unit is not specified, the unit will be used instead.
+    """
+    description = description.rstrip(']')
+    displayUnit = ''
+    try:
+        description, unit = description.rsplit('[', 1)
+    except ValueError:
+        unit = ''
+    else:
+        unit = unit.replace('.', '*').replace('Ohm', 'ohm')
+        try:
+            unit, displayUnit = unit.rsplit('|', 1)
+        except ValueError:
+            pass  # (displayUnit = None)
+    description = description.rstrip()
+    if PY2:
+        description = description.decode('utf-8')
+
+    return description, unit, displayUnit
+
+
+def _parse_info(name, description, data_set, sign_col):
+    """Parse the name, description, and dataInfo entries of a variable into a
+    :class:`VariableInfo` instance.
+
+    Convert the unit into a :class:`natu.exponents.Exponents` instance.
+    """
+    description, unit_str, display_unit = _parse_description(description)
+    negated = sign_col < 0
+    column = (-sign_col if negated else sign_col) - 1
+    dtype = unit = None
+    scale = 1.0
+    if unit_str == ':#(type=Integer)':
+        dtype = int
+        dimension, display_unit = nc.Exponents(), ''
+    elif unit_str == ':#(type=Boolean)':
+        dtype = bool
+        dimension, display_unit = nc.Exponents(), ''
+    else:
+        try:
+            if unit_str.startswith(' '):
+                # The dimension is entered in Modelica as the unit.
+                dimension = nc.Exponents.fromstr(unit_str.lstrip())
+                if not display_unit:
+                    display_unit = default_display_units.find(dimension)
+            else:
+                if not display_unit:
+                    display_unit = unit_str
+                unit = U._units(**nc.Exponents.fromstr(unit_str))
+                dimension = nc.Exponents(nc.dimension(unit))
+                try:
+                    scale = float(nc.value(unit))
+                except TypeError:
+                    scale = None # The unit is a LambdaUnit.
+        except AttributeError:
+            # Something went wrong parsing the units so use default values.
+            unit = None
+            scale = 1.0
+            dimension, display_unit = '1', '/'
+    try:
+        display_unit = nc.UnitExponents.fromstr(display_unit.replace('.', '*'))
+    except AttributeError:
+        pass
+    return VariableInfo(name, description, dtype, unit, scale, dimension,
+                        display_unit, int(data_set), int(column), bool(negated))
+
+
+# Parsed information of the variables of Dymola-formatted simulation results by
+# a digest of their 'name', 'description', and 'dataInfo' matrices
+_METADATA = OrderedDict()
+_METADATA_SIZE = 16 # Maximum number of entries in _METADATA
+_METADATA_LOCK = Lock()
+
+
+def _metadata(names, descriptions, data_info):
+    """Return a tuple of :class:`VariableInfo` instances for the variables of
+    Dymola-formatted simulation results.
+
+    Results of the same model usually have identical 'name', 'description', and
+    'dataInfo' matrices.  The parsed information is kept (for the most
+    recently loaded models) and shared among those results, so the names,
+    descriptions, and units are only parsed and stored once.
+    """
+    data_info = np.ascontiguousarray(data_info[:, 0:2], int)
+    digest = hashlib.sha1()
+    for strings in [names, descriptions]:
+        joined = '\0'.join(strings)
+        if not isinstance(joined, bytes):
+            joined = joined.encode('utf-8')
+        digest.update(joined + b'\1')
+    digest.update(data_info.tostring())
+    key = digest.digest()
+    with _METADATA_LOCK:
+        try:
+            infos = _METADATA.pop(key)
+        except KeyError:
+            infos = None
+        else:
+            _METADATA[key] = infos
+    if infos is None:
+        infos = tuple(_parse_info(name, description, data_set, sign_col)
+                      for name, description, (data_set, sign_col)
+                      in zip(names, descriptions, data_info))
+        with _METADATA_LOCK:
+            infos = _METADATA.setdefault(key, infos)
+            while len(_METADATA) > _METADATA_SIZE:
+                _METADATA.popitem(last=False)
+    return infos
+
+
+def read(fname, constants_only=False, mapped=False):
     r"""Read variables from a MATLAB\ :sup:`®` (*.mat) or text file (*.txt) with
     Dymola\ :sup:`®`-formatted results.
 
@@ -210,6 +567,13 @@ def read(fname, constants_only=False):
     - *constants_only*: `True` to assume the result is from a simulation and
       read only the variables from the first data matrix
 
+    - *mapped*: `True` to memory-map the trajectory matrices after the first
+      one (data_2, data_3, etc.) instead of reading them
+
+         The matrices are read-only instances of :class:`numpy.memmap`.  This
+         only applies to MATLAB\ :sup:`®` v4 files (as written by Dymola\
+         :sup:`®`); other files are read entirely.
+
     **Returns:**
 
     1. A dictionary of variable names and values
@@ -220,6 +584,16 @@ def read(fname, constants_only=False):
     # Load the file.
     variable_names = ['Aclass', 'name', 'names', 'description', 'dataInfo',
                       'data', 'data_1'] if constants_only else None
+    to_map = {}
+    if mapped and not constants_only:
+        try:
+            index = _mat4_index(fname)
+        except (ValueError, IOError):
+            pass # Not a MATLAB v4 file; read it entirely.
+        else:
+            to_map = {name: entry for name, entry in index.items()
+                      if name.startswith('data_') and name != 'data_1'}
+            variable_names = [name for name in index if name not in to_map]
     try:
         data = loadmat(fname, variable_names=variable_names,
                        chars_as_strings=False, appendmat=False)
@@ -258,6 +632,12 @@ def read(fname, constants_only=False):
             elif transposed:
                 data[name] = value.T
 
+        # Map the trajectory matrices that weren't read.
+        for name, (dtype, shape, offset) in to_map.items():
+            matrix = (np.memmap(fname, dtype, 'r', offset, shape, order='F')
+                      if shape[0]*shape[1] else np.empty(shape, dtype))
+            data[name] = matrix.T if transposed else matrix
+
     else:
         # In a text file, only the data_1, data_2, etc. matrices are transposed.
         for name, value in data.items():
@@ -266,7 +646,7 @@ def read(fname, constants_only=False):
 
     return data, Aclass
 
-def readsim(fname, constants_only=False):
+def readsim(fname, constants_only=False, cache=None):
     r"""Load Dymola\ :sup:`®`-formatted simulation results.
 
     **Parameters:**
@@ -280,44 +660,53 @@ def readsim(fname, constants_only=False):
          parameters, and variables that don't vary.  If only that information is
          needed, it may save resources to set *constants_only* to `True`.
 
+    - *cache*: :class:`~modelicares.simres.TrajectoryCache` to hold the values
+      of the variables, which are then read on demand from memory-mapped
+      trajectory matrices
+
+         If *cache* is 'None' (default), all of the values are read at once.
+         The file is only memory-mapped if it is a MATLAB\ :sup:`®` v4 file;
+         otherwise, *cache* has no effect.
+
     **Returns:** A dictionary of variables (instances of
     :class:`~modelicares.simres.Variable`)
 
+    The names, descriptions, and units are parsed once for each model and shared
+    among the results of that model (those with the same 'name', 'description',
+    and 'dataInfo' matrices), so only the values are distinct.
+
     **Example:**
 
     >>> variables = readsim('examples/ChuaCircuit.mat')
     >>> variables['L.v'].unit
     'V'
+
+    >>> run1 = readsim('examples/ChuaCircuit/1/dsres.mat')
+    >>> run2 = readsim('examples/ChuaCircuit/2/dsres.mat')
+    >>> run1['L.v'].description is run2['L.v'].description
+    True
     """
     # This does the task of mfiles/traj/tload.m from the Dymola installation.
 
-    def parse_description(description):
-        """Parse a variable description string into description, unit, and
-        displayUnit.
+    def mapped_variable(times, traj, info):
+        """Create a variable with values in a memory-mapped trajectory matrix.
 
-        If the display unit is not specified, use the unit instead.  Convert the
-        unit into an :class:`natu.exponents.Exponents` instance.
+        The unit is applied when the values are read (see MappedSamples).
         """
-        description = description.rstrip(']')
-        displayUnit = ''
-        try:
-            description, unit = description.rsplit('[', 1)
-        except ValueError:
-            unit = ''
-        else:
-            unit = unit.replace('.', '*').replace('Ohm', 'ohm')
-            try:
-                unit, displayUnit = unit.rsplit('|', 1)
-            except ValueError:
-                pass  # (displayUnit = None)
-        description = description.rstrip()
-        if PY2:
-            description = description.decode('utf-8')
-
-        return description, unit, displayUnit
+        if info.scale is None:
+            # The unit is a LambdaUnit; apply it now.
+            get_value = np.vectorize(lambda n: info.unit._toquantity(n)._value)
+            values = get_value(traj[:, info.column])
+            return Variable(Samples(times, -values if info.negated else values,
+                                    False, None, None),
+                            info.dimension, info.display_unit, info.description)
+        dtype = info.dtype or traj.dtype.type # Native byte order
+        return Variable(MappedSamples(times, traj, info.column, info.negated,
+                                      dtype, info.scale, cache),
+                        info.dimension, info.display_unit, info.description)
 
     # Load the file.
-    data, Aclass = read(fname, constants_only)
+    data, Aclass = read(fname, constants_only, mapped=cache is not None)
 
     # Check the type of results.
     if Aclass[0] == 'AlinearSystem':
@@ -331,73 +720,65 @@ def readsim(fname, constants_only=False):
     # remains linked to the memory location where it is loaded by scipy.  The
     # negated variable is carried through so that copies aren't necessary.  If
     # changes are made to this code, be sure to compare the performance (e.g.,
-    # using %timeit in IPython).
+    # using %timeit in IPython).  Memory-mapped matrices are only read when the
+    # values of a variable are needed (see MappedSamples).
     version = Aclass[1]
     if version == '1.1':
         names = data['name']
 
-        # Extract the trajectories.
+        # Extract the trajectories.  All of the variables of a trajectory
+        # share the same time base.
         trajectories = []
+        timebases = []
         for i in count(1):
             try:
                 trajectories.append(data['data_%i' % i])
             except KeyError:
                 break # No more data sets
             else:
-                value = _apply_unit(trajectories[-1][:, 0], second)
-
-        # Create the variables.
+                times = trajectories[-1][:, 0]
+                if isinstance(times, np.memmap):
+                    times = np.array(times, float)
+                _apply_unit(times, second)
+                timebases.append(TimeBase(times))
+
+        # Create the variables.  The parsed names, descriptions, and units are
+        # shared with other results of the same model (see _metadata()).
+        infos = _metadata(names, data['description'], data['dataInfo'])
+        if constants_only:
+            # Only the first data matrix has been read.
+            infos = [info for info in infos if info.data_set == 1]
         variables = []
-        for name, description, [data_set, sign_col] \
-            in zip(names, data['description'], data['dataInfo'][:, 0:2]):
-            description, unit_str, display_unit = parse_description(description)
-            negated = sign_col < 0
-            traj = trajectories[data_set - 1]
-            signed_values =  traj[:, (-sign_col if negated else sign_col) - 1]
-            times = traj[:, 0]
-            if unit_str == ':#(type=Integer)':
-                variables.append(Variable(Samples(times,
-                                                  signed_values.astype(int),
-                                                  False),
-                                          nc.Exponents(), '', description))
-            elif unit_str == ':#(type=Boolean)':
-                variables.append(Variable(Samples(times,
-                                                  signed_values.astype(bool),
-                                                  False),
-                                          nc.Exponents(), '', description))
-            else:
-                try:
-                    if unit_str.startswith(' '):
-                        # The dimension is entered in Modelica as the unit.
-                        dimension = nc.Exponents.fromstr(unit_str.lstrip())
-                        if not display_unit:
-                            display_unit = default_display_units.find(dimension)
-                    else:
-                        if not display_unit:
-                            display_unit = unit_str
-                        unit = U._units(**nc.Exponents.fromstr(unit_str))
-                        try:
-                            _apply_unit(signed_values, unit)
-                        except TypeError or AttributeError:
-                            # The unit is a LambdaUnit.
-                            if negated:
-                                signed_values = -signed_values
-                                negated = False
-                            get_value = np.vectorize(lambda n:
-                                                     unit._toquantity(n)._value)
-                            signed_values = get_value(signed_values)
-                        dimension = nc.Exponents(nc.dimension(unit))
-                    variables.append(Variable(Samples(times,
-                                                      signed_values,
-                                                      negated),
-                                              dimension, display_unit, description))
-                except AttributeError:
-                    # Something went wrong parsing the units so add with default values
-                    variables.append(Variable(Samples(times,
-                                                      signed_values,
-                                                      negated),
-                                              '1', '/', description))
-        variables = dict(zip(names, variables))
+        for info in infos:
+            traj = trajectories[info.data_set - 1]
+            column = info.column
+            negated = info.negated
+            signed_values = traj[:, column]
+            times = timebases[info.data_set - 1]
+            if isinstance(traj, np.memmap):
+                variables.append(mapped_variable(times, traj, info))
+                continue
+            if info.dtype is not None:
+                # Integer or Boolean
+                signed_values = signed_values.astype(info.dtype)
+                negated = False
+                traj = column = None
+            elif info.scale is None:
+                # The unit is a LambdaUnit.
+                if negated:
+                    signed_values = -signed_values
+                    negated = False
+                get_value = np.vectorize(lambda n:
+                                         info.unit._toquantity(n)._value)
+                signed_values = get_value(signed_values)
+                traj = column = None # No longer in the block
+            elif info.scale != 1:
+                signed_values *= info.scale
+            variables.append(Variable(Samples(times, signed_values, negated,
+                                              traj, column),
+                                      info.dimension, info.display_unit,
+                                      info.description))
+        variables = dict(zip((info.name for info in infos), variables))
 
         # Time is from the last data set.
         #variables['Time'] = Variable(Samples(times, times, False),
@@ -406,9 +787,10 @@ def readsim(fname, constants_only=False):
 
     elif version == '1.0':
         traj = data['data']
-        times = traj[:, 0]*value(second)
+        times = TimeBase(traj[:, 0]*nc.value(second))
         return {name:
-                Variable(Samples(times, traj[:, i], False), None, None, '')
+                Variable(Samples(times, traj[:, i], False, traj, i),
+                         None, None, '')
                 for i, name in enumerate(data['names'])}
 
     raise AssertionError("The version of the Dymola-formatted result file (%s) "
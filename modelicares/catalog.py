@@ -0,0 +1,432 @@
+#!/usr/bin/python
+"""Persistent catalog of Modelica_ result files
+
+The catalog is an SQLite_ database with information about each result file:
+its path, modification time, size, the tool that wrote it, the simulated time
+range, the names of its variables, and the values of its constants.  Results
+can be selected by their parameters without opening the result files.
+
+Classes:
+
+- :class:`Catalog` - SQLite_ catalog of simulation and linearization result
+  files
+
+
+.. _Modelica: http://www.modelica.org/
+.. _SQLite: http://www.sqlite.org/
+"""
+__author__ = "Kevin Davies"
+__email__ = "kdavies4@gmail.com"
+__copyright__ = ("Copyright 2012-2014, Kevin Davies, Hawaii Natural Energy "
+                 "Institute, and Georgia Tech Research Corporation")
+__license__ = "BSD-compatible (see LICENSE.txt)"
+
+# Standard pylint settings for this project:
+# pylint: disable=I0011, C0302, C0325, R0903, R0904, R0912, R0913, R0914, R0915
+# pylint: disable=I0011, W0141, W0142
+
+import os
+import re
+import sqlite3
+from fnmatch import fnmatch
+from hashlib import sha1
+from multiprocessing import Pool, cpu_count
+
+from six import string_types
+
+from ._io.dymola import read
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS name_sets (
+    id INTEGER PRIMARY KEY,
+    hash TEXT UNIQUE,
+    names TEXT);
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE,
+    mtime REAL,
+    size INTEGER,
+    tool TEXT,
+    kind TEXT,
+    StartTime REAL,
+    StopTime REAL,
+    name_set INTEGER REFERENCES name_sets(id));
+CREATE TABLE IF NOT EXISTS constants (
+    file INTEGER REFERENCES files(id),
+    name TEXT,
+    value REAL,
+    PRIMARY KEY (file, name));
+"""
+
+# Columns of the files table that can be used directly in a query
+_FILE_COLUMNS = ['path', 'mtime', 'size', 'tool', 'kind', 'StartTime',
+                 'StopTime']
+
+# Words that are passed through to SQL as is in a query
+_SQL_WORDS = ['and', 'between', 'case', 'else', 'end', 'escape', 'glob', 'in',
+              'is', 'like', 'not', 'null', 'or', 'then', 'when']
+
+# Tokens of a query: a string literal, a quoted name, a number, or a name
+_TOKEN = re.compile(r"""('(?:[^']|'')*')"""
+                    r'|"([^"]+)"'
+                    r'|(\d+\.?\d*(?:[eE][-+]?\d+)?|\.\d+(?:[eE][-+]?\d+)?)'
+                    r'|([A-Za-z_][\w.]*(?:\[[\d, ]+\][\w.]*)*)')
+
+# Whitespace, operators, and punctuation allowed between the tokens of a query
+# ('--' and '/*', which start SQL comments, are rejected separately)
+_OPERATOR = re.compile(r'\s+|<=|>=|<>|!=|==|\|\||[-+*/%<>=(),]')
+
+# Minimum number of files to scan in parallel
+_MIN_PARALLEL = 8
+
+
+def _text(string):
+    """Return a string as text.
+
+    Under Python 2, the names in result files are UTF-8 encoded byte strings.
+    """
+    return string.decode('utf-8') if isinstance(string, bytes) else string
+
+
+def _scan(fname):
+    """Return a dictionary of information about a result file for the
+    catalog.
+
+    If the file can't be read, the kind is 'unknown'.
+    """
+    info = dict(tool=None, kind='unknown', StartTime=None, StopTime=None,
+                names=[], constants=[])
+    try:
+        data, Aclass = read(fname, constants_only=True)
+        if Aclass[0] == 'AlinearSystem':
+            data, Aclass = read(fname)
+            info.update(tool='dymola', kind='linearization',
+                        names=list(data['xuyName']))
+        elif Aclass[1] == '1.0':
+            times = data['data'][:, 0]
+            info.update(tool='dymola', kind='simulation',
+                        StartTime=float(times[0]), StopTime=float(times[-1]),
+                        names=list(data['names']))
+        else:
+            names = data['name']
+            data_1 = data['data_1']
+            constants = [(name, float(data_1[0, abs(sign_col) - 1]
+                                      * (1 if sign_col > 0 else -1)))
+                         for name, (data_set, sign_col)
+                         in zip(names, data['dataInfo'][:, 0:2])
+                         if data_set == 1 and sign_col != 0]
+            info.update(tool='dymola', kind='simulation',
+                        StartTime=float(data_1[0, 0]),
+                        StopTime=float(data_1[-1, 0]), names=list(names),
+                        constants=constants)
+    except (AssertionError, IndexError, IOError, KeyError, TypeError,
+            ValueError):
+        pass
+    return info
+
+
+class Catalog(object):
+    """SQLite_ catalog of simulation and linearization result files
+
+    **Parameters:**
+
+    - *fname*: Name of the database file (created if necessary)
+
+         Use ':memory:' for a catalog that isn't saved.
+
+    **Example:**
+
+    >>> catalog = Catalog(':memory:')
+    >>> catalog.refresh('examples/ChuaCircuit', processes=1)
+    2
+    >>> catalog.query('L.L > 15') # doctest: +ELLIPSIS
+    [u'.../examples/ChuaCircuit/2/dsres.mat']
+    >>> catalog.refresh('examples/ChuaCircuit') # Nothing has changed.
+    0
+
+
+    .. _SQLite: http://www.sqlite.org/
+    """
+
+    def __init__(self, fname='catalog.sqlite'):
+        self.fname = fname
+        self.connection = sqlite3.connect(fname)
+        self.connection.executescript(_SCHEMA)
+
+    def __enter__(self):
+        """Use the catalog as a context manager (closed upon exit)."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Close the catalog."""
+        self.close()
+
+    def __len__(self):
+        """Return the number of files in the catalog."""
+        return self.connection.execute(
+            "SELECT COUNT(*) FROM files").fetchone()[0]
+
+    def close(self):
+        """Close the database."""
+        self.connection.close()
+
+    def constants(self, fname):
+        """Return a dictionary of the constants of a result file in the
+        catalog.
+
+        **Example:**
+
+        >>> catalog = Catalog(':memory:')
+        >>> catalog.refresh('examples/ChuaCircuit.mat')
+        1
+        >>> catalog.constants('examples/ChuaCircuit.mat')['L.L']
+        18.0
+        """
+        return dict(self.connection.execute(
+            "SELECT name, value FROM constants JOIN files ON file = files.id "
+            "WHERE path = ?", (os.path.abspath(fname),)))
+
+    def names(self, fname):
+        """Return a list of the names of the variables in a result file in the
+        catalog.
+
+        Runs of the same model share the list in the database.
+        """
+        row = self.connection.execute(
+            "SELECT names FROM name_sets JOIN files ON name_set = name_sets.id "
+            "WHERE path = ?", (os.path.abspath(fname),)).fetchone()
+        return row[0].split('\n') if row and row[0] else []
+
+    def query(self, condition=None, kind='simulation'):
+        """Return a sorted list of the paths of the result files that meet a
+        condition.
+
+        **Parameters:**
+
+        - *condition*: Condition as an SQL expression
+
+             Names of variables (e.g., 'L.L') refer to the values of the
+             constants of each result.  Names that aren't valid identifiers
+             (e.g., 'C1.der(v)') can be enclosed in double quotes.  The
+             columns *path*, *mtime*, *size*, *tool*, *kind*, *StartTime*, and
+             *StopTime* can be used too.  For example,
+             ``"L.L > 15 and StopTime >= 1e4"``.  A result that doesn't have a
+             constant in the condition doesn't meet it.  If *condition* is
+             'None', all of the results of the kind are selected.
+
+             Besides the names, string literals, numbers, and the SQL words
+             above, only the arithmetic and comparison operators, '||', commas,
+             and parentheses are allowed.  Anything else (e.g., ';' or a
+             comment) raises a :class:`ValueError`.
+
+        - *kind*: Kind of results ('simulation', 'linearization', or 'None'
+          for all)
+
+        **Example:**
+
+        >>> catalog = Catalog(':memory:')
+        >>> catalog.query('L.L > 15; DROP TABLE files')
+        Traceback (most recent call last):
+        ...
+        ValueError: The condition can't contain ';' (at position 8).
+        """
+        clauses = []
+        parameters = []
+        if kind is not None:
+            clauses.append("kind = ?")
+            parameters.append(kind)
+        if condition:
+            clause, condition_parameters = self._translate(condition)
+            clauses.append("(%s)" % clause)
+            parameters += condition_parameters
+        sql = "SELECT path FROM files"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        return [row[0] for row in
+                self.connection.execute(sql + " ORDER BY path", parameters)]
+
+    def refresh(self, paths, patterns=['*.mat'], processes=None):
+        """Add or update result files in the catalog.
+
+        Only the files that are new or that have changed (by modification time
+        or size) since they were last cataloged are read.  Files that have been
+        removed from the directories are removed from the catalog.
+
+        **Parameters:**
+
+        - *paths*: Filename or directory or list of them
+
+             Directories are searched recursively.
+
+        - *patterns*: List of shell-style patterns for the filenames to be
+          included from the directories
+
+        - *processes*: Number of processes used to read the files
+
+             By default, the number of CPUs is used.
+
+        **Returns:** Number of files that were read
+        """
+        if isinstance(paths, string_types):
+            paths = [paths]
+
+        # Find the files.
+        found = {}
+        directories = []
+        for path in paths:
+            path = os.path.abspath(path)
+            if os.path.isdir(path):
+                directories.append(path)
+                for dirpath, _, fnames in os.walk(path):
+                    for fname in fnames:
+                        if any(fnmatch(fname, pattern) for pattern in patterns):
+                            fname = os.path.join(dirpath, fname)
+                            found[fname] = os.stat(fname)
+            else:
+                found[path] = os.stat(path)
+
+        # Compare them to the catalog.
+        cataloged = {}
+        for directory in directories:
+            prefix = directory + os.sep
+            cataloged.update(
+                (path, (file_id, mtime, size)) for path, file_id, mtime, size
+                in self.connection.execute(
+                    "SELECT path, id, mtime, size FROM files WHERE path LIKE ?",
+                    (prefix + '%',))
+                if path.startswith(prefix))
+        for path in found:
+            if path not in cataloged:
+                row = self.connection.execute(
+                    "SELECT id, mtime, size FROM files WHERE path = ?",
+                    (path,)).fetchone()
+                if row:
+                    cataloged[path] = row
+        stale = sorted(path for path, stat in found.items()
+                       if path not in cataloged
+                       or cataloged[path][1:] != (stat.st_mtime, stat.st_size))
+        removed = [cataloged[path][0] for path in cataloged
+                   if path not in found]
+
+        # Read the new and changed files.
+        if processes is None:
+            processes = cpu_count()
+        if processes > 1 and len(stale) >= _MIN_PARALLEL:
+            pool = Pool(processes)
+            try:
+                infos = pool.map(_scan, stale,
+                                 max(1, len(stale) // (4*processes)))
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            infos = [_scan(path) for path in stale]
+
+        # Update the database.
+        with self.connection:
+            for file_id in removed:
+                self._remove(file_id)
+            for path, info in zip(stale, infos):
+                if path in cataloged:
+                    self._remove(cataloged[path][0])
+                stat = found[path]
+                cursor = self.connection.execute(
+                    "INSERT INTO files (path, mtime, size, tool, kind, "
+                    "StartTime, StopTime, name_set) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (path, stat.st_mtime, stat.st_size, info['tool'],
+                     info['kind'], info['StartTime'], info['StopTime'],
+                     self._name_set(info['names'])))
+                self.connection.executemany(
+                    "INSERT OR REPLACE INTO constants (file, name, value) "
+                    "VALUES (?, ?, ?)",
+                    [(cursor.lastrowid, _text(name), value)
+                     for name, value in info['constants']])
+        return len(stale)
+
+    def _name_set(self, names):
+        """Return the id of a set of variable names, adding it if necessary.
+        """
+        names = u'\n'.join(_text(name) for name in names)
+        key = sha1(names.encode('utf-8')).hexdigest()
+        row = self.connection.execute(
+            "SELECT id FROM name_sets WHERE hash = ?", (key,)).fetchone()
+        if row:
+            return row[0]
+        return self.connection.execute(
+            "INSERT INTO name_sets (hash, names) VALUES (?, ?)",
+            (key, names)).lastrowid
+
+    def _remove(self, file_id):
+        """Remove a file from the catalog."""
+        self.connection.execute("DELETE FROM constants WHERE file = ?",
+                                (file_id,))
+        self.connection.execute("DELETE FROM files WHERE id = ?", (file_id,))
+
+    @staticmethod
+    def _translate(condition):
+        """Translate a query condition into SQL with parameters for the names
+        of the constants.
+
+        A :class:`ValueError` is raised if the condition contains anything
+        other than the tokens and operators of the documented grammar (see
+        :meth:`query`).
+        """
+        parameters = []
+
+        def replace(match):
+            """Replace a name with a lookup of its value."""
+            literal, quoted, number, name = match.groups()
+            if literal or number:
+                return literal or number
+            if name and (name.lower() in _SQL_WORDS or name in _FILE_COLUMNS):
+                return name
+            parameters.append(quoted or name)
+            return ("(SELECT value FROM constants "
+                    "WHERE file = files.id AND name = ?)")
+
+        pieces = []
+        position = 0
+        while position < len(condition):
+            match = _TOKEN.match(condition, position)
+            if match:
+                pieces.append(replace(match))
+            else:
+                match = _OPERATOR.match(condition, position)
+                if not match or condition.startswith(('--', '/*'), position):
+                    text = condition[position:position + (2 if match else 1)]
+                    raise ValueError("The condition can't contain %r (at "
+                                     "position %i)." % (text, position))
+                pieces.append(match.group())
+            position = match.end()
+        return ''.join(pieces), parameters
+
+
+if __name__ == '__main__':
+    # Test the contents of this file.
+
+    # pylint: disable=I0011, W0631
+
+    import doctest
+
+    if os.path.isdir('examples'):
+        doctest.testmod()
+    else:
+        # Create a link to the examples folder.
+        for example_dir in ['../examples', '../../examples']:
+            if os.path.isdir(example_dir):
+                break
+        else:
+            raise IOError("Could not find the examples folder.")
+        try:
+            os.symlink(example_dir, 'examples')
+        except AttributeError:
+            raise AttributeError("This method of testing isn't supported in "
+                                 "Windows.  Use runtests.py in the base "
+                                 "folder.")
+
+        # Test the docstrings in this file.
+        doctest.testmod()
+
+        # Remove the link.
+        os.remove('examples')
@@ -460,6 +460,10 @@ class Simulation(object):
         self._pool = pool
         self._output_dir = os.path.join(output_dir, str(simulation_num))
         self._kwargs = kwargs
+        # Result of the intervals loaded so far and their number (see the
+        # result property)
+        self._result = None
+        self._loaded_num = 0
         self._run(params, **options)
 
     def _run(self, params={}, **options):
@@ -528,14 +532,31 @@ class Simulation(object):
         :class:`modelicares.simres.SimRes` instance.  Otherwise, the result is a
         :class:`modelicares.simres.SimResSquence` containing the data from all
         of the intervals.
+
+        The result of each interval is loaded only once; later accesses append
+        only the intervals that have been simulated since to the sequence (see
+        :meth:`modelicares.simres.SimResSequence.append`).  Each access returns
+        a copy of the sequence (see
+        :meth:`modelicares.simres.SimResSequence.copy`), so a result obtained
+        earlier isn't changed when more intervals are simulated.  If there is
+        only one interval, the same :class:`~modelicares.simres.SimRes`
+        instance is returned each time.
         """
         if self._pool:
             self.wait()
-        if self.interval_num == 1:
-            return SimRes(os.path.join(self._output_dir, 'dsres1.mat'))
-        else:
-            return SimResSequence(*[os.path.join(self._output_dir, 'dsres%i.mat'
-                                    % (i + 1)) for i in range(self._interval_num)])
+        for i in range(self._loaded_num, self._interval_num):
+            sim = SimRes(os.path.join(self._output_dir,
+                                      'dsres%i.mat' % (i + 1)))
+            if self._result is None:
+                self._result = sim
+            elif isinstance(self._result, SimResSequence):
+                self._result.append(sim)
+            else:
+                self._result = SimResSequence([self._result, sim])
+            self._loaded_num = i + 1
+        if isinstance(self._result, SimResSequence):
+            return self._result.copy()
+        return self._result
 
     def wait(self, timeout=None):
         """Wait until the last interval has been simulated or until *timeout*
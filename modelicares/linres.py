@@ -27,6 +27,7 @@ __license__ = "BSD-compatible (see LICENSE.txt)"
 
 import os
 import numpy as np
+from multiprocessing import Pool
 
 from control.matlab import ss
 from functools import wraps
@@ -36,7 +37,8 @@ from scipy.signal import ss2tf
 from six import string_types
 
 from . import util
-from ._freqplot import bode_plot, nyquist_plot
+from ._freqplot import (bode_plot, frequency_range, get_frequencies,
+                        nyquist_plot)
 from ._res import Res, ResList
 
 # File loading functions
@@ -45,6 +47,41 @@ READERS = [('dymola', dymola)]  # LinRes tries these in order.
 # All of the keys should be in lowercase.
 
 
+def _get_indices(sys, iu=None, iy=None):
+    """Return the indices of an input and an output of a system given their
+    names or indices.
+
+    If the system has only one input or output, its index may be 'None'.
+    """
+    # Get the input index.
+    if iu is None:
+        if len(sys.input_names) == 1:
+            iu = 0
+        else:
+            raise IndexError("iu must be specified since this is a MI "
+                             "system.")
+    elif not isinstance(iu, int):
+        try:
+            iu = sys.input_names.index(iu)
+        except ValueError:
+            raise ValueError('The input "%s" is invalid.' % iu)
+
+    # Get the output index.
+    if iy is None:
+        if len(sys.output_names) == 1:
+            iy = 0
+        else:
+            raise IndexError("iy must be specified since this is a MO "
+                             "system.")
+    elif not isinstance(iy, int):
+        try:
+            iy = sys.output_names.index(iy)
+        except ValueError:
+            raise ValueError('The output "%s" is invalid.' % iy)
+
+    return iu, iy
+
+
 def _from_names(meth):
     """Return a method that accepts names or indices to identify system inputs
     and outputs, given a method that only accepts indices (*meth*).
@@ -66,37 +103,135 @@ def _from_names(meth):
 
              This must be specified unless the system has only one output.
         """
-        # Get the input index.
-        if iu is None:
-            if len(self.sys.input_names) == 1:
-                iu = 0
-            else:
-                raise IndexError("iu must be specified since this is a MI "
-                                 "system.")
-        elif not isinstance(iu, int):
-            try:
-                iu = self.sys.input_names.index(iu)
-            except ValueError:
-                raise ValueError('The input "%s" is invalid.' % iu)
-
-        # Get the output index.
-        if iy is None:
-            if len(self.sys.output_names) == 1:
-                iy = 0
-            else:
-                raise IndexError("iy must be specified since this is a MO "
-                                 "system.")
-        elif not isinstance(iy, int):
-            try:
-                iy = self.sys.output_names.index(iy)
-            except ValueError:
-                raise ValueError('The output "%s" is invalid.' % iy)
-
-        return meth(self, iu, iy)
+        return meth(self, *_get_indices(self.sys, iu, iy))
 
     return wrapped
 
 
+# Maximum condition number of the eigenvectors of the A matrix for the
+# frequency response to be calculated from the eigenvalue decomposition
+_MAX_CONDITION = 1e8
+
+# Maximum number of elements in the temporary arrays of _freqresp()
+_CHUNK_SIZE = 2**20
+
+# Minimum number of linearizations to evaluate in a pool of processes
+_MIN_PARALLEL = 8
+
+
+def _state_space(sys, omega):
+    """Return the A, B, C, and D matrices of a system as 2D float arrays and
+    the complex frequencies that correspond to angular frequencies *omega*
+    (exp(j*omega*dt) if the system is discrete, otherwise j*omega).
+    """
+    dt = getattr(sys, 'dt', None)
+    s = np.exp(1j * omega * dt) if dt else 1j * omega
+    return [np.atleast_2d(np.asarray(M, float))
+            for M in [sys.A, sys.B, sys.C, sys.D]] + [s]
+
+
+def _siso_freqresp(args):
+    """Return the frequency response of a SISO state-space system given a tuple
+    of the arguments to :func:`_freqresp`.
+
+    This is a module-level function so that it can be mapped over a process
+    pool.
+    """
+    return _freqresp(*args)[0, 0]
+
+
+def _analysis_item(sys, key):
+    """Return an item of the analysis of a system.
+
+    The key is 'poles', 'zeros', 'dcgain', or ('zeros', index of the input,
+    index of the output) for the zeros of an input/output pair.  The zeros of
+    the system are 'None' if they can't be calculated (i.e., the system isn't
+    square and Slycot isn't available).  The DC gain is a 2D array (outputs by
+    inputs).
+    """
+    if key == 'poles':
+        return sys.pole()
+    if key == 'dcgain':
+        return np.reshape(sys.dcgain(), (sys.outputs, sys.inputs))
+    if key == 'zeros':
+        try:
+            return sys.zero()
+        except NotImplementedError:
+            return None
+    _, iu, iy = key
+    return ss(sys.A, sys.B[:, iu], sys.C[iy, :], sys.D[iy, iu]).zero()
+
+
+def _analyze(args):
+    """Return a list of items of the analysis of a system given a tuple of the
+    system and a list of keys (see :func:`_analysis_item`).
+
+    This is a module-level function so that it can be mapped over a process
+    pool.
+    """
+    sys, keys = args
+    return [_analysis_item(sys, key) for key in keys]
+
+
+def _map(func, args, processes=None):
+    """Return a list of the results of a function applied to each of a list of
+    arguments.
+
+    A pool of *processes* processes is used only if *processes* is more than
+    one and there are at least as many arguments as processes (and at least
+    :data:`_MIN_PARALLEL`).  Otherwise, the function is applied in this process,
+    which avoids the start-up cost of the pool.
+    """
+    if (processes is not None and processes > 1
+            and len(args) >= max(processes, _MIN_PARALLEL)):
+        pool = Pool(processes)
+        try:
+            return pool.map(func, args, max(1, len(args) // (4*processes)))
+        finally:
+            pool.close()
+            pool.join()
+    return [func(arg) for arg in args]
+
+
+def _freqresp(A, B, C, D, s):
+    """Return the frequency response, C*(s*I - A)^-1*B + D, of a state-space
+    system at complex frequencies *s* as an array with dimensions (number of
+    outputs, number of inputs, number of frequencies).
+
+    A is decomposed into eigenvalues and eigenvectors once, so all of the
+    input/output pairs are evaluated at all of the frequencies by a single
+    product.  If the eigenvectors are ill-conditioned (e.g., A is defective),
+    the linear systems for all of the frequencies are solved at once instead,
+    in chunks of frequencies to limit the size of the temporary arrays.
+    """
+    A, B, C, D = [np.atleast_2d(np.asarray(M, float)) for M in [A, B, C, D]]
+    n = A.shape[0]
+    if n == 0:
+        return np.repeat(D[:, :, np.newaxis], len(s), axis=2).astype(complex)
+
+    eigenvalues, V = np.linalg.eig(A)
+    if np.linalg.cond(V) < _MAX_CONDITION:
+        # C*(s*I - A)^-1*B = (C*V)*diag(1/(s - eigenvalues))*(V^-1*B)
+        CV = C.dot(V)
+        VB = np.linalg.solve(V, B)
+        H = np.empty((C.shape[0], B.shape[1], len(s)), complex)
+        n_freqs = max(1, _CHUNK_SIZE // (n * B.shape[1]))
+        for start in range(0, len(s), n_freqs):
+            chunk = slice(start, start + n_freqs)
+            gains = 1 / (s[np.newaxis, chunk] - eigenvalues[:, np.newaxis])
+            H[:, :, chunk] = np.tensordot(CV, VB[:, :, np.newaxis]
+                                          * gains[:, np.newaxis, :], 1)
+    else:
+        H = np.empty((C.shape[0], B.shape[1], len(s)), complex)
+        n_freqs = max(1, _CHUNK_SIZE // n**2)
+        for start in range(0, len(s), n_freqs):
+            chunk = slice(start, start + n_freqs)
+            X = np.linalg.solve(s[chunk, np.newaxis, np.newaxis] * np.eye(n)
+                                - A, B[np.newaxis])
+            H[:, :, chunk] = np.einsum('yn,fnu->yuf', C, X)
+    return H + D[:, :, np.newaxis]
+
+
 class LinRes(Res):
 
     """Class for Modelica_-based linearization results and methods to analyze
@@ -120,6 +255,8 @@ class LinRes(Res):
 
     - :meth:`bode` - Create a Bode plot of the system's response.
 
+    - :meth:`freqresp` - Return the complex frequency response of the system.
+
     - :meth:`nyquist` - Create a Nyquist plot of the system's response.
 
     - :meth:`to_siso` - Return a SISO state-space system given input and output
@@ -129,6 +266,9 @@ class LinRes(Res):
 
     **Properties:**
 
+    - :attr:`dcgain` - DC gain of the system as an array with a row for each
+      output and a column for each input
+
     - :attr:`dirname` - Directory from which the variables were loaded
 
     - :attr:`fbase` - Base filename from which the variables were loaded, without
@@ -137,6 +277,11 @@ class LinRes(Res):
     - :attr:`fname` - Filename from which the variables were loaded, with absolute
       path
 
+    - :attr:`freqs` - Default frequencies (in Hz) for frequency-domain plots of
+      the system
+
+    - :attr:`poles` - Poles of the system
+
     - :attr:`sys` - State-space system as an instance of :class:`control.StateSpace`
 
          It contains:
@@ -158,6 +303,11 @@ class LinRes(Res):
     - :attr:`tool` - String indicating the function used to read the results
       (named after the corresponding Modelica_ tool)
 
+    - :attr:`zeros` - Transmission zeros of the system
+
+    The poles, zeros, DC gain, and default frequencies are each calculated when
+    first used and then cached.
+
     **Example:**
 
     >>> lin = LinRes('examples/PID.mat')
@@ -201,8 +351,106 @@ class LinRes(Res):
 
         # Remember the tool and filename.
         self.tool = tool
+        self._analysis = {}  # Poles, zeros, etc. (calculated when needed)
         super(LinRes, self).__init__(fname)
 
+    def _analyzed(self, key):
+        """Return an item of the analysis of the system (see
+        :func:`_analysis_item`), calculating and caching it if necessary.
+        """
+        try:
+            return self._analysis[key]
+        except KeyError:
+            value = self._analysis[key] = _analysis_item(self.sys, key)
+            return value
+
+    def _pair_keys(self, pairs):
+        """Return the analysis keys needed for the features of input/output
+        pairs (list of tuples of indices).
+
+        The zeros of a SISO system are those of its only pair.
+        """
+        if self.sys.inputs == self.sys.outputs == 1:
+            return ['poles', 'zeros']
+        return ['poles'] + [('zeros', iu, iy) for iu, iy in pairs]
+
+    def _features(self, pairs):
+        """Return the magnitudes (in rad/s) of the poles and zeros of
+        input/output pairs (list of tuples of indices).
+
+        All of the pairs share the poles of the system.
+        """
+        return np.concatenate([np.abs(self._analyzed(key))
+                               for key in self._pair_keys(pairs)])
+
+    @property
+    def dcgain(self):
+        """DC gain of the system as an array with a row for each output and a
+        column for each input
+
+        **Example:**
+
+        >>> lin = LinRes('examples/PID.mat')
+        >>> lin.dcgain.shape
+        (1, 1)
+        """
+        return self._analyzed('dcgain')
+
+    @property
+    def freqs(self):
+        """Default frequencies (in Hz) for frequency-domain plots of the system
+
+        The range extends two decades beyond the poles and zeros of all of the
+        input/output pairs.
+        """
+        if 'freqs' not in self._analysis:
+            self._analysis['freqs'] = frequency_range(
+                self._features([(iu, iy) for iu in range(self.sys.inputs)
+                                for iy in range(self.sys.outputs)])) / (2*np.pi)
+        return self._analysis['freqs']
+
+    @property
+    def poles(self):
+        """Poles of the system
+
+        **Example:**
+
+        >>> lin = LinRes('examples/PID.mat')
+        >>> lin.poles is lin.poles
+        True
+        """
+        return self._analyzed('poles')
+
+    @property
+    def zeros(self):
+        """Transmission zeros of the system
+
+        An error is raised if the system isn't square and `Slycot
+        <https://github.com/python-control/Slycot>`_ isn't available.
+        """
+        zeros = self._analyzed('zeros')
+        if zeros is None:
+            raise NotImplementedError("The zeros of a system with a different "
+                                      "number of inputs than outputs require "
+                                      "Slycot.")
+        return zeros
+
+    def _responses(self, pairs, kwargs):
+        """Return the frequencies (in rad/s) and the complex frequency responses
+        of input/output pairs for a Bode or Nyquist plot.
+
+        The *freqs* entry is removed from *kwargs* (a dictionary of the keyword
+        arguments of the plot) and the *in_Hz* entry is set.
+        """
+        in_Hz = kwargs.setdefault('in_Hz', True)
+        freqs = kwargs.pop('freqs', None)
+        if freqs is None:
+            f = frequency_range(self._features(
+                [_get_indices(self.sys, iu, iy) for iu, iy in pairs]), in_Hz)
+        else:
+            f = get_frequencies(None, freqs, in_Hz)
+        return f, self.freqresp(f, pairs, in_Hz=False)
+
     def __str__(self):
         """Return an informal description of the :class:`LinRes` instance.
 
@@ -270,6 +518,51 @@ class LinRes(Res):
         return ss2tf(self.sys.A, self.sys.B,
                      self.sys.C[iy, :], self.sys.D[iy, :], input=iu)
 
+    def freqresp(self, freqs, pairs=None, in_Hz=True):
+        """Return the complex frequency response of the system.
+
+        All of the requested transfer functions are evaluated at all of the
+        frequencies at once (from a single eigenvalue decomposition of the A
+        matrix), which is much faster than evaluating each transfer function
+        separately.
+
+        **Parameters:**
+
+        - *freqs*: List or array of frequencies
+
+        - *pairs*: List of (input name or index, output name or index) tuples of
+          each transfer function to be evaluated
+
+             By default, all of the transfer functions are evaluated.
+
+        - *in_Hz*: If `True` (default), the frequencies (*freqs*) are in Hz
+          (otherwise, rad/s)
+
+        **Returns:** If *pairs* is 'None', a complex array with dimensions
+        (number of outputs, number of inputs, number of frequencies).
+        Otherwise, a complex array with a row for each pair and a column for
+        each frequency.
+
+        **Example:**
+
+        >>> lin = LinRes('examples/PID.mat')
+        >>> lin.freqresp([0.1, 1, 10]).shape
+        (1, 1, 3)
+        """
+        omega = np.asarray(freqs, float) * (2 * np.pi if in_Hz else 1)
+        A, B, C, D, s = _state_space(self.sys, omega)
+        if pairs is None:
+            return _freqresp(A, B, C, D, s)
+
+        # Evaluate only the inputs and outputs in the pairs.
+        pairs = [_get_indices(self.sys, iu, iy) for iu, iy in pairs]
+        inputs = sorted(set(iu for iu, _ in pairs))
+        outputs = sorted(set(iy for _, iy in pairs))
+        H = _freqresp(A, B[:, inputs], C[outputs, :],
+                      D[np.ix_(outputs, inputs)], s)
+        return np.array([H[outputs.index(iy), inputs.index(iu)]
+                         for iu, iy in pairs]).reshape(len(pairs), len(omega))
+
     def bode(self, axes=None, pairs=None, label='bode',
              title=None, colors=['b', 'g', 'r', 'c', 'm', 'y', 'k'],
              styles=[(None, None), (3, 3), (1, 1), (3, 2, 1, 2)], **kwargs):
@@ -371,8 +664,11 @@ class LinRes(Res):
             pairs = [(iu, iy) for iu in range(self.sys.inputs)
                      for iy in range(self.sys.outputs)]
 
+        # Evaluate all of the pairs at once.
+        f, responses = self._responses(pairs, kwargs)
+
         # Create the plots.
-        for i, (iu, iy) in enumerate(pairs):
+        for i, ((iu, iy), response) in enumerate(zip(pairs, responses)):
             style = styles[np.mod(i, n_styles)]
             if isinstance(style, string_types):
                 kwargs['linestyle'] = style
@@ -380,9 +676,11 @@ class LinRes(Res):
             else:
                 kwargs['dashes'] = style
                 kwargs.pop('linestyle', None)
-            bode_plot(self.to_siso(iu, iy), axes=axes,
-                      label='$Y_{%i}/U_{%i}$' % (iy, iu),
-                      color=colors[np.mod(i, n_colors)], **kwargs)
+            bode_plot.from_response(np.abs(response), np.angle(response), f,
+                                    axes=axes,
+                                    label='$Y_{%i}/U_{%i}$' % (iy, iu),
+                                    color=colors[np.mod(i, n_colors)],
+                                    **kwargs)
             # Note: ._freqplot.bode() is currently only implemented for
             # SISO systems.
             # 5/23/11: Since ._freqplot.bode() already uses subplots for
@@ -493,11 +791,16 @@ class LinRes(Res):
             pairs = [(iu, iy) for iu in range(self.sys.inputs)
                      for iy in range(self.sys.outputs)]
 
+        # Evaluate all of the pairs at once.
+        f, responses = self._responses(pairs, kwargs)
+
         # Create the plots.
-        for i, (iu, iy) in enumerate(pairs):
-            nyquist_plot(self.to_siso(iu, iy), ax=ax,
-                         label=r'$Y_{%i}/U_{%i}$' % (iy, iu),
-                         color=colors[np.mod(i, n_colors)], **kwargs)
+        for i, ((iu, iy), response) in enumerate(zip(pairs, responses)):
+            nyquist_plot.from_response(np.abs(response), np.angle(response), f,
+                                       ax=ax,
+                                       label=r'$Y_{%i}/U_{%i}$' % (iy, iu),
+                                       color=colors[np.mod(i, n_colors)],
+                                       **kwargs)
             # Note: modelicares._freqplot.nyquist() is currently only
             # implemented for SISO systems.
 
@@ -605,12 +908,22 @@ class LinResList(ResList):
 
     **Additional methods:**
 
+    - :meth:`analyze` - Calculate and cache the poles, zeros, and DC gains of
+      the linearizations (optionally in parallel).
+
     - :meth:`bode` - Plot the linearizations onto a single Bode diagram.
 
+    - :meth:`freqresp` - Return the frequency responses of the linearizations
+      over a common set of frequencies.
+
     - :meth:`nyquist` - Plot the linearizations onto a single Bode diagram.
 
     **Properties:**
 
+    - :attr:`dcgain`, :attr:`poles`, :attr:`zeros` - Lists of the DC gains,
+      poles, and zeros of the linearizations (use :meth:`analyze` first to
+      calculate them in parallel)
+
     - :attr:`dirname` - Highest common directory that the result files share
 
     - Also, the properties of :class:`LinRes` (:attr:`basename`,
@@ -773,14 +1086,150 @@ class LinResList(ResList):
 
         return labels
 
+    def analyze(self, processes=None):
+        """Calculate and cache the poles, zeros, and DC gains of the
+        linearizations.
+
+        The items that haven't already been calculated are calculated,
+        optionally in parallel.  The results are available from the
+        :attr:`poles`, :attr:`zeros`, and :attr:`dcgain` properties of each
+        linearization or of the list.
+
+        **Parameters:**
+
+        - *processes*: Number of processes
+
+             By default ('None'), the linearizations are analyzed in this
+             process.  A pool of processes is only used if there are at least
+             as many linearizations to analyze as processes (and at least 8);
+             since it is started for each call, it pays off only for large
+             lists.
+
+        **Example:**
+
+        >>> lins = LinResList('examples/PID/*/')
+        >>> lins.analyze()
+        >>> len(lins.poles)
+        2
+        """
+        self._analyze([['poles', 'zeros', 'dcgain']] * len(self), processes)
+
+    def _analyze(self, keys, processes=None):
+        """Calculate and cache items of the analyses of the linearizations given
+        a list of the keys (see :func:`_analysis_item`) for each one.
+        """
+        pending = []
+        for lin, lin_keys in zip(self, keys):
+            lin_keys = [key for key in lin_keys if key not in lin._analysis]
+            if lin_keys:
+                pending.append((lin, lin_keys))
+        results = _map(_analyze, [(lin.sys, lin_keys)
+                                  for lin, lin_keys in pending], processes)
+        for (lin, lin_keys), values in zip(pending, results):
+            lin._analysis.update(zip(lin_keys, values))
+
+    @property
+    def dcgain(self):
+        """List of the DC gains of the linearizations (see
+        :attr:`LinRes.dcgain`)
+        """
+        return [lin.dcgain for lin in self]
+
+    @property
+    def poles(self):
+        """List of the poles of the linearizations (see :attr:`LinRes.poles`)
+        """
+        return [lin.poles for lin in self]
+
+    @property
+    def zeros(self):
+        """List of the zeros of the linearizations (see :attr:`LinRes.zeros`)
+        """
+        return [lin.zeros for lin in self]
+
+    def freqresp(self, freqs=None, pair=(0, 0), in_Hz=True, processes=None):
+        """Return the complex frequency responses of the linearizations over a
+        common set of frequencies.
+
+        **Parameters:**
+
+        - *freqs*: List or frequencies or tuple of (min, max) frequencies
+
+             If *freqs* is 'None', then a range that covers all of the
+             linearizations will be determined automatically.
+
+        - *pair*: Tuple of (input name or index, output name or index) for the
+          transfer function to be chosen from each system (applied to all)
+
+             This is ignored if the system is SISO.
+
+        - *in_Hz*: If `True` (default), the frequencies are in Hz (otherwise,
+          rad/s)
+
+        - *processes*: Number of processes used to evaluate the responses
+
+             By default ('None'), the responses are evaluated in this process.
+             A pool of processes is only used if there are at least as many
+             linearizations as processes (and at least 8); since it is started
+             for each call, it pays off only for large lists.
+
+        **Returns:**
+
+        1. *freqs*: Array of frequencies (in Hz if *in_Hz* is `True`, otherwise
+           rad/s)
+
+        2. *responses*: Complex array of the frequency responses with a row for
+           each linearization and a column for each frequency
+
+        A :class:`ValueError` is raised if the list is empty.
+
+        **Example:**
+
+        >>> lins = LinResList('examples/PID/*/')
+        >>> freqs, responses = lins.freqresp((0.1, 10))
+        >>> responses.shape
+        (2, 41)
+
+        >>> LinResList().freqresp()
+        Traceback (most recent call last):
+        ...
+        ValueError: There are no linearizations.
+        """
+        if not len(self):
+            raise ValueError("There are no linearizations.")
+
+        # Resolve the transfer function of each linearization.
+        indices = [(0, 0) if lin.sys.inputs == lin.sys.outputs == 1
+                   else _get_indices(lin.sys, *pair) for lin in self]
+
+        # Determine the frequencies.
+        if freqs is None:
+            self._analyze([lin._pair_keys([lin_pair])
+                           for lin, lin_pair in zip(self, indices)], processes)
+            omega = frequency_range(np.concatenate(
+                [lin._features([lin_pair])
+                 for lin, lin_pair in zip(self, indices)]), in_Hz)
+        else:
+            omega = get_frequencies(None, freqs, in_Hz)
+
+        # Evaluate the responses.
+        args = []
+        for lin, (iu, iy) in zip(self, indices):
+            A, B, C, D, s = _state_space(lin.sys, omega)
+            args.append((A, B[:, [iu]], C[[iy], :], D[[iy]][:, [iu]], s))
+        responses = _map(_siso_freqresp, args, processes)
+
+        return (omega / (2 * np.pi if in_Hz else 1),
+                np.array(responses).reshape(len(args), len(omega)))
+
     def bode(self, axes=None, pair=(0, 0), label='bode', title="Bode plot",
              labels=None, colors=['b', 'g', 'r', 'c', 'm', 'y', 'k'],
              styles=[(None, None), (3, 3), (1, 1), (3, 2, 1, 2)], leg_kwargs={},
-             **kwargs):
+             processes=None, **kwargs):
         r"""Plot the linearizations onto a single Bode diagram.
 
-        This method calls :meth:`LinRes.bode` from the included instances
-        of :class:`LinRes`.
+        The responses are evaluated over a common set of frequencies,
+        optionally in parallel (see :meth:`freqresp`).
 
         **Parameters:**
 
@@ -828,6 +1277,9 @@ class LinResList(ResList):
 
              If *leg_kwargs* is 'None', then no legend will be shown.
 
+        - *processes*: Number of processes used to evaluate the responses (see
+          :meth:`freqresp`)
+
         - *\*\*kwargs*: Additional plotting arguments:
 
              - *freqs*: List or frequencies or tuple of (min, max) frequencies
@@ -851,6 +1303,12 @@ class LinResList(ResList):
 
         1. *axes*: Tuple (pair) of axes for the magnitude and phase plots
 
+        2. *freqs*: Array of frequencies (in Hz if *in_Hz* is `True`, otherwise
+           rad/s)
+
+        3. *responses*: Complex array of the frequency responses with a row for
+           each linearization and a column for each frequency
+
         **Example:**
 
         .. plot:: examples/PIDs-bode.py
@@ -877,8 +1335,14 @@ class LinResList(ResList):
         n_colors = len(colors)
         n_styles = len(styles)
 
+        # Evaluate the responses.
+        in_Hz = kwargs.setdefault('in_Hz', True)
+        freqs, responses = self.freqresp(kwargs.pop('freqs', None), pair,
+                                         in_Hz, processes)
+        f = freqs * (2 * np.pi if in_Hz else 1)
+
         # Create the plots.
-        for i, (lin, label) in enumerate(zip(self, labels)):
+        for i, (response, label) in enumerate(zip(responses, labels)):
             style = styles[np.mod(i, n_styles)]
             if isinstance(style, string_types):
                 kwargs['linestyle'] = style
@@ -886,12 +1350,10 @@ class LinResList(ResList):
             else:
                 kwargs['dashes'] = style
                 kwargs.pop('linestyle', None)
-            if lin.sys.inputs > 1 or lin.sys.outputs > 1:
-                sys = lin.to_siso(pair[0], pair[1])
-            else:
-                sys = lin.sys
-            bode_plot(sys, label=label, color=colors[np.mod(i, n_colors)],
-                      axes=axes, **kwargs)
+            bode_plot.from_response(np.abs(response), np.angle(response), f,
+                                    label=label,
+                                    color=colors[np.mod(i, n_colors)],
+                                    axes=axes, **kwargs)
 
         # Decorate and finish.
         axes[0].set_title(title)
@@ -899,17 +1361,17 @@ class LinResList(ResList):
             loc = leg_kwargs.pop('loc', 'best')
             axes[0].legend(loc=loc, **leg_kwargs)
             axes[1].legend(loc=loc, **leg_kwargs)
-        return axes
+        return axes, freqs, responses
 
     def nyquist(self, ax=None, pair=(0, 0), label='nyquist',
                 title="Nyquist plot", xlabel="Real axis",
                 ylabel="Imaginary axis", labels=None,
                 colors=['b', 'g', 'r', 'c', 'm', 'y', 'k'],
-                leg_kwargs={}, **kwargs):
+                leg_kwargs={}, processes=None, **kwargs):
         r"""Plot the linearizations onto a single Nyquist diagram.
 
-        This method calls :meth:`~LinRes.nyquist` from the included instances of
-        :class:`LinRes`.
+        The responses are evaluated over a common set of frequencies,
+        optionally in parallel (see :meth:`freqresp`).
 
         **Parameters:**
 
@@ -950,6 +1412,9 @@ class LinResList(ResList):
 
              If *leg_kwargs* is 'None', then no legend will be shown.
 
+        - *processes*: Number of processes used to evaluate the responses (see
+          :meth:`freqresp`)
+
         - *\*\*kwargs*: Additional plotting arguments:
 
              - *freqs*: List or frequencies or tuple of (min, max) frequencies
@@ -979,6 +1444,12 @@ class LinResList(ResList):
 
             1. *ax*: Axes of the Nyquist plot
 
+            2. *freqs*: Array of frequencies (in Hz if *in_Hz* is `True`,
+               otherwise rad/s)
+
+            3. *responses*: Complex array of the frequency responses with a row
+               for each linearization and a column for each frequency
+
         **Example:**
 
         .. plot:: examples/PIDs-nyquist.py
@@ -998,17 +1469,21 @@ class LinResList(ResList):
             colors = (colors,)
         n_colors = len(colors)
 
+        # Evaluate the responses.
+        in_Hz = kwargs.setdefault('in_Hz', True)
+        freqs, responses = self.freqresp(kwargs.pop('freqs', None), pair,
+                                         in_Hz, processes)
+        f = freqs * (2 * np.pi if in_Hz else 1)
+
         # Create the plots.
         label_freq = kwargs.pop('label_freq', None)
-        for i, (lin, label) in enumerate(zip(self, labels)):
-            if lin.sys.inputs > 1 or lin.sys.outputs > 1:
-                sys = lin.to_siso(pair[0], pair[1])
-            else:
-                sys = lin.sys
-            nyquist_plot(sys, mark=False, label=label, ax=ax,
-                         label_freq=(i == 0 if label_freq is None
-                                     else label_freq),
-                         color=colors[np.mod(i, n_colors)], **kwargs)
+        for i, (response, label) in enumerate(zip(responses, labels)):
+            nyquist_plot.from_response(np.abs(response), np.angle(response), f,
+                                       mark=False, label=label, ax=ax,
+                                       label_freq=(i == 0 if label_freq is None
+                                                   else label_freq),
+                                       color=colors[np.mod(i, n_colors)],
+                                       **kwargs)
 
         # Decorate and finish.
         ax.set_title(title)
@@ -1021,7 +1496,7 @@ class LinResList(ResList):
             loc = leg_kwargs.pop('loc', 'best')
             ax.legend(loc=loc, **leg_kwargs)
 
-        return ax
+        return ax, freqs, responses
 
 
 if __name__ == '__main__':
@@ -11,6 +11,9 @@
 - :class:`SimResList` - Special list of simulation results (:class:`SimRes` or
   :class:`SimResSequence` instances)
 
+- :class:`LazySimRes` - Placeholder for simulation results in a
+  :class:`SimResList` that are loaded on first use
+
 - :class:`Variable` - Special namedtuple_ to represent a variable in a
   simulation, with methods to retrieve and perform calculations on its values
 
@@ -18,6 +21,18 @@
   :class:`Variable`), with attributes to access information from all of the
   variables at once
 
+- :class:`AttrDict` - Lazy dictionary of an attribute of the variables in a
+  simulation
+
+- :class:`TimeBase` - Recorded times shared by the variables of a trajectory
+  block, with cached information derived from them
+
+- :class:`ChunkedTimeBase` - Time base made of the time bases of a sequence of
+  simulations
+
+- :class:`TrajectoryCache` - Least-recently-used cache of trajectories read
+  from a memory-mapped file, bounded by a memory budget
+
 
 .. _Modelica: http://www.modelica.org/
 .. _namedtuple: https://docs.python.org/2/library/collections.html#collections.namedtuple
@@ -40,24 +55,34 @@ __license__ = "BSD-compatible (see LICENSE.txt)"
 # Other:
 # pylint: disable=I0011, C0103, E0611, E1101, R0801, R0921, W0102
 
+import numpy
 import os
+import re as regexp
+import sys
+from hashlib import sha1
 
-from collections import namedtuple
+from collections import Mapping, OrderedDict, namedtuple
+from contextlib import contextmanager
 from difflib import get_close_matches
 from functools import wraps
 from itertools import cycle
 from matplotlib import rcParams
 from matplotlib.cbook import iterable
 from matplotlib.pyplot import figlegend
+from mmap import mmap
 from natu import core as nc
 from natu import numpy as np
 from natu import units as U
 from natu.core import Quantity
 from natu.util import flatten_list, multiglob
-from pandas import DataFrame
-from scipy.integrate import trapz
+from pandas import DataFrame, Index
 from scipy.interpolate import interp1d
 from six import string_types
+from threading import Lock
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    shared_memory = None # Python < 3.8
 
 from . import util
 from ._res import Res, ResList
@@ -69,33 +94,18 @@ from natu import config
 config.default_format = 'M'
 
 
-def _integral(y, x):
-    """Quantity-aware integration
+def _in_unit(values, variable, unit):
+    """Express raw values of a variable as numbers in a unit.
     """
-    integral = trapz(nc.value(y), nc.value(x))
-    if U._use_quantities:
-        return Quantity.quicknew(integral,
-                                 nc.dimension(x) + nc.dimension(y),
-                                 nc.display_unit(x) + nc.display_unit(y))
-    return integral
-
-
-def _interp1d(x, y, *args, **kwargs):
-    """1D interpolation for quantities
-    """
-    interp = interp1d(nc.value(x), y, *args, **kwargs)
-    # x_dimension = nc.dimension(x)
-
-    def new_interpolator(xnew):
-        #assert nc.dimension(xnew) == x_dimension, (
-        #    "The abscissa doesn't have the correct dimension.")
-        return nc.merge(interp(nc.value(xnew)), y)
-
-    return new_interpolator
+    if isinstance(unit, nc.LambdaUnit):
+        return nc.value(variable._wrap(values) / unit)
+    factor = nc.value(unit)
+    return values if factor == 1 else values / factor
 
 
 def _select(meth):
-    """Decorate a method to use time-based indexing to select values.
+    """Decorate a method that returns raw (unwrapped) arrays to use time-based
+    indexing to select values.
     """
 
     @wraps(meth, assigned=('__module__', '__name__')) # without __doc__
@@ -166,37 +176,461 @@ def _select(meth):
                 "time limit.")
 
             # Determine the corresponding indices and return them in a tuple.
-            times = self.times()
-            i1 = None if t1 is None else util.get_indices(times, t1)[1]
-            i2 = None if t2 is None else util.get_indices(times, t2)[0] + 1
+            times = self._samples.times
+            i1 = (None if t1 is None else
+                  util.get_indices(times, nc.value(t1))[1])
+            i2 = (None if t2 is None else
+                  util.get_indices(times, nc.value(t2))[0] + 1)
             return slice(i1, i2, skip)
 
+        # The values of a sequence of simulations are selected from each
+        # simulation rather than from the concatenated values.
+        chunked = (meth.__name__ == 'raw_values'
+                   and isinstance(self._samples, ChunkedSamples))
+
         if t is None:
             # Return all values.
             return meth(self)
         elif isinstance(t, tuple):
             # Apply a slice with optional start time, stop time, and number
             # of samples to skip.
+            if chunked:
+                return self._samples.take(get_slice(t))
             return meth(self)[get_slice(t)]
         else:
             # Interpolate at a single time or list of times.
-            meth_at_ = _interp1d(self.times(), meth(self))
-            # For some reason, this wraps single values as arrays, so need to
-            # cast back to float.
-            try:
-                # Assume t is a list of times.
-                return type(t)(map(meth_at_, t))
-            except (AttributeError, TypeError):
-                # t is a single time.
-                return meth_at_(t)
+            if chunked:
+                values = self._samples.interpolate(nc.value(t))
+            else:
+                values = interp1d(self._samples.times, meth(self))(nc.value(t))
+            if isinstance(t, list):
+                return list(values)
+            return values[()] if np.ndim(values) == 0 else values
 
     wrapped.__doc__ = meth.__doc__ + wrapped.__doc__
     return wrapped
 
 
-# Default class to store time and value information of a variable (for samples
-# field of Variable below).
-Samples = namedtuple('Samples', ['times', 'values'])
+# Maximum number of interpolation plans cached by each TimeBase
+_MAX_BRACKETS = 16
+
+
+class TimeBase(object):
+    """Recorded times shared by the variables of a trajectory block, with
+    cached information derived from them
+
+    The variables that share an instance of this class are known to be aligned
+    in time without comparing their times.  Instances from different blocks or
+    files are compared by a hash of their contents.
+
+    **Parameters:**
+
+    - *times*: Array of the recorded times in seconds
+
+    **Example:**
+
+    >>> sim = SimRes('examples/ChuaCircuit.mat')
+    >>> timebase = sim['C1.v']._samples.timebase
+    >>> timebase is sim['L.v']._samples.timebase
+    True
+    >>> timebase.aligned(sim['Time'].raw_times())
+    True
+    >>> len(timebase)
+    514
+    """
+
+    __slots__ = ['times', '_hash', '_dt', '_events', '_brackets']
+
+    def __init__(self, times):
+        self.times = times
+        self._hash = None
+        self._dt = None
+        self._events = None
+        self._brackets = {}
+
+    def __len__(self):
+        """Return the number of recorded times."""
+        return len(self.times)
+
+    def __repr__(self):
+        """Return a formal description of the time base."""
+        return "%s(%i samples)" % (self.__class__.__name__, len(self))
+
+    def aligned(self, other):
+        """Return *True* if another time base or array of times has the same
+        times.
+        """
+        if other is self:
+            return True
+        if not isinstance(other, TimeBase):
+            other = TimeBase(other)
+        return len(other) == len(self) and other.hash == self.hash
+
+    def bracket(self, new_times):
+        """Return the indices of the recorded times before and after each of
+        some new times and the linear interpolation weights between them.
+
+        **Parameters:**
+
+        - *new_times*: :class:`TimeBase` or array of new times
+
+             The weights are clipped to [0, 1] so that values are held
+             constant beyond the ends of the recorded times.  The results are
+             cached by the hash of the new times.
+        """
+        if not isinstance(new_times, TimeBase):
+            new_times = TimeBase(new_times)
+        try:
+            return self._brackets[new_times.hash]
+        except KeyError:
+            pass
+
+        times = self.times
+        i = np.clip(np.searchsorted(times, new_times.times, side='right') - 1,
+                    0, max(len(times) - 2, 0))
+        j = np.minimum(i + 1, len(times) - 1)
+        dt = times[j] - times[i]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            weights = np.where(dt > 0, (new_times.times - times[i]) / dt, 0)
+        weights = np.clip(weights, 0, 1)
+
+        if len(self._brackets) >= _MAX_BRACKETS:
+            self._brackets.clear()
+        self._brackets[new_times.hash] = i, j, weights
+        return i, j, weights
+
+    @property
+    def dt(self):
+        """Differences between successive recorded times"""
+        if self._dt is None:
+            self._dt = np.diff(self.times)
+        return self._dt
+
+    @property
+    def events(self):
+        """Indices of the samples that are followed by another sample at the
+        same time (e.g., at events)
+        """
+        if self._events is None:
+            self._events = np.flatnonzero(self.dt == 0)
+        return self._events
+
+    @property
+    def hash(self):
+        """Hash of the recorded times (hexadecimal string)"""
+        if self._hash is None:
+            times = np.ascontiguousarray(self.times, dtype=float)
+            self._hash = sha1(times.view(np.uint8)).hexdigest()
+        return self._hash
+
+    def interpolate(self, block, columns, new_times):
+        """Linearly interpolate selected columns of a trajectory block (with
+        rows at these times) to new times.
+
+        The values are held constant beyond the ends of the recorded times.
+        The block is processed in chunks of rows to limit the size of the
+        temporary arrays.
+        """
+        return _interpolate(block, columns, self.bracket(new_times))
+
+
+class ChunkedTimeBase(TimeBase):
+    """Time base made of the time bases of a sequence of simulations
+
+    The recorded times are concatenated when they are first needed (e.g., to
+    interpolate) and then kept.  The number of samples is known without
+    concatenating them.
+
+    **Parameters:**
+
+    - *chunks*: List of the :class:`TimeBase` instances of the simulations, in
+      order
+
+    **Example:**
+
+    >>> sim = SimRes('examples/ChuaCircuit.mat')
+    >>> timebase = sim['C1.v']._samples.timebase
+    >>> chunked = ChunkedTimeBase([timebase, timebase])
+    >>> len(chunked)
+    1028
+    """
+
+    __slots__ = ['chunks', '_times']
+
+    def __init__(self, chunks):
+        # pylint: disable=I0011, W0231
+        self.chunks = chunks
+        self._times = None
+        self._hash = None
+        self._dt = None
+        self._events = None
+        self._brackets = {}
+
+    def __len__(self):
+        """Return the number of recorded times."""
+        return sum(len(chunk) for chunk in self.chunks)
+
+    @property
+    def times(self):
+        """Recorded times of all of the simulations"""
+        if self._times is None:
+            self._times = np.concatenate([chunk.times
+                                          for chunk in self.chunks])
+        return self._times
+
+
+class Samples(namedtuple('Samples', ['timebase', 'values'])):
+    """Default class to store time and value information of a variable (for
+    samples field of :class:`Variable` below)
+    """
+    __slots__ = ()
+
+    @property
+    def times(self):
+        """The recorded times of the variable
+        """
+        return self.timebase.times
+
+
+class ChunkedSamples(namedtuple('ChunkedSamples', ['timebase', 'chunks'])):
+    """Class to store the time and value information of a variable from a
+    sequence of simulations (for samples field of :class:`Variable` below)
+
+    *timebase* is a :class:`ChunkedTimeBase` and *chunks* is a list of the
+    samples of the variable in each simulation, in order.  The values of the
+    simulations aren't copied; they are only concatenated when all of them are
+    requested at once.  Statistics, slices, and interpolation are calculated
+    from the simulations separately.
+
+    **Example:**
+
+    Two simulations with a gap between them (from 2 to 4 s):
+
+    >>> first = Samples(TimeBase(np.array([0.0, 1.0, 2.0])),
+    ...                 np.array([0.0, 1.0, 2.0]))
+    >>> second = Samples(TimeBase(np.array([4.0, 5.0, 6.0])),
+    ...                  np.array([6.0, 5.0, 4.0]))
+    >>> samples = ChunkedSamples(ChunkedTimeBase([first.timebase,
+    ...                                           second.timebase]),
+    ...                          [first, second])
+    >>> samples.values.tolist()
+    [0.0, 1.0, 2.0, 6.0, 5.0, 4.0]
+
+    Times in the gap are interpolated between the last sample of the first
+    simulation and the first sample of the second:
+
+    >>> samples.interpolate([1.5, 2.0, 3.0, 4.0, 5.5]).tolist()
+    [1.5, 2.0, 4.0, 6.0, 4.5]
+
+    A stepped slice keeps its phase across the boundary:
+
+    >>> samples.take(slice(1, None, 2)).tolist()
+    [1.0, 6.0, 4.0]
+    >>> samples.take(slice(2, 5)).tolist()
+    [2.0, 6.0, 5.0]
+    """
+    __slots__ = ()
+
+    @property
+    def times(self):
+        """The recorded times of the variable
+        """
+        return self.timebase.times
+
+    @property
+    def values(self):
+        """The values of the variable (concatenated)
+        """
+        return np.concatenate([chunk.values for chunk in self.chunks])
+
+    def interpolate(self, new_times):
+        """Linearly interpolate the values to new times.
+
+        The results are those of interpolating the concatenated values, but
+        only the simulations that contain the new times are accessed.  A new
+        time between two simulations is interpolated between the last sample
+        of the first and the first sample of the second.
+        """
+        new_times = np.asarray(new_times)
+        flat = new_times.ravel()
+        chunks = [chunk for chunk in self.chunks if len(chunk.timebase)]
+        starts = [chunk.times[0] for chunk in chunks]
+        ends = [chunk.times[-1] for chunk in chunks]
+        if np.any(flat < starts[0]):
+            raise ValueError("A value in x_new is below the interpolation "
+                             "range.")
+        if np.any(flat > ends[-1]):
+            raise ValueError("A value in x_new is above the interpolation "
+                             "range.")
+
+        # A time at the end of one simulation and the start of the next
+        # belongs to the first one, as with the concatenated values.
+        positions = np.searchsorted(ends, flat)
+        values = np.empty(flat.shape)
+        for k in np.unique(positions):
+            chunk = chunks[k]
+            selected = positions == k
+            inside = selected & (flat >= starts[k])
+            if inside.any():
+                values[inside] = interp1d(chunk.times,
+                                          chunk.values)(flat[inside])
+            between = selected & ~inside
+            if between.any():
+                values[between] = interp1d(
+                    [ends[k - 1], starts[k]],
+                    [_signed_chunk(chunks[k - 1], -1),
+                     _signed_chunk(chunk, 0)])(flat[between])
+        return values.reshape(new_times.shape)
+
+    def take(self, index):
+        """Return the values at a slice of the (concatenated) samples.
+
+        Only the simulations that overlap the slice are accessed.
+        """
+        start, stop, step = index.indices(len(self.timebase))
+        if step < 0:
+            return self.values[index]
+        pieces = []
+        offset = 0
+        for chunk in self.chunks:
+            n = len(chunk.timebase)
+            first = max(start, offset)
+            first += (start - first) % step # Keep the phase of the slice.
+            last = min(stop, offset + n)
+            if first < last:
+                pieces.append(_signed_chunk(chunk, slice(first - offset,
+                                                         last - offset, step)))
+            offset += n
+        return np.concatenate(pieces) if pieces else np.empty(0)
+
+
+def _block_of(samples):
+    """Return the trajectory block, column index, and sign of the values of a
+    variable (from its samples).
+
+    If the values aren't stored in a block, the block is a single-column view
+    of the values.  Memory-mapped values are read through the trajectory cache
+    (see :class:`~modelicares._io.dymola.MappedSamples`), since the statistics
+    of a single variable are often requested together.
+    """
+    block = getattr(samples, 'block', None)
+    if block is None or hasattr(samples, 'mapped'):
+        return np.asarray(samples.values)[:, np.newaxis], 0, 1
+    return block, samples.column, -1 if samples.negated else 1
+
+
+# Multipliers of the suffixes of memory sizes
+_SIZE_UNITS = {'': 1, 'k': 10**3, 'm': 10**6, 'g': 10**9, 't': 10**12,
+               'ki': 2**10, 'mi': 2**20, 'gi': 2**30, 'ti': 2**40}
+
+
+def _parse_size(size):
+    """Return a memory size in bytes from a number or a string like '2GB' or
+    '512 MiB'.
+    """
+    if not isinstance(size, string_types):
+        return int(size)
+    match = regexp.match(r'\s*([\d.]+)\s*([kmgt]?i?)b?\s*$', size.lower())
+    if not match or match.group(2) == 'i':
+        raise ValueError("The memory size %r isn't understood." % size)
+    number, suffix = match.groups()
+    return int(float(number)*_SIZE_UNITS[suffix])
+
+
+class TrajectoryCache(object):
+    """Least-recently-used cache of trajectories read from a memory-mapped
+    file, bounded by a memory budget
+
+    When the cached trajectories would exceed the budget, the least recently
+    used ones are evicted.  An evicted trajectory is read again from the file
+    the next time it is used.  A trajectory that is larger than the budget is
+    read each time it is used but not cached.
+
+    **Parameters:**
+
+    - *budget*: Maximum memory used by the cached trajectories, in bytes or as
+      a string with a unit (e.g., '2GB' or '512 MiB')
+
+    **Attributes:**
+
+    - *hits*: Number of requests that were served from the cache
+
+    - *misses*: Number of requests that required reading the file
+
+    - *evictions*: Number of trajectories that have been evicted
+
+    - *nbytes*: Memory currently used by the cached trajectories, in bytes
+
+    **Example:**
+
+    >>> sim = SimRes('examples/ChuaCircuit.mat', memory_budget='5 kB')
+    >>> cache = sim.trajectory_cache
+    >>> print(sim['C1.v'].FV)
+    2.42098 V
+    >>> print(sim['C1.v'].IV)
+    4 V
+    >>> cache.hits, cache.misses
+    (1, 1)
+    >>> for name in ['L.v', 'C2.v', 'Nr.v']:
+    ...     maximum = sim[name].max
+    >>> cache.nbytes <= cache.budget
+    True
+    >>> cache.evictions
+    2
+    """
+
+    def __init__(self, budget):
+        self.budget = _parse_size(budget)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.nbytes = 0
+        self._arrays = OrderedDict()
+
+    def __len__(self):
+        """Return the number of cached trajectories."""
+        return len(self._arrays)
+
+    def __reduce__(self):
+        """Pickle the budget but not the cached trajectories."""
+        return (self.__class__, (self.budget,))
+
+    def __repr__(self):
+        """Return a formal description of the cache."""
+        return ("%s(budget=%i, nbytes=%i, hits=%i, misses=%i, evictions=%i)"
+                % (self.__class__.__name__, self.budget, self.nbytes,
+                   self.hits, self.misses, self.evictions))
+
+    def arrays(self):
+        """Return a list of the cached trajectories, from least to most
+        recently used.
+        """
+        return list(self._arrays.values())
+
+    def clear(self):
+        """Evict all of the trajectories (the counters are kept)."""
+        self._arrays.clear()
+        self.nbytes = 0
+
+    def get(self, key, load):
+        """Return a trajectory by key, calling *load*\(\) to read it if it
+        isn't cached.
+        """
+        try:
+            array = self._arrays.pop(key)
+        except KeyError:
+            self.misses += 1
+            array = load()
+            if array.nbytes > self.budget:
+                return array
+            while self.nbytes + array.nbytes > self.budget:
+                self.nbytes -= self._arrays.popitem(last=False)[1].nbytes
+                self.evictions += 1
+            self.nbytes += array.nbytes
+        else:
+            self.hits += 1
+        self._arrays[key] = array # Now the most recently used
+        return array
 
 
 class Variable(object):
@@ -251,9 +685,12 @@ class Variable(object):
        >>> assert T.description == 'Temperature of HeatPort'
 
     Besides the properties above, there are methods to retrieve times, values,
-    and functions of the times and values (:meth:`array`, :meth:`FV`,
-    :meth:`IV`, :meth:`max`, :meth:`mean`, :meth:`mean_rectified`, :meth:`min`,
-    :meth:`RMS`, :meth:`RMS_AC`, :meth:`times`, :meth:`value`, :meth:`values`).
+    and functions of the times and values (:meth:`array`, :meth:`cumintegral`,
+    :meth:`derivative`, :meth:`FV`, :meth:`integral`, :meth:`IV`, :meth:`max`,
+    :meth:`mean`, :meth:`mean_rectified`, :meth:`min`, :meth:`RMS`,
+    :meth:`RMS_AC`, :meth:`times`, :meth:`value`, :meth:`values`).
+    The :meth:`raw_times` and :meth:`raw_values` methods return the times and
+    values as plain arrays in SI units, without the overhead of quantities.
     Please see the summary in :meth:`SimRes.__getitem__` or the full
     descriptions of those methods below.
 
@@ -261,11 +698,13 @@ class Variable(object):
     .. _SI: https://en.wikipedia.org/wiki/SI
     """
 
-    __slots__ = ['_samples', '_dimension', '_display_unit', 'description']
+    __slots__ = ['_samples', '_dimension', '_display_unit', 'description',
+                 '_cache']
 
     def __init__(self, samples, dimension, display_unit, description=""):
         self._samples = samples
         self._dimension = dimension
+        self._cache = None # Derived variables (created when needed)
 
         try:
             self._display_unit = nc.UnitExponents.fromstr(display_unit.replace('.',
@@ -295,6 +734,157 @@ class Variable(object):
             % (dimension, self._dimension))
         self._display_unit = nc.unitspace.simplify(display_unit)
 
+    def _wrap(self, value):
+        """Return a number or array in the dimension and display unit of the
+        variable.
+
+        A list is wrapped element by element.
+        """
+        if U._use_quantities:
+            if isinstance(value, list):
+                return [self._wrap(entry) for entry in value]
+            return Quantity.quicknew(value, self._dimension, self._display_unit)
+        return value
+
+    def _as_block(self):
+        """Return the trajectory block, column index, and sign of the values
+        of the variable.
+
+        If the variable isn't stored in a block, the block is a single-column
+        view of its values.
+        """
+        return _block_of(self._samples)
+
+    def _raw_stat(self, stat):
+        """Return a statistic (key of *_BATCH_STATS*) of the variable as a raw
+        (unwrapped) number.
+        """
+        if isinstance(self._samples, ChunkedSamples):
+            return _chunked_stat(self._samples, stat)
+        block, column, sign = self._as_block()
+        return _BATCH_STATS[stat](block, [column], np.array([sign], block.dtype),
+                                  self._samples.timebase)[0]
+
+    def _derive(self, key, values, time_exponent, prefix):
+        """Create, cache, and return a variable derived from this one.
+
+        **Parameters:**
+
+        - *key*: Key of the derived variable in the cache
+
+        - *values*: Values of the derived variable (at the same times)
+
+        - *time_exponent*: Exponent of time in the dimension of the derived
+          variable relative to this one (e.g., 1 for an integral)
+
+        - *prefix*: Prefix for the description
+        """
+        example = (Quantity.quicknew(1.0, self._dimension, self._display_unit)
+                   * U.s**time_exponent)
+        variable = Variable(Samples(self._samples.timebase, values),
+                            nc.dimension(example), nc.display_unit(example),
+                            prefix + self.description)
+        if self._cache is None:
+            self._cache = {}
+        self._cache[key] = variable
+        return variable
+
+    def _cached(self, key):
+        """Return a cached derived variable or 'None' if it isn't cached.
+        """
+        return None if self._cache is None else self._cache.get(key)
+
+    def cumintegral(self):
+        """Return the cumulative time integral of the variable as a new
+        :class:`Variable`.
+
+        The integral is calculated by the trapezoidal rule and is zero at the
+        first sample.  The result is cached, so only the first call requires
+        computation.  See also :meth:`SimRes.cumintegral` to calculate the
+        integrals of many variables at once.
+
+        **Example:**
+
+        >>> sim = SimRes('examples/ChuaCircuit.mat')
+        >>> energy = sim['Ro.LossPower'].cumintegral()
+        >>> energy.dimension
+        L2.M/T2
+        >>> sim['Ro.LossPower'].cumintegral() is energy
+        True
+        """
+        variable = self._cached('cumintegral')
+        if variable is None:
+            block, column, sign = self._as_block()
+            values = _cumintegrate(block, [column], np.array([sign]),
+                                   self._samples.timebase)[:, 0]
+            variable = self._derive('cumintegral', values, 1,
+                                    "Cumulative integral of ")
+        return variable
+
+    def derivative(self):
+        """Return the time derivative of the variable as a new
+        :class:`Variable`.
+
+        The derivative at each sample is the average of the slopes of the
+        adjacent intervals.  At events (two samples at the same time), the
+        slope on the other side of the sample is used, so the derivative
+        doesn't include the jump.  The result is cached.
+
+        **Example:**
+
+        >>> sim = SimRes('examples/ChuaCircuit.mat')
+        >>> dv_dt = sim['C1.v'].derivative()
+        >>> dv_dt.dimension
+        L2.M/(I.T4)
+        """
+        variable = self._cached('derivative')
+        if variable is None:
+            variable = self._derive('derivative',
+                                    _differentiate(self._samples.values,
+                                                   self._samples.timebase),
+                                    -1, "Derivative of ")
+        return variable
+
+    def integral(self, t=None):
+        """Return the time integral of the variable.
+
+        **Parameters:**
+
+        - *t*: Time range
+
+             - Default or 'None': The integral is taken over all of the
+               samples.
+
+             - (*stop*,): The integral is taken from the first sample to
+               *stop*.
+
+             - (*start*, *stop*): The integral is taken from *start* to *stop*.
+
+             The cumulative integral (:meth:`cumintegral`) is cached, so the
+             integral over any time range is a lookup and linear interpolation
+             rather than a new integration.
+
+        **Example:**
+
+        >>> sim = SimRes('examples/ChuaCircuit.mat')
+        >>> print(sim['Ro.LossPower'].integral(t=(0, 100)))
+        3.57167 J
+        """
+        cumintegral = self.cumintegral()
+        times = cumintegral._samples.times
+        values = cumintegral._samples.values
+        if t is None:
+            result = values[-1]
+        else:
+            try:
+                t1, t2 = t
+            except ValueError:
+                t1 = times[0]
+                t2, = t
+            result = (np.interp(nc.value(t2), times, values)
+                      - np.interp(nc.value(t1), times, values))
+        return cumintegral._wrap(result)
+
     @property
     def FV(self):
         """Return the final value of the variable.
@@ -311,7 +901,7 @@ class Variable(object):
         >>> C1_v.FV()
         2.4209836
         """
-        return self.values()[-1]
+        return self._wrap(self._raw_stat('FV'))
 
     @property
     def is_constant(self):
@@ -329,8 +919,7 @@ class Variable(object):
         >>> C1_v.is_constant
         False
         """
-        values = self.values()
-        return np.array_equal(values[:-1], values[1:])
+        return bool(self._raw_stat('is_constant'))
 
     @property
     def IV(self):
@@ -348,7 +937,7 @@ class Variable(object):
         >>> C1_v.IV()
         4.0
         """
-        return self.values()[0]
+        return self._wrap(self._raw_stat('IV'))
 
     @property
     def max(self):
@@ -366,7 +955,7 @@ class Variable(object):
         >>> C1_v.max()
         4.5046349
         """
-        return np.max(self.values())
+        return self._wrap(self._raw_stat('max'))
 
     @property
     def mean(self):
@@ -384,8 +973,7 @@ class Variable(object):
         >>> C1_v.mean()
         0.76859528
         """
-        t = self.times()
-        return _integral(self.values(), t) / (t[-1] - t[0])
+        return self._wrap(self._raw_stat('mean'))
 
     @property
     def mean_rectified(self):
@@ -404,8 +992,7 @@ class Variable(object):
         >>> C1_v.mean_rectified()
         2.2870927
         """
-        t = self.times()
-        return _integral(np.abs(self.values()), t) / (t[-1] - t[0])
+        return self._wrap(self._raw_stat('mean_rectified'))
 
     @property
     def min(self):
@@ -423,7 +1010,7 @@ class Variable(object):
         >>> C1_v.min()
         -3.8189442
         """
-        return np.min(self.values())
+        return self._wrap(self._raw_stat('min'))
 
     @property
     def RMS(self):
@@ -441,8 +1028,7 @@ class Variable(object):
         >>> C1_v.RMS()
         2.4569478
         """
-        t = self.times()
-        return np.sqrt(_integral(self.values() ** 2, t) / (t[-1] - t[0]))
+        return self._wrap(self._raw_stat('RMS'))
 
     @property
     def RMS_AC(self):
@@ -461,13 +1047,34 @@ class Variable(object):
         >>> C1_v.RMS_AC()
         3.1022301
         """
-        t = self.times()
-        mean = self.mean
-        return mean + np.sqrt(_integral((self.values() - mean) ** 2, t)
-                              / (t[-1] - t[0]))
+        return self._wrap(self._raw_stat('RMS_AC'))
 
     @_select
-    def times(self):
+    def raw_times(self):
+        """Return the recorded times of the variable as a plain array in
+        seconds.
+
+        This is the same as :meth:`times` except that the times are never
+        wrapped as quantities, which avoids the overhead in tight loops.
+        """
+        return self._samples.times
+
+    @_select
+    def raw_values(self):
+        """Return the values of the variable as a plain array in SI units.
+
+        This is the same as :meth:`values` except that the values are never
+        wrapped as quantities, which avoids the overhead in tight loops.
+
+        **Example:**
+
+        >>> sim = SimRes('examples/ChuaCircuit.mat')
+        >>> sim['C1.v'].raw_values(t=[2.5, 17.5])
+        [3.941368936561048, 3.7467045785160735]
+        """
+        return self._samples.values
+
+    def times(self, t=None):
         """Return the recorded times of the variable.
 
         **Parameters:**
@@ -508,9 +1115,13 @@ class Variable(object):
         >>> C1_v.times(t=(0, 20))
         array([  0.,   5.,  10.,  15.,  20.], dtype=float32)
         """
+        times = self.raw_times(t)
         if U._use_quantities:
-            return Quantity(self._samples.times, nc.dimension(U.s), 's')
-        return self._samples.times
+            if isinstance(times, list):
+                return [Quantity(time, nc.dimension(U.s), 's')
+                        for time in times]
+            return Quantity(times, nc.dimension(U.s), 's')
+        return times
 
     @property
     def value(self):
@@ -531,13 +1142,11 @@ class Variable(object):
         >>> Ro_R.value()
         0.0125
         """
-        values = self.values()
-        if np.array_equal(values[:-1], values[1:]):
-            return values[0]
+        if self._raw_stat('is_constant'):
+            return self._wrap(self._raw_stat('IV'))
         raise ValueError("The value varies.  Use values() instead of value().")
 
-    @_select
-    def values(self):
+    def values(self, t=None):
         r"""Return the values of the variable.
 
         **Parameters:**
@@ -584,13 +1193,10 @@ class Variable(object):
         >>> C1_v.values(t=[2.5, 17.5])
         [3.941368936561048, 3.7467045785160735]
         """
-        if U._use_quantities:
-            return Quantity.quicknew(self._samples.values, self._dimension,
-                                     self._display_unit)
-        return self._samples.values
+        return self._wrap(self.raw_values(t))
 
 # List of file-loading functions for SimRes
-from ._io.dymola import readsim as dymola
+from ._io.dymola import probe as probe_dymola, readsim as dymola
 
 READERS = [('dymola', dymola)] # SimRes tries these in order.
 # All of the keys should be in lowercase.
@@ -599,14 +1205,35 @@ READERS = [('dymola', dymola)] # SimRes tries these in order.
 # TODO: Avoid this cyclic import--readsim requires Variable, which is defined
 # here so that it's included in the documentation.
 
+PROBES = [probe_dymola] # Functions that check the header of a file for
+# simulation results (used to create LazySimRes instances)
+
+
+def _get_loader(kwargs):
+    """Return the loader for lazily loaded simulations (or 'None') from the
+    keyword arguments of :class:`SimResList`.
+    """
+    max_loaded = kwargs.pop('max_loaded', None)
+    prefetch = kwargs.pop('prefetch', 1)
+    if kwargs:
+        raise TypeError("Unexpected keyword argument(s): " + ', '.join(kwargs))
+    return None if max_loaded is None else _SimResLoader(max_loaded, prefetch)
+
 
-def _get_sims(fnames):
+def _get_sims(fnames, loader=None):
     """Return a list of :class:`SimRes` instances from a list of filenames.
 
+    If *loader* is given, return :class:`LazySimRes` instances instead.  Only
+    the headers of the files are checked.
+
     No errors are given unless no files could be loaded.
     """
     sims = []
     for fname in fnames:
+        if loader is not None:
+            if any(probe(fname) for probe in PROBES):
+                sims.append(LazySimRes(fname, loader))
+            continue
         try:
             sims.append(SimRes(fname))
         except (AssertionError, IndexError, IOError, KeyError, TypeError,
@@ -687,6 +1314,933 @@ class VarList(list):
         return getattr(variable, attr)
 
 
+# Number of elements of a trajectory block to process at once in the batch
+# calculations
+_CHUNK_SIZE = 2**18
+
+
+def _reduce(func, block, columns):
+    """Apply a reduction (e.g., :func:`numpy.max`) along the time axis of
+    selected columns of a trajectory block.
+
+    Only the selected columns of a memory-mapped block are read.
+    """
+    if isinstance(block, np.ndarray) and 4 * len(columns) > block.shape[1]:
+        # Reduce the whole block rather than copying the columns.
+        return func(block, axis=0)[columns]
+    return func(block[:, columns], axis=0)
+
+
+def _integrate(block, columns, timebase, transform=None):
+    """Integrate selected columns of a trajectory block over time using the
+    trapezoidal rule, optionally after applying a function to the values.
+
+    The block is processed in chunks of rows to limit the size of the
+    temporary arrays.
+    """
+    # Trapezoidal weights of the samples
+    times = timebase.times
+    dt = timebase.dt / 2
+    weights = np.zeros_like(times)
+    weights[:-1] += dt
+    weights[1:] += dt
+
+    integral = 0
+    n_rows = max(1, _CHUNK_SIZE // len(columns))
+    for i in range(0, len(times), n_rows):
+        chunk = block[i:i + n_rows, columns]
+        if transform is not None:
+            chunk = transform(chunk)
+        integral = integral + weights[i:i + n_rows].dot(chunk)
+    return integral
+
+
+def _cumintegrate(block, columns, signs, timebase):
+    """Return the cumulative integrals over time (by the trapezoidal rule) of
+    selected columns of a trajectory block with signs (+1 or -1) applied.
+
+    The result is a Fortran-ordered 2D array of floats with a column for each
+    of the selected columns.  The block is processed in chunks of rows.
+    """
+    n = len(timebase)
+    result = np.empty((n, len(columns)), order='F')
+    result[0] = 0
+    half_dt = timebase.dt / 2
+    n_rows = max(2, _CHUNK_SIZE // len(columns))
+    start = 0
+    while start < n - 1:
+        stop = min(start + n_rows, n)
+        chunk = np.asarray(block[start:stop, columns], float)
+        increments = (chunk[1:] + chunk[:-1]) * half_dt[start:stop - 1,
+                                                        np.newaxis]
+        result[start + 1:stop] = np.cumsum(increments, axis=0)
+        result[start + 1:stop] += result[start]
+        start = stop - 1
+    result *= signs
+    return result
+
+
+def _differentiate(values, timebase):
+    """Return the time derivative of values at the samples of a time base.
+
+    The derivative is the average of the slopes of the adjacent intervals,
+    excluding intervals of zero length (events).
+    """
+    values = np.asarray(values, float)
+    if len(values) < 2:
+        return np.zeros_like(values)
+    dt = timebase.dt
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slopes = np.where(dt > 0, np.diff(values) / dt, np.nan)
+    left = np.concatenate([[np.nan], slopes])
+    right = np.concatenate([slopes, [np.nan]])
+    derivative = np.where(np.isnan(left), right,
+                          np.where(np.isnan(right), left, (left + right) / 2))
+    return np.nan_to_num(derivative)
+
+
+def _interpolate(block, columns, plan):
+    """Linearly interpolate selected columns of a trajectory block according
+    to an interpolation plan from :meth:`TimeBase.bracket`.
+
+    The block is processed in chunks of rows to limit the size of the
+    temporary arrays.
+    """
+    i, j, weights = plan
+    weights = weights[:, np.newaxis].astype(block.dtype)
+    out = np.empty((len(i), len(columns)), block.dtype)
+    n_rows = max(1, _CHUNK_SIZE // len(columns))
+    for start in range(0, len(i), n_rows):
+        rows = slice(start, start + n_rows)
+        before = block[np.ix_(i[rows], columns)]
+        after = block[np.ix_(j[rows], columns)]
+        out[rows] = before + weights[rows] * (after - before)
+    return out
+
+
+def _duration(timebase):
+    """Return the time span of a time base."""
+    return timebase.times[-1] - timebase.times[0]
+
+
+def _batch_mean(block, columns, signs, timebase):
+    """Return the time-averaged means of selected columns of a block."""
+    return signs * _integrate(block, columns, timebase) / _duration(timebase)
+
+
+def _batch_RMS_AC(block, columns, signs, timebase):
+    """Return the time-averaged AC-coupled RMS values of selected columns of a
+    block.
+    """
+    mean = _batch_mean(block, columns, signs, timebase)
+    offset = signs * mean
+    return mean + np.sqrt(_integrate(block, columns, timebase,
+                                     lambda chunk: (chunk - offset)**2)
+                          / _duration(timebase))
+
+
+# Vectorized versions of the statistics of Variable, applied to the raw values
+# of selected columns of a trajectory block with signs (+1 or -1) applied
+_BATCH_STATS = {
+    'FV': lambda block, columns, signs, timebase: signs * block[-1, columns],
+    'IV': lambda block, columns, signs, timebase: signs * block[0, columns],
+    'is_constant': lambda block, columns, signs, timebase:
+        _reduce(np.max, block, columns) == _reduce(np.min, block, columns),
+    'max': lambda block, columns, signs, timebase:
+        np.where(signs > 0, _reduce(np.max, block, columns),
+                 -_reduce(np.min, block, columns)),
+    'mean': _batch_mean,
+    'mean_rectified': lambda block, columns, signs, timebase:
+        _integrate(block, columns, timebase, np.abs) / _duration(timebase),
+    'min': lambda block, columns, signs, timebase:
+        np.where(signs > 0, _reduce(np.min, block, columns),
+                 -_reduce(np.max, block, columns)),
+    'RMS': lambda block, columns, signs, timebase:
+        np.sqrt(_integrate(block, columns, timebase, np.square)
+                / _duration(timebase)),
+    'RMS_AC': _batch_RMS_AC,
+    }
+
+
+def _chunked_integral(samples, transform=None):
+    """Integrate the values of a variable from a sequence of simulations
+    (:class:`ChunkedSamples`) over time using the trapezoidal rule, optionally
+    after applying a function to the values.
+
+    Each simulation is integrated separately, and the intervals between the
+    simulations are included.
+
+    **Example:**
+
+    Two simulations with a gap between them (from 2 to 4 s):
+
+    >>> first = Samples(TimeBase(np.array([0.0, 1.0, 2.0])),
+    ...                 np.array([0.0, 1.0, 2.0]))
+    >>> second = Samples(TimeBase(np.array([4.0, 5.0, 6.0])),
+    ...                  np.array([6.0, 5.0, 4.0]))
+    >>> samples = ChunkedSamples(ChunkedTimeBase([first.timebase,
+    ...                                           second.timebase]),
+    ...                          [first, second])
+
+    The integral is 2 over the first simulation, 8 over the gap, and 10 over
+    the second simulation:
+
+    >>> _chunked_integral(samples)
+    20.0
+    >>> _chunked_integral(samples, np.square)
+    94.0
+    >>> _chunked_stat(samples, 'mean') == 20.0/6
+    True
+    >>> _chunked_stat(samples, 'max'), _chunked_stat(samples, 'FV')
+    (6.0, 4.0)
+    """
+    integral = 0
+    previous = None # Last time and transformed value of the last simulation
+    for chunk in samples.chunks:
+        if not len(chunk.timebase):
+            continue
+        block, column, sign = _block_of(chunk)
+        signed = ((lambda values, sign=sign: sign*values) if transform is None
+                  else lambda values, sign=sign: transform(sign*values))
+        integral += _integrate(block, [column], chunk.timebase, signed)[0]
+        times = chunk.times
+        if previous is not None:
+            integral += ((times[0] - previous[0])
+                         * (previous[1] + signed(block[0, column])) / 2)
+        previous = times[-1], signed(block[-1, column])
+    return integral
+
+
+def _chunked_stat(samples, stat):
+    """Return a statistic (key of *_BATCH_STATS*) of a variable from a sequence
+    of simulations (:class:`ChunkedSamples`), calculated from the simulations
+    separately.
+    """
+    chunks = [chunk for chunk in samples.chunks if len(chunk.timebase)]
+    if stat in _CHUNK_REDUCTIONS:
+        results = []
+        for chunk in chunks:
+            block, column, sign = _block_of(chunk)
+            results.append(_BATCH_STATS[stat](block, [column],
+                                              np.array([sign], block.dtype),
+                                              chunk.timebase)[0])
+        return _CHUNK_REDUCTIONS[stat](results)
+    if stat == 'is_constant':
+        return _chunked_stat(samples, 'max') == _chunked_stat(samples, 'min')
+
+    duration = chunks[-1].times[-1] - chunks[0].times[0]
+    if stat == 'mean':
+        return _chunked_integral(samples) / duration
+    if stat == 'mean_rectified':
+        return _chunked_integral(samples, np.abs) / duration
+    if stat == 'RMS':
+        return np.sqrt(_chunked_integral(samples, np.square) / duration)
+    if stat == 'RMS_AC':
+        mean = _chunked_integral(samples) / duration
+        return mean + np.sqrt(_chunked_integral(samples,
+                                                lambda values:
+                                                (values - mean)**2)
+                              / duration)
+    raise KeyError(stat)
+
+
+# Functions to combine the statistics of the simulations of a sequence
+_CHUNK_REDUCTIONS = {'FV': lambda results: results[-1],
+                     'IV': lambda results: results[0],
+                     'max': max,
+                     'min': min}
+
+
+def _group_by_block(variables):
+    """Group variables by the trajectory block in which their values are
+    stored.
+
+    **Returns:**
+
+    1. List of (block, timebase, indices, columns, signs) tuples, where
+       *indices* are the positions of the variables in *variables*
+
+    2. List of the indices of the variables that are not stored in a block
+
+    The block of memory-mapped variables is a view that reads only the
+    selected columns (:class:`~modelicares._io.dymola.MappedBlock`), so the
+    values aren't loaded through the trajectory cache.
+    """
+    groups = OrderedDict()
+    others = []
+    for i, variable in enumerate(variables):
+        samples = variable._samples
+        block = getattr(samples, 'block', None)
+        if block is None:
+            others.append(i)
+            continue
+        try:
+            group = groups[id(block)]
+        except KeyError:
+            group = groups[id(block)] = (block, samples.timebase, [], [], [])
+        group[2].append(i)
+        group[3].append(samples.column)
+        group[4].append(-1 if samples.negated else 1)
+    return ([(block, timebase, indices, columns, np.array(signs, block.dtype))
+             for block, timebase, indices, columns, signs in groups.values()],
+            others)
+
+
+def _batch_stat(variables, stat):
+    """Return a list of the raw (unwrapped) values of a statistic (key of
+    *_BATCH_STATS*) of variables, calculated block by block.
+    """
+    groups, others = _group_by_block(variables)
+    results = [None] * len(variables)
+    for block, timebase, indices, columns, signs in groups:
+        for i, result in zip(indices, _BATCH_STATS[stat](block, columns, signs,
+                                                         timebase)):
+            results[i] = result
+    for i in others:
+        results[i] = variables[i]._raw_stat(stat)
+    return results
+
+
+def _column_groups(variables):
+    """Group variables by trajectory block like :func:`_group_by_block`, but
+    include each variable that isn't stored in a block as a group of its own
+    (with a single-column block).
+    """
+    groups, others = _group_by_block(variables)
+    for i in others:
+        samples = variables[i]._samples
+        values = np.asarray(samples.values, float)[:, np.newaxis]
+        groups.append((values, samples.timebase, [i], [0], np.ones(1)))
+    return groups
+
+
+def _row_chunks(block, columns, signs, timebase):
+    """Yield the index of the first row and the signed values of selected
+    columns of a block in chunks of rows.
+
+    Successive chunks overlap by one row so that changes between adjacent rows
+    aren't lost at the boundaries.
+    """
+    n_rows = max(2, _CHUNK_SIZE // len(columns))
+    start = 0
+    while True:
+        yield start, block[start:start + n_rows, columns] * signs
+        start += n_rows - 1
+        if start >= len(timebase) - 1:
+            break
+
+
+def _get_levels(level, n):
+    """Return an array of *n* levels (in SI units) given a single level or a
+    sequence of them.
+    """
+    levels = np.asarray(nc.value(level), float)
+    if levels.ndim == 0:
+        return np.repeat(levels, n)
+    assert len(levels) == n, "There must be one level per variable."
+    return levels
+
+
+def _crossings(variables, level, direction):
+    """Return arrays of the indices of variables and the times at which they
+    cross a level (see :meth:`SimRes.crossings`).
+    """
+    try:
+        rising, falling = {'both': (True, True), 'rising': (True, False),
+                           'falling': (False, True)}[direction]
+    except KeyError:
+        raise ValueError("The direction must be 'both', 'rising', or "
+                         "'falling'.")
+    levels = _get_levels(level, len(variables))
+
+    # A crossing is a change in the sign of (value - level) between two
+    # recorded samples.  Samples that are exactly at the level don't have a
+    # sign; the crossing is between the last sample with a sign and the next
+    # one (i.e., at the first sample at the level).
+    all_indices = []
+    all_times = []
+    for block, timebase, indices, columns, signs in _column_groups(variables):
+        indices = np.asarray(indices)
+        group_levels = levels[indices]
+        times = timebase.times
+        n_cols = len(columns)
+        col_range = np.arange(n_cols)
+        # Sign, row, and offset of the last sample with a sign in the previous
+        # chunks
+        last_sign = np.zeros(n_cols)
+        last_row = np.zeros(n_cols, int)
+        last_offset = np.zeros(n_cols)
+        for start, values in _row_chunks(block, columns, signs, timebase):
+            if start:
+                # The first row was the last row of the previous chunk.
+                start += 1
+                values = values[1:]
+            if not len(values):
+                continue
+            offsets = values - group_levels
+            sample_signs = np.sign(offsets)
+            n_rows = len(values)
+            signed_rows = np.where(sample_signs != 0,
+                                   np.arange(n_rows)[:, np.newaxis], -1)
+            signed_rows = np.maximum.accumulate(signed_rows, axis=0)
+            prev_rows = np.vstack([np.full((1, n_cols), -1, int),
+                                   signed_rows[:-1]])
+            in_chunk = prev_rows >= 0
+            safe_rows = np.maximum(prev_rows, 0)
+            prev_signs = np.where(in_chunk,
+                                  sample_signs[safe_rows, col_range],
+                                  last_sign)
+            crossed = (sample_signs != 0) & (prev_signs != 0)
+            crossed &= ((sample_signs > 0) & (prev_signs < 0) if rising
+                        else False) | ((sample_signs < 0) & (prev_signs > 0)
+                                       if falling else False)
+            rows, cols = np.nonzero(crossed)
+            from_rows = np.where(in_chunk[rows, cols],
+                                 prev_rows[rows, cols] + start,
+                                 last_row[cols])
+            before = np.where(in_chunk[rows, cols],
+                              offsets[safe_rows[rows, cols], cols],
+                              last_offset[cols])
+            after = np.where(rows + start == from_rows + 1,
+                             offsets[rows, cols], 0)
+            all_times.append(times[from_rows] + (times[from_rows + 1]
+                                                 - times[from_rows])
+                             * before / (before - after))
+            all_indices.append(indices[cols])
+
+            # Carry the last sample with a sign to the next chunk.
+            has_sign = signed_rows[-1] >= 0
+            last = signed_rows[-1][has_sign]
+            last_sign[has_sign] = sample_signs[last, col_range[has_sign]]
+            last_row[has_sign] = last + start
+            last_offset[has_sign] = offsets[last, col_range[has_sign]]
+
+    if not all_indices:
+        return np.array([], int), np.array([])
+    indices = np.concatenate(all_indices)
+    times = np.concatenate(all_times).astype(float)
+    order = np.lexsort((times, indices))
+    return indices[order], times[order]
+
+
+def _first_exceedances(variables, level):
+    """Return an array of the times at which variables first exceed a level
+    (see :meth:`SimRes.first_exceedance`).
+    """
+    levels = _get_levels(level, len(variables))
+    results = np.empty(len(variables))
+    results.fill(np.nan)
+    for block, timebase, indices, columns, signs in _column_groups(variables):
+        indices = np.asarray(indices)
+        group_levels = levels[indices]
+        times = timebase.times
+        pending = np.ones(len(columns), bool)
+        for start, values in _row_chunks(block, columns, signs, timebase):
+            above = values > group_levels
+            cols = np.flatnonzero(pending & above.any(axis=0))
+            if not len(cols):
+                continue
+            rows = above[:, cols].argmax(axis=0)
+            previous = np.maximum(rows - 1, 0)
+            before = values[previous, cols] - group_levels[cols]
+            after = values[rows, cols] - group_levels[cols]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                fractions = np.where(rows > 0, before / (before - after), 0)
+            rows += start
+            previous += start
+            results[indices[cols]] = (times[previous] + fractions
+                                      * (times[rows] - times[previous]))
+            pending[cols] = False
+            if not pending.any():
+                break
+    return results
+
+
+# Pattern of a Modelica variable name in an expression for SimRes.eval (e.g.,
+# 'C1.v', 'C1.der(v)', 'der(x)', or 'a[1].b')
+_EXPR_NAME = regexp.compile(
+    r"(?<![\w.])(?:der\([^()]+\)|[A-Za-z_]\w*(?:\[[^\]]*\])?)"
+    r"(?:\.(?:der\([^()]+\)|[A-Za-z_]\w*(?:\[[^\]]*\])?))*")
+
+# Functions and constants available in the expressions for SimRes.eval, with
+# the Modelica names
+_EXPR_NAMESPACE = {'abs': numpy.abs, 'acos': numpy.arccos,
+                   'asin': numpy.arcsin, 'atan': numpy.arctan,
+                   'atan2': numpy.arctan2, 'cos': numpy.cos,
+                   'cosh': numpy.cosh, 'exp': numpy.exp, 'log': numpy.log,
+                   'log10': numpy.log10, 'max': numpy.maximum,
+                   'min': numpy.minimum, 'pi': numpy.pi, 'sign': numpy.sign,
+                   'sin': numpy.sin, 'sinh': numpy.sinh, 'sqrt': numpy.sqrt,
+                   'tan': numpy.tan, 'tanh': numpy.tanh}
+
+
+def _dimensionless(name, func):
+    """Return a version of a function (*func*, called *name* in expressions)
+    that raises an error unless its arguments are dimensionless.
+    """
+    def wrapped(*args):
+        """Function that only accepts dimensionless arguments
+        """
+        for arg in args:
+            if nc.dimension(arg):
+                raise TypeError("The argument of %s() in the expression must "
+                                "be dimensionless, not %s."
+                                % (name, nc.dimension(arg)))
+        return func(*[nc.value(arg) for arg in args])
+
+    return wrapped
+
+
+def _atan2(y, x):
+    """Return atan2(y, x) of quantities, which must have the same dimension.
+    """
+    if nc.dimension(y) != nc.dimension(x):
+        raise TypeError("The arguments of atan2() in the expression must have "
+                        "the same dimension, not %s and %s."
+                        % (nc.dimension(y), nc.dimension(x)))
+    return numpy.arctan2(nc.value(y), nc.value(x))
+
+# Functions available in the expressions for SimRes.eval when the dimension
+# of the result is determined from example quantities
+_EXPR_DIMENSION_NAMESPACE = dict(
+    [(name, _dimensionless(name, _EXPR_NAMESPACE[name]))
+     for name in ['acos', 'asin', 'atan', 'cos', 'cosh', 'exp', 'log', 'log10',
+                  'sin', 'sinh', 'tan', 'tanh']],
+    abs=np.abs, atan2=_atan2, max=np.maximum, min=np.minimum, pi=numpy.pi,
+    sign=np.sign, sqrt=np.sqrt)
+
+# Number of rows of the operands to evaluate at once in SimRes.eval (small
+# enough that the temporary arrays stay in the cache)
+_EXPR_CHUNK_SIZE = 2**14
+
+
+def _owner(array):
+    """Return the object that owns the memory of an array, the size of that
+    memory in bytes, and *True* if it is memory-mapped.
+    """
+    while isinstance(array.base, np.ndarray):
+        array = array.base
+    if array.base is None:
+        return array, array.nbytes, isinstance(array, np.memmap)
+    owner = array.base
+    try:
+        size = len(owner)
+    except TypeError:
+        size = array.nbytes
+    return owner, size, isinstance(owner, mmap) or isinstance(array, np.memmap)
+
+
+def _memory_usage(sims, deep, by_sim):
+    """Return an ordered dictionary of the memory usage (in bytes) of
+    simulation results (see :meth:`SimRes.memory_usage`).
+
+    If *by_sim* is *True*, memory is considered shared if it is used by more
+    than one simulation; otherwise, if it is used by more than one variable.
+    """
+    owners = {} # id(owner) -> [size, mapped, set of ids of users]
+    cache_owners = {} # id(owner) -> size
+    seen = set()
+    usage = OrderedDict((key, 0) for key in
+                        ['names', 'descriptions', 'variables', 'units']
+                        if deep)
+
+    def add_array(array, user):
+        """Count the memory of an array of trajectory data."""
+        owner, size, mapped = _owner(np.asarray(array))
+        owners.setdefault(id(owner), [size, mapped, set()])[2].add(user)
+
+    def add_cache(array):
+        """Count the memory of a cached array."""
+        owner, size, _ = _owner(np.asarray(array))
+        cache_owners[id(owner)] = size
+
+    def add_object(obj, key):
+        """Count the size of a Python object once."""
+        if id(obj) not in seen:
+            seen.add(id(obj))
+            usage[key] += sys.getsizeof(obj)
+
+    for sim in sims:
+        cache = sim.__dict__.get('trajectory_cache')
+        if cache is not None:
+            for array in cache.arrays():
+                add_cache(array)
+        for name, variable in sim.items():
+            user = id(sim) if by_sim else id(variable)
+            samples = variable._samples
+            for samples in getattr(samples, 'chunks', [samples]):
+                add_array(samples.times, user)
+                block = getattr(samples, 'mapped', None)
+                if block is None:
+                    block = getattr(samples, 'block', None)
+                if block is None:
+                    block = getattr(samples, 'signed_values', None)
+                add_array(samples.values if block is None else block, user)
+
+            # Cached information
+            timebase = variable._samples.timebase
+            if isinstance(timebase, ChunkedTimeBase) and timebase._times \
+                is not None:
+                add_cache(timebase._times)
+            for array in [timebase._dt, timebase._events]:
+                if array is not None:
+                    add_cache(array)
+            for bracket in timebase._brackets.values():
+                for array in bracket:
+                    add_cache(array)
+            if variable._cache:
+                for derived in variable._cache.values():
+                    add_cache(derived._samples.values)
+
+            if deep:
+                add_object(name, 'names')
+                add_object(variable.description, 'descriptions')
+                add_object(variable, 'variables')
+                add_object(variable._samples, 'variables')
+                add_object(variable._dimension, 'units')
+                add_object(variable._display_unit, 'units')
+
+    trajectories = OrderedDict([('trajectories', 0), ('owned', 0),
+                                ('shared', 0), ('resident', 0), ('mapped', 0),
+                                ('caches', sum(cache_owners.values()))])
+    for size, mapped, users in owners.values():
+        trajectories['trajectories'] += size
+        trajectories['shared' if len(users) > 1 else 'owned'] += size
+        trajectories['mapped' if mapped else 'resident'] += size
+    trajectories.update(usage)
+    trajectories['total'] = (trajectories['trajectories']
+                             + trajectories['caches'] + sum(usage.values()))
+    return trajectories
+
+
+# Minimum size of an array to place it in shared memory when pickling a SimRes
+# within SimRes.share()
+_SHARED_MEMORY_MIN_BYTES = 2**16
+
+
+def _array_root(array):
+    """Return the array that owns the memory of an array (following views).
+    """
+    while isinstance(array.base, np.ndarray):
+        array = array.base
+    return array
+
+
+def _release_shared_memory(segments):
+    """Close and remove shared memory segments created to pickle a SimRes
+    (see :meth:`SimRes.share`).
+    """
+    for _, segment in segments.values():
+        segment.close()
+        segment.unlink()
+    segments.clear()
+
+
+def _share_root(root, segments):
+    """Return a picklable description of a root array.
+
+    The description is one of:
+
+    - ('memmap', filename, offset, shape, dtype, order): The array is mapped
+      from a file.
+
+    - ('shm', name, shape, dtype, order): The array has been copied to shared
+      memory (*segments* keeps the segments by id of the root array).  This is
+      only done if *segments* isn't 'None' (see :meth:`SimRes.share`).
+
+    - ('array', root): The array is pickled as is.
+    """
+    order = 'F' if root.flags.f_contiguous and not root.flags.c_contiguous else 'C'
+    filename = getattr(root, 'filename', None)
+    if isinstance(root, np.memmap) and filename:
+        return ('memmap', filename, root.offset, root.shape, root.dtype.str,
+                order)
+    if (segments is None or shared_memory is None
+            or root.nbytes < _SHARED_MEMORY_MIN_BYTES or root.dtype.hasobject):
+        return ('array', root)
+    try:
+        segment = segments[id(root)][1]
+    except KeyError:
+        segment = shared_memory.SharedMemory(create=True, size=root.nbytes)
+        np.ndarray(root.shape, root.dtype, buffer=segment.buf,
+                   order=order)[...] = root
+        segments[id(root)] = root, segment # Keep the root so the id is valid.
+    return ('shm', segment.name, root.shape, root.dtype.str, order)
+
+
+def _attach_root(description):
+    """Return the root array from a description created by
+    :func:`_share_root` and the object (if any) that must be kept alive for
+    the array to remain valid.
+    """
+    kind = description[0]
+    if kind == 'array':
+        return description[1], None
+    if kind == 'memmap':
+        filename, offset, shape, dtype, order = description[1:]
+        return np.memmap(filename, dtype=dtype, mode='r', offset=offset,
+                         shape=shape, order=order), None
+    name, shape, dtype, order = description[1:]
+    # The segment is owned and removed by the process that shared it.  Since
+    # Python 3.13, attaching can skip the resource tracker.  Before that, the
+    # segment is registered again, but the tracker of a multiprocessing pool
+    # is the owner's, so the duplicate registration is harmless (and isn't
+    # undone here, since that would drop the owner's registration too).
+    try:
+        segment = shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        segment = shared_memory.SharedMemory(name=name)
+    return np.ndarray(shape, dtype, buffer=segment.buf, order=order), segment
+
+
+def _encode_array(array, roots, descriptions, segments):
+    """Return a picklable handle to an array that refers to its root array by
+    index in *descriptions*, with the offset and strides of the view.
+
+    Arrays with non-contiguous roots are returned as is.
+    """
+    root = _array_root(array)
+    if not (root.flags.c_contiguous or root.flags.f_contiguous):
+        return array
+    try:
+        index = roots[id(root)]
+    except KeyError:
+        index = roots[id(root)] = len(descriptions)
+        descriptions.append(_share_root(root, segments))
+    offset = (array.__array_interface__['data'][0]
+              - root.__array_interface__['data'][0])
+    return ('view', index, array.shape, array.dtype.str, offset,
+            array.strides)
+
+
+def _decode_array(handle, roots):
+    """Return an array from a handle created by :func:`_encode_array`.
+    """
+    if isinstance(handle, np.ndarray):
+        return handle
+    _, index, shape, dtype, offset, strides = handle
+    root = roots[index]
+    return np.ndarray(shape, dtype, buffer=root, offset=offset,
+                      strides=strides)
+
+
+def _rebuild_simres(cls, attributes, descriptions, timebases, variables):
+    """Rebuild a simulation result that was pickled by
+    :meth:`SimRes.__reduce__`.
+    """
+    sim = cls.__new__(cls)
+    sim.__dict__.update(attributes)
+    attached = [_attach_root(description) for description in descriptions]
+    roots = [root for root, _ in attached]
+    sim._attached = [segment for _, segment in attached if segment is not None]
+    handles = timebases
+    timebases = []
+    for handle in handles:
+        # The time bases of a sequence refer to time bases decoded before them.
+        timebases.append(ChunkedTimeBase([timebases[i] for i in handle[1]])
+                         if handle[0] == 'chunks' else
+                         TimeBase(_decode_array(handle, roots)))
+
+    def decode(field):
+        """Decode a field of the samples of a variable."""
+        if isinstance(field, list): # Samples of a sequence of simulations
+            return [decode_samples(*chunk) for chunk in field]
+        if isinstance(field, tuple):
+            if field[0] == 'timebase':
+                return timebases[field[1]]
+            return _decode_array(field, roots)
+        return field
+
+    def decode_samples(samples_class, fields):
+        """Decode the samples of a variable."""
+        return samples_class(*[decode(field) for field in fields])
+
+    for name, samples_class, fields, dimension, display_unit, description \
+        in variables:
+        samples = decode_samples(samples_class, fields)
+        dict.__setitem__(sim, name, Variable(samples, dimension, display_unit,
+                                             description))
+    return sim
+
+
+def _signed_chunk(samples, rows):
+    """Return a chunk of the values of a variable without negating the whole
+    array.
+    """
+    try:
+        chunk = samples.signed_values[rows]
+    except AttributeError:
+        return samples.values[rows]
+    return -chunk if samples.negated else chunk
+
+
+class AttrDict(Mapping):
+    """Lazy dictionary of an attribute of the variables in a simulation
+
+    The keys are variable names and the values are the requested attribute of
+    the corresponding variables (instances of :class:`Variable`).  An instance
+    of this class is returned when an unknown attribute is requested from a
+    simulation result (:meth:`SimRes.__getattr__`).  It is usually not
+    instantiated directly by the user.
+
+    Nothing is evaluated until it is needed.  Indexing the dictionary by a
+    name evaluates the attribute of only that variable.  Retrieving all of the
+    values (e.g., via :meth:`items` or :meth:`values`) evaluates the
+    statistics of :class:`Variable` (:attr:`~Variable.FV`,
+    :attr:`~Variable.IV`, :attr:`~Variable.is_constant`,
+    :attr:`~Variable.max`, :attr:`~Variable.mean`,
+    :attr:`~Variable.mean_rectified`, :attr:`~Variable.min`,
+    :attr:`~Variable.RMS`, :attr:`~Variable.RMS_AC`, and
+    :attr:`~Variable.value`) at once for all of the variables that share a
+    trajectory matrix in the result file.
+
+    **Initialization parameters:**
+
+    - *sim*: Simulation result (:class:`SimRes` instance)
+
+    - *attr*: Name of the attribute
+
+    - *names*: List of variable names to include
+
+         If *names* is 'None' (default), then all of the variables are
+         included.
+
+    **Methods:**
+
+    Besides the methods of a read-only dictionary, there are the following:
+
+    - :meth:`__call__` - Return an :class:`AttrDict` of the results of calling
+      the attribute of each variable (if the attribute is a method).
+
+    - :meth:`filter` - Return an :class:`AttrDict` with only the variables whose
+      names match a pattern.
+
+    **Example:**
+
+    >>> sim = SimRes('examples/ChuaCircuit.mat')
+    >>> IVs = sim.IV
+    >>> voltages = IVs.filter('^[^.]*.v$', re=True)
+    >>> sorted(voltages)
+    ['C1.v', 'C2.v', 'G.v', 'L.v', 'Nr.v', 'Ro.v']
+    >>> print(voltages['C1.v'])
+    4 V
+    """
+
+    def __init__(self, sim, attr, names=None, call=None):
+        """Initialize the lazy dictionary.
+
+        *call* is a tuple of positional and keyword arguments if the attribute
+        should be called.  See the top-level class documentation.
+        """
+        self._sim = sim
+        self._attr = attr
+        self._names = names
+        self._nameset = None if names is None else set(names)
+        self._call = call
+        self._cache = {}
+
+    def __call__(self, *args, **kwargs):
+        """Return an :class:`AttrDict` of the results of calling the attribute
+        of each variable.
+        """
+        assert self._call is None, "The attribute has already been called."
+        return self.__class__(self._sim, self._attr, self._names,
+                              (args, kwargs))
+
+    def __contains__(self, name):
+        """Return `True` if a variable is included.
+        """
+        if self._nameset is None:
+            return name in self._sim
+        return name in self._nameset
+
+    def __getitem__(self, name):
+        """Return the attribute of a single variable.
+        """
+        try:
+            return self._cache[name]
+        except KeyError:
+            if name not in self:
+                raise KeyError(name)
+        value = getattr(self._sim[name], self._attr)
+        if self._call is not None:
+            args, kwargs = self._call
+            value = value(*args, **kwargs)
+        self._cache[name] = value
+        return value
+
+    def __iter__(self):
+        """Return an iterator over the variable names.
+        """
+        return iter(self.keys())
+
+    def __len__(self):
+        """Return the number of variables.
+        """
+        return len(self.keys())
+
+    def __repr__(self):
+        """Return a formal representation of the dictionary.
+        """
+        return repr(dict(self.items()))
+
+    def _evaluate(self):
+        """Evaluate the attribute of all of the variables.
+        """
+        names = [name for name in self.keys() if name not in self._cache]
+        if self._call is not None or (self._attr not in _BATCH_STATS
+                                      and self._attr != 'value'):
+            for name in names:
+                self[name]
+            return
+
+        variables = [self._sim[name] for name in names]
+        if self._attr == 'value':
+            if not all(_batch_stat(variables, 'is_constant')):
+                raise ValueError("The variables aren't all constants.  "
+                                 "Use values() instead of value.")
+            results = _batch_stat(variables, 'IV')
+        else:
+            results = _batch_stat(variables, self._attr)
+        if self._attr == 'is_constant':
+            results = [bool(result) for result in results]
+        else:
+            results = [variable._wrap(result)
+                       for variable, result in zip(variables, results)]
+        self._cache.update(zip(names, results))
+
+    def filter(self, pattern=None, re=False):
+        r"""Return an :class:`AttrDict` with only the variables whose names
+        match a pattern.
+
+        The arguments are the same as those of :meth:`SimRes.find`, except
+        *constants_only*.
+        """
+        sub = self.__class__(self._sim, self._attr,
+                             util.match(self.keys(), pattern, re), self._call)
+        sub._cache = self._cache
+        return sub
+
+    def items(self):
+        """Return a list of (name, attribute) pairs.
+        """
+        self._evaluate()
+        return [(name, self._cache[name]) for name in self.keys()]
+
+    def keys(self):
+        """Return a list of the variable names.
+        """
+        if self._names is None:
+            return list(self._sim)
+        return list(self._names)
+
+    def values(self):
+        """Return a list of the attribute of the variables.
+        """
+        self._evaluate()
+        return [self._cache[name] for name in self.keys()]
+
+
 class SimRes(Res, dict):
     """Class to load, analyze, and plot results from a Modelica_ simulation
 
@@ -710,6 +2264,17 @@ class SimRes(Res, dict):
          By default (*None), the available functions are tried in order until
          one works (or none do).
 
+    - *memory_budget*: Maximum memory to be used by the values of the
+      variables, in bytes or as a string with a unit (e.g., '2GB')
+
+         If *memory_budget* is 'None' (default), all of the values are loaded
+         at once.  Otherwise, the trajectory matrices are memory-mapped and the
+         values of each variable are read when they are needed and kept in a
+         :class:`TrajectoryCache` (:attr:`trajectory_cache`), which evicts the
+         least recently used values to stay within the budget.  This is
+         currently supported for MATLAB\ :sup:`®` v4 files (as written by
+         Dymola\ :sup:`®`); other files are loaded entirely.
+
     **Methods:**
 
     A :class:`SimRes` instance is a special dictionary with variable names as
@@ -839,19 +2404,36 @@ class SimRes(Res, dict):
 
          If the attribute is a method, it is possible to call the dictionary.
          The result of the call is a new dictionary containing the variable
-         names as keys and the return values as the values.
+         names as keys and the return values as the values.  The dictionaries
+         are evaluated lazily and can be filtered by variable name; see
+         :class:`AttrDict`.
 
     **Other methods:**
 
     - :meth:`browse` - Launch a variable browser.
 
+    - :meth:`crossings` - Return the times at which variables cross a level.
+
+    - :meth:`cumintegral` - Return the cumulative time integrals of variables.
+
+    - :meth:`eval` - Evaluate an expression of variables as a new variable.
+
     - :meth:`find` - Find variable names that match a pattern.
 
+    - :meth:`first_exceedance` - Return the times at which variables first
+      exceed a level.
+
+    - :meth:`memory_usage` - Return a dictionary of the memory used by the
+      simulation result.
+
     - :meth:`plot` - Plot data as points and/or curves in 2D Cartesian
       coordinates.
 
     - :meth:`sankey` - Create a figure with one or more Sankey diagrams.
 
+    - :meth:`share` - Send the trajectories through shared memory when the
+      simulation result is pickled within a context.
+
     - :meth:`to_pandas` - Return a `pandas DataFrame`_ with selected variables.
 
     **Properties:**
@@ -871,6 +2453,10 @@ class SimRes(Res, dict):
     - :attr:`tool` - String indicating the function used to load the results
       (named after the corresponding Modelica_ tool)
 
+    - :attr:`trajectory_cache` - :class:`TrajectoryCache` of the values that
+      have been read (with hit and miss counters) if *memory_budget* was given;
+      otherwise, 'None'
+
     **Examples:**
 
     .. code-block:: python
@@ -924,7 +2510,8 @@ class SimRes(Res, dict):
        http://pandas.pydata.org/pandas-docs/stable/generated/pandas.DataFrame.html?highlight=dataframe#pandas.DataFrame
     """
 
-    def __init__(self, fname='dsres.mat', constants_only=False, tool=None):
+    def __init__(self, fname='dsres.mat', constants_only=False, tool=None,
+                 memory_budget=None):
         """Upon initialization, read Modelica_ simulation results from a file.
 
         See the top-level class documentation.
@@ -932,11 +2519,17 @@ class SimRes(Res, dict):
 
         # Read the file.
         fname = util.cleanpath(fname)
+        if memory_budget is None:
+            self.trajectory_cache = None
+            kwargs = {}
+        else:
+            self.trajectory_cache = TrajectoryCache(memory_budget)
+            kwargs = dict(cache=self.trajectory_cache)
         if tool is None:
             # Read the file and store the variables.
             for tool, read in READERS[:-1]:
                 try:
-                    variables = read(fname, constants_only)
+                    variables = read(fname, constants_only, **kwargs)
                 except IOError:
                     raise
                 except Exception as exception:
@@ -953,7 +2546,7 @@ class SimRes(Res, dict):
             except KeyError:
                 raise LookupError("%s isn't one of the available tools (%s)."
                                   % (tool, ', '.join(list(readerdict))))
-        variables = read(fname, constants_only)
+        variables = read(fname, constants_only, **kwargs)
         self.update(variables)
 
         # Remember the tool and filename.
@@ -1143,6 +2736,200 @@ class SimRes(Res, dict):
         """
         return sorted(self)
 
+    def crossings(self, names, level, direction='both'):
+        """Return the times at which variables cross a level.
+
+        The values are searched for crossings across each trajectory matrix at
+        once (rather than variable by variable), and the time of each crossing
+        is interpolated linearly between the samples.  A crossing is only
+        counted where the values change from one side of the level to the
+        other; samples that are exactly at the level (e.g., the first one) are
+        not crossings by themselves.
+
+        **Parameters:**
+
+        - *names*: Name or list of names of the variables
+
+        - *level*: Level (in SI units) or list of levels (one per variable)
+
+        - *direction*: 'both' (default), 'rising', or 'falling'
+
+        **Returns:**
+
+        1. Array of the indices (in *names*) of the variables that cross the
+           level
+
+        2. Array of the corresponding crossing times in seconds
+
+        The crossings are sorted by variable and then by time.
+
+        **Example:**
+
+        >>> sim = SimRes('examples/ChuaCircuit.mat')
+        >>> indices, times = sim.crossings(['C1.v', 'L.v'], 0, 'rising')
+        >>> indices
+        array([0, 1, 1, 1, 1, 1, 1, 1])
+        >>> [round(time, 1) for time in times[:3]]
+        [1139.7, 344.6, 667.8]
+
+        L.v starts at the level, but that isn't a crossing:
+
+        >>> print(sim['L.v'].IV)
+        0 V
+        >>> indices, times = sim.crossings('L.v', 0)
+        >>> round(times[0], 1)
+        140.3
+        """
+        if isinstance(names, string_types):
+            names = [names]
+        return _crossings([self[name] for name in names], level, direction)
+
+    def cumintegral(self, names):
+        """Return the cumulative time integrals of variables as new variables.
+
+        The integrals of the variables in each trajectory matrix are calculated
+        together in one pass.  The results are cached in the original
+        variables, so :meth:`Variable.cumintegral` and
+        :meth:`Variable.integral` use them without further computation.
+
+        **Parameters:**
+
+        - *names*: Name or list of names of the variables
+
+        **Returns:** :class:`Variable` if *names* is a string; otherwise, a
+        :class:`VarList`
+
+        **Example:**
+
+        >>> sim = SimRes('examples/ChuaCircuit.mat')
+        >>> energies = sim.cumintegral(['Ro.LossPower', 'G.LossPower'])
+        >>> energies[0] is sim['Ro.LossPower'].cumintegral()
+        True
+        """
+        if isinstance(names, string_types):
+            return self[names].cumintegral()
+
+        variables = [self[name] for name in names]
+        pending = [variable for variable in variables
+                   if variable._cached('cumintegral') is None]
+        for block, timebase, indices, columns, signs in _column_groups(pending):
+            integrals = _cumintegrate(block, columns, signs, timebase)
+            for j, i in enumerate(indices):
+                pending[i]._derive('cumintegral', integrals[:, j], 1,
+                                   "Cumulative integral of ")
+        return VarList([variable.cumintegral() for variable in variables])
+
+    def eval(self, expr, description=None):
+        """Evaluate an expression of variables and return the result as a new
+        :class:`Variable`.
+
+        **Parameters:**
+
+        - *expr*: String with a Modelica_-style expression of variables
+
+             The variable names are used directly (e.g., 'C1.v' or 'C1.der(v)').
+             Numbers, the arithmetic operators (including '^' for power),
+             and these functions are allowed: abs, acos, asin, atan, atan2, cos,
+             cosh, exp, log, log10, max, min, sign, sin, sinh, sqrt, tan, and
+             tanh.  The constant pi is also available.
+
+        - *description*: Description of the new variable
+
+             By default, the expression is used.
+
+        The operands are aligned on their shared time base.  If they don't
+        share one, the time-varying operands are interpolated to the times of
+        the 'Time' variable.  Constant operands are used as numbers.  The
+        expression is evaluated in chunks of samples so that the intermediate
+        results are never full-length arrays.  The dimension of the result is
+        determined from the dimensions of the operands.  A :class:`TypeError`
+        is raised if the argument of a function other than abs, max, min,
+        sign, or sqrt isn't dimensionless (or the arguments of atan2 don't
+        have the same dimension).
+
+        **Example:**
+
+        >>> sim = SimRes('examples/ChuaCircuit.mat')
+        >>> power = sim.eval("C1.v * L.i - Ro.v^2 / Ro.R")
+        >>> power.dimension
+        L2.M/T3
+        >>> print(power.FV)
+        4.90731 A*V
+
+        >>> sim.eval("sin(C1.v / Nr.v)").dimension
+        <BLANKLINE>
+        >>> sim.eval("sin(C1.v)") # doctest: +ELLIPSIS
+        Traceback (most recent call last):
+        ...
+        TypeError: The argument of sin() in the expression must be dimensionless, not L2.M/(I.T3).
+        """
+        # Replace the variable names with placeholders.
+        names = []
+
+        def substitute(match):
+            """Return the placeholder for a variable name.
+            """
+            name = match.group(0)
+            if name in _EXPR_NAMESPACE and name not in self:
+                return name
+            self[name] # Check that the variable exists.
+            if name not in names:
+                names.append(name)
+            return '_v%i' % names.index(name)
+
+        code = compile(_EXPR_NAME.sub(substitute, expr.replace('^', '**')),
+                       '<expression>', 'eval')
+        variables = [self[name] for name in names]
+
+        # Determine the dimension and display unit of the result.
+        namespace = dict(_EXPR_DIMENSION_NAMESPACE, __builtins__={})
+        for i, variable in enumerate(variables):
+            namespace['_v%i' % i] = Quantity.quicknew(
+                1.0, variable.dimension, variable.display_unit)
+        example = eval(code, namespace)
+        namespace = dict(_EXPR_NAMESPACE, __builtins__={})
+        dimension = nc.dimension(example)
+        display_unit = nc.display_unit(example)
+
+        # Choose the time base.
+        constant = [variable._raw_stat('is_constant') for variable in variables]
+        varying = [variable._samples.timebase
+                   for variable, is_constant in zip(variables, constant)
+                   if not is_constant]
+        if not varying:
+            timebase = (variables[0]._samples.timebase if variables else
+                        self['Time']._samples.timebase)
+        elif all(varying[0].aligned(other) for other in varying[1:]):
+            timebase = varying[0]
+        else:
+            timebase = self['Time']._samples.timebase
+
+        # Gather the operands.  Those that aren't aligned with the time base
+        # are resampled (or reduced to a number if they are constant).
+        operands = []
+        for variable, is_constant in zip(variables, constant):
+            samples = variable._samples
+            if samples.timebase.aligned(timebase):
+                operands.append(samples)
+            elif is_constant:
+                operands.append(variable._raw_stat('IV'))
+            else:
+                operands.append(Samples(timebase, np.interp(
+                    timebase.times, samples.times, samples.values)))
+
+        # Evaluate the expression in chunks.
+        values = np.empty(len(timebase))
+        for start in range(0, len(timebase), _EXPR_CHUNK_SIZE):
+            rows = slice(start, start + _EXPR_CHUNK_SIZE)
+            for i, operand in enumerate(operands):
+                namespace['_v%i' % i] = (_signed_chunk(operand, rows)
+                                         if isinstance(operand, tuple)
+                                         else operand)
+            values[rows] = eval(code, namespace)
+
+        return Variable(Samples(timebase, values), dimension, display_unit,
+                        expr if description is None else description)
+
     def find(self, pattern=None, re=False, constants_only=False):
         r"""Find variable names that match a pattern.
 
@@ -1211,6 +2998,79 @@ class SimRes(Res, dict):
         # Return the filtered list.
         return util.match(names, pattern, re)
 
+    def first_exceedance(self, names, level):
+        """Return the times at which variables first exceed a level.
+
+        The values are searched across each trajectory matrix at once (rather
+        than variable by variable), and the time at which the level is first
+        exceeded is interpolated linearly between the samples.
+
+        **Parameters:**
+
+        - *names*: Name or list of names of the variables
+
+        - *level*: Level (in SI units) or list of levels (one per variable)
+
+        **Returns:** Array of the times in seconds, with one entry per
+        variable
+
+             If a variable never exceeds its level, the entry is *nan*.  If it
+             exceeds the level initially, the entry is the initial time.
+
+        **Example:**
+
+        >>> sim = SimRes('examples/ChuaCircuit.mat')
+        >>> times = sim.first_exceedance(['C1.v', 'L.v', 'C1.C'], [4.2, 0.5, 20])
+        >>> [round(time, 1) for time in times]
+        [63.9, 27.3, nan]
+        """
+        if isinstance(names, string_types):
+            names = [names]
+        return _first_exceedances([self[name] for name in names], level)
+
+    def memory_usage(self, deep=True):
+        """Return a dictionary of the memory used by the simulation result in
+        bytes.
+
+        **Parameters:**
+
+        - *deep*: *True* to also count the Python objects (names, descriptions,
+          :class:`Variable` instances, and unit metadata)
+
+        **Returns:** Ordered dictionary with these entries:
+
+        - *trajectories*: Memory of the arrays of times and values
+
+        - *owned*: Part of *trajectories* that is used by only one variable
+
+        - *shared*: Part of *trajectories* that is shared among variables
+          (e.g., the trajectory matrices of the result file)
+
+        - *resident*: Part of *trajectories* that is in memory
+
+        - *mapped*: Part of *trajectories* that is memory-mapped from a file
+
+        - *caches*: Memory of cached information (time steps, interpolation
+          plans, derived variables such as cumulative integrals, and the
+          values in :attr:`trajectory_cache`)
+
+        - *names*, *descriptions*, *variables*, and *units* (only if *deep* is
+          *True*): Sizes of the Python objects
+
+        - *total*: Sum of the above, without double-counting the parts of
+          *trajectories*
+
+        **Example:**
+
+        >>> sim = SimRes('examples/ChuaCircuit.mat')
+        >>> usage = sim.memory_usage()
+        >>> usage['trajectories'] == usage['owned'] + usage['shared']
+        True
+        >>> usage['total'] > usage['trajectories'] > 0
+        True
+        """
+        return _memory_usage([self], deep, by_sim=False)
+
     @property
     def n_constants(self):
         """Number of variables that do not change over time.
@@ -1228,7 +3088,7 @@ class SimRes(Res, dict):
            ...       (sim.n_constants, sim.fbase))
            There are 23 constants in the ChuaCircuit simulation.
         """
-        return sum(self.is_constant)
+        return sum(self.is_constant.values())
 
     def plot(self, y1=[], ylabel1=None, f1={}, legends1=[],
              leg1_kwargs={'loc': 'best'}, ax1=None,
@@ -1236,7 +3096,7 @@ class SimRes(Res, dict):
              leg2_kwargs={'loc': 'best'}, ax2=None,
              x='Time', xlabel=None,
              title=None, label="xy", incl_prefix=False, suffix=None,
-             use_paren=True, **kwargs):
+             use_paren=True, decimate=None, **kwargs):
         r"""Plot variables as points and/or curves in 2D Cartesian coordinates.
 
         The abscissa may be time or any other variable (i.e., scatterplots are
@@ -1306,6 +3166,17 @@ class SimRes(Res, dict):
 
         - *use_paren*: Add parentheses around the suffix
 
+        - *decimate*: Method to reduce the number of points in each curve to
+          about twice the width of the axes in pixels ('minmax' or 'lttb'; see
+          :func:`modelicares.util.decimate`)
+
+             By default ('None'), all of the samples are plotted.  'minmax'
+             preserves the peaks and events and is suited to lines; markers are
+             only drawn at the retained samples.  The decimation is done once for
+             the current size of the axes, so zooming in afterwards doesn't
+             restore the omitted samples.  Curves are only decimated if *x* is
+             'Time'.
+
         - *\*\*kwargs*: Propagated to :func:`modelicares.util.plot` and then to
           :func:`matplotlib.pyplot.plot`.
 
@@ -1407,11 +3278,13 @@ class SimRes(Res, dict):
         yvars1 = self(y1)
         yvars2 = self(y2)
         if x == 'Time':
-            y1 = [value / unit for value, unit in zip(yvars1.values(), units1)]
+            y1 = [_in_unit(variable.raw_values(), variable, unit)
+                  for variable, unit in zip(yvars1, units1)]
             if f1:
                 y1_all = yvars1.values(all_times)
                 y1 += [f(y1_all) for f in f1.values()]
-            y2 = [value / unit for value, unit in zip(yvars2.values(), units2)]
+            y2 = [_in_unit(variable.raw_values(), variable, unit)
+                  for variable, unit in zip(yvars2, units2)]
             if f2:
                 y2_all = yvars2.values(all_times)
                 y2 += [f(y2_all) for f in f2.values()]
@@ -1423,13 +3296,35 @@ class SimRes(Res, dict):
             y2 = yvars2.values(times)
             y2 += [f(y2) for f in f2.values()]
 
-        # Plot the data.
+        # Retrieve the times.
         if y2:
-            y2times = ([time / time_unit for time in yvars2.times()]
+            y2times = ([_in_unit(variable.raw_times(), time, time_unit)
+                        for variable in yvars2]
                        + [all_times] * len(f2) if x == 'Time' else x)
         if y1:
-            y1times = ([time / time_unit for time in yvars1.times()]
-                       + [all_times] * len(f1) if x == 'Time' else x)
+            y1times = ([_in_unit(variable.raw_times(), time, time_unit)
+                        for variable in yvars1]
+                       + [all_times] * len(f1) if x == 'Time' else x)
+
+        # Decimate the curves to the resolution of the axes.
+        if decimate and x == 'Time':
+            n_points = 2 * int(ax1.get_window_extent().width)
+
+            def decimated(all_x, all_y):
+                """Return lists of the decimated x and y values of curves.
+                """
+                pairs = [util.decimate(nc.value(xi), nc.value(yi), n_points,
+                                       decimate)
+                         for xi, yi in zip(all_x, all_y)]
+                return [pair[0] for pair in pairs], [pair[1] for pair in pairs]
+
+            if y1:
+                y1times, y1 = decimated(y1times, y1)
+            if y2:
+                y2times, y2 = decimated(y2times, y2)
+
+        # Plot the data.
+        if y1:
             if y2:
                 # Use solid lines for the primary axis and dotted lines for the
                 # secondary.
@@ -1564,11 +3459,43 @@ class SimRes(Res, dict):
                                   unit=flow_unit, **kwargs).finish())
         return sankeys
 
+    @contextmanager
+    def share(self):
+        """Return a context in which the simulation result is pickled through
+        shared memory.
+
+        Within the context, large trajectory matrices (other than
+        memory-mapped ones) are copied once to shared memory (Python >= 3.8;
+        see :mod:`multiprocessing.shared_memory`), and pickling the result
+        sends only the names of the segments.  This makes it cheap to send one large result to many jobs
+        of a process pool.  The segments are removed when the context exits,
+        so the copies must only be used within it (e.g., by jobs that finish
+        within it).  Outside of the context, the pickle is self-contained (see
+        :meth:`__reduce__`).
+
+        **Example:**
+
+        >>> import pickle
+        >>> sim = SimRes('examples/ChuaCircuit.mat')
+        >>> with sim.share():
+        ...     print(pickle.loads(pickle.dumps(sim, 2))['C1.v'].FV)
+        2.42098 V
+        """
+        assert '_shared_memory' not in self.__dict__, (
+            "The simulation result is already being shared.")
+        segments = self._shared_memory = {}
+        try:
+            yield self
+        finally:
+            del self._shared_memory
+            _release_shared_memory(segments)
+
     def to_pandas(self, names=None, aliases={}):
         """Return a `pandas DataFrame`_ with values from selected variables.
 
         The index is time.  The column headings indicate the variable names and
-        units.
+        display units.  Variables recorded at other times (e.g., parameters)
+        are linearly interpolated to the times of the 'Time' variable.
 
         The data frame has methods for further manipulation and exporting (e.g.,
         :meth:`~pandas.DataFrame.to_clipboard`,
@@ -1624,36 +3551,70 @@ class SimRes(Res, dict):
         # Create the list of variable names.
         if names:
             names = set(flatten_list(names))
-            names.add('Time')
         else:
-            names = self.names
-
-        # Create a dictionary of names and values.
-        times = self['Time'].values()
-        data = {}
-        for name in names:
-
-            # Get the values.
-            if np.array_equal(self[name].times(), times):
-                values = self[name].values() # Save computation.
-            else:
-                values = self[name].values(t=times) # Resample.
-
-            unit = self[name].unit
-
-            # Apply an alias if available.
+            names = set(self.names)
+        names.discard('Time')
+        names = sorted(names)
+        variables = [self[name] for name in names]
+
+        # Create the column headings and look up the display units.
+        labels = []
+        units = []
+        unit_cache = {}
+        for name, variable in zip(names, variables):
+            unit_str = str(variable.display_unit)
             try:
-                name = aliases[name]
+                unit = unit_cache[unit_str]
             except KeyError:
-                pass
-
-            if unit:
-                data.update({name + ' / ' + unit: values})
+                unit = unit_cache[unit_str] = U._units(**variable.display_unit)
+            units.append(unit)
+            label = aliases.get(name, name)
+            labels.append(label + ' / ' + unit_str if unit_str else label)
+
+        # Gather the values from the trajectory blocks.  The variables on the
+        # time base of the 'Time' variable are selected as columns in one
+        # operation per block and those on other time bases are interpolated
+        # in one operation per block.  The data is stored in Fortran order so
+        # that pandas can use it without copying.
+        timebase = self['Time']._samples.timebase
+        times = timebase.times
+        groups, others = _group_by_block(variables)
+        in_block = sorted(i for group in groups for i in group[2])
+        position = dict((i, j) for j, i in enumerate(in_block))
+        data = np.empty((len(times), len(in_block)),
+                        np.result_type(*[group[0].dtype for group in groups])
+                        if groups else float, order='F')
+        for block, block_timebase, indices, columns, signs in groups:
+            positions = [position[i] for i in indices]
+            if block_timebase.aligned(timebase):
+                data[:, positions] = block[:, columns] * signs
+            else:
+                data[:, positions] = block_timebase.interpolate(
+                    block, columns, timebase) * signs
+
+        # Convert the values to the display units.
+        factors = np.ones(len(in_block), data.dtype)
+        for j, i in enumerate(in_block):
+            if isinstance(units[i], nc.LambdaUnit):
+                data[:, j] = _in_unit(data[:, j], variables[i], units[i])
             else:
-                data.update({name: values})
+                factors[j] = nc.value(units[i])
+        if np.any(factors != 1):
+            data /= factors
 
         # Create the pandas data frame.
-        return DataFrame(data).set_index('Time / s')
+        frame = DataFrame(data, index=Index(times, name='Time / s'),
+                          columns=[labels[i] for i in in_block], copy=False)
+
+        # Insert the variables that aren't stored in blocks.
+        for i in others:
+            samples = variables[i]._samples
+            if samples.timebase.aligned(timebase):
+                values = samples.values
+            else:
+                values = np.interp(times, samples.times, samples.values)
+            frame.insert(i, labels[i], _in_unit(values, variables[i], units[i]))
+        return frame
 
     def __call__(self, names):
         """Access a list of variables by their names.
@@ -1715,15 +3676,78 @@ class SimRes(Res, dict):
         If the attribute is a method, it is possible to call the dictionary.
         The result of the call is a new dictionary containing the variable names
         as keys and the return values as the values.
+
+        The dictionary is an :class:`AttrDict`, which is only evaluated as
+        needed and can be filtered by variable name.
         """
-        values = (getattr(value, attr) for value in self.values())
-        try:
-            return util.CallDict(zip(self.keys(), values))
-        except ValueError:
-            if attr == 'value' and len(self) <> self.n_constants:
-                raise ValueError("The variables aren't all constants.  "
-                                 "Use values() instead of value.")
-            raise
+        if attr.startswith('__') or not hasattr(Variable, attr):
+            raise AttributeError("'%s' object has no attribute '%s'"
+                                 % (self.__class__.__name__, attr))
+        return AttrDict(self, attr)
+
+    def __reduce__(self):
+        """Pickle the simulation result without copying the trajectories for
+        each variable.
+
+        Each array that holds trajectory data (e.g., a trajectory matrix of
+        the result file) is pickled once, and the variables refer to it by
+        offset and strides.  If the array is memory-mapped, only the path of
+        the file and the offset are pickled.  Otherwise, the pickle contains
+        the data, so it can be stored and loaded in another session.  Within
+        :meth:`share`, large arrays are sent through shared memory instead.
+
+        Cached information (e.g., derived variables) isn't pickled.
+
+        **Example:**
+
+        >>> import pickle
+        >>> sim = SimRes('examples/ChuaCircuit.mat')
+        >>> data = pickle.dumps(sim, 2)
+        >>> del sim
+        >>> sim2 = pickle.loads(data)
+        >>> print(sim2['C1.v'].FV)
+        2.42098 V
+        """
+        segments = self.__dict__.get('_shared_memory')
+
+        roots = {}
+        descriptions = []
+        timebase_indices = {}
+        timebases = []
+
+        def encode(field):
+            """Encode a field of the samples of a variable."""
+            if isinstance(field, TimeBase):
+                try:
+                    index = timebase_indices[id(field)]
+                except KeyError:
+                    if isinstance(field, ChunkedTimeBase):
+                        handle = ('chunks', [encode(chunk)[1]
+                                             for chunk in field.chunks])
+                    else:
+                        handle = _encode_array(field.times, roots,
+                                               descriptions, segments)
+                    index = timebase_indices[id(field)] = len(timebases)
+                    timebases.append(handle)
+                return ('timebase', index)
+            if isinstance(field, np.ndarray):
+                return _encode_array(field, roots, descriptions, segments)
+            if isinstance(field, list): # Samples of a sequence of simulations
+                return [encode_samples(chunk) for chunk in field]
+            return field
+
+        def encode_samples(samples):
+            """Encode the samples of a variable."""
+            return type(samples), [encode(field) for field in samples]
+
+        variables = [(name,) + encode_samples(variable._samples)
+                     + (variable._dimension, variable._display_unit,
+                        variable.description)
+                     for name, variable in self.items()]
+        attributes = dict((key, value) for key, value in self.__dict__.items()
+                          if key not in ['_shared_memory', '_attached'])
+        return (_rebuild_simres, (self.__class__, attributes, descriptions,
+                                  timebases, variables))
 
     def __str__(self):
         """Return an informal description of the :class:`SimRes` instance.
@@ -1764,6 +3788,335 @@ class SimRes(Res, dict):
         return self._get(names, lambda name: self._traj[name].unit)
 
 
+def _resample(sims, names, times, allocate):
+    """Resample variables from each of several simulations to common times.
+
+    This is a generator that yields the array of values (times by variables)
+    for each simulation after it is filled.  The array is provided by
+    *allocate*\(*run*, *n_times*\), where *run* is the index of the
+    simulation.
+
+    If *times* is 'None', the recorded times of the first variable in the
+    first simulation are used.  Each trajectory block is gathered with one
+    operation, and the interpolation plans are shared among the simulations
+    with the same recorded times.
+    """
+    grid = None if times is None else TimeBase(
+        np.atleast_1d(np.asarray(nc.value(times), float)))
+    plans = {} # Hash of the recorded times -> interpolation plan or None
+
+    def plan(timebase):
+        """Return the plan to interpolate to the grid (None if aligned)."""
+        try:
+            return plans[timebase.hash]
+        except KeyError:
+            return plans.setdefault(timebase.hash,
+                                    None if timebase.aligned(grid)
+                                    else timebase.bracket(grid))
+
+    for run, sim in enumerate(sims):
+        variables = [sim[name] for name in names]
+        if grid is None:
+            grid = variables[0]._samples.timebase
+        out = allocate(run, len(grid))
+        groups, others = _group_by_block(variables)
+        for block, timebase, indices, columns, signs in groups:
+            block_plan = plan(timebase)
+            if block_plan is None:
+                out[:, indices] = block[:, columns]
+            else:
+                out[:, indices] = _interpolate(block, columns, block_plan)
+            if np.any(signs < 0):
+                out[:, indices] *= signs
+        for i in others:
+            samples = variables[i]._samples
+            values = np.asarray(samples.values, float)[:, np.newaxis]
+            sample_plan = plan(samples.timebase)
+            out[:, i] = (values[:, 0] if sample_plan is None else
+                         _interpolate(values, [0], sample_plan)[:, 0])
+        yield out
+
+
+def _run_constants(sim):
+    """Return the names and raw values of the constants of a simulation.
+
+    Only the variables that are recorded at no more than two times (e.g., in
+    the first trajectory matrix of Dymola-formatted results, at the start and
+    stop times) are considered, so the full trajectories aren't scanned.  *sim*
+    may also be a dictionary of variables (e.g., from a reader with
+    *constants_only*).
+    """
+    names = []
+    variables = []
+    for name, variable in sim.items():
+        if len(variable._samples.timebase) <= 2:
+            names.append(name)
+            variables.append(variable)
+    values = np.empty(len(variables))
+    constant = np.ones(len(variables), bool)
+    groups, others = _group_by_block(variables)
+    for block, _, indices, columns, signs in groups:
+        rows = block[:, columns]
+        values[indices] = rows[0] * signs
+        constant[indices] = np.all(rows == rows[0], axis=0)
+    for i in others:
+        samples = np.asarray(variables[i]._samples.values)
+        values[i] = samples[0]
+        constant[i] = np.all(samples == samples[0])
+    return [name for name, is_constant in zip(names, constant)
+            if is_constant], values[constant]
+
+
+class _NameIndex(object):
+    """Index of the variable names in a list of simulations, with a bitset of
+    the names that each simulation contains
+
+    The bitsets are packed into rows of bytes (one row per simulation) so that
+    intersections and unions across the simulations are bitwise reductions.
+    The index is synchronized with the list by comparing the identities of the
+    simulations (and the number of variables in those that are loaded); only
+    the simulations that have been added or changed are scanned.
+
+    **Parameters:**
+
+    - *constants_only*: *True* to index only the variables that do not change
+      over time
+    """
+
+    def __init__(self, constants_only=False):
+        self.constants_only = constants_only
+        self.names = [] # All of the names that have been seen
+        self._positions = {} # name -> index in names
+        self._rows = {} # id(sim) -> (sim, number of variables, packed bitset)
+        self._key = None # Identities of the simulations in _matrix
+        self._matrix = None
+
+    def _bitset(self, sim):
+        """Return the packed bitset of the names in a simulation, adding new
+        names to the index.
+        """
+        names = (sim.find(constants_only=True) if self.constants_only
+                 else list(sim))
+        positions = []
+        for name in names:
+            try:
+                positions.append(self._positions[name])
+            except KeyError:
+                positions.append(len(self.names))
+                self._positions[name] = len(self.names)
+                self.names.append(name)
+        bits = np.zeros(len(self.names), bool)
+        bits[positions] = True
+        return np.packbits(bits)
+
+    def sync(self, sims):
+        """Update the index for a list of simulations and return the matrix of
+        bitsets (simulations by bytes).
+        """
+        # The number of variables is only checked for simulations that are
+        # loaded (not LazySimRes instances, which would be loaded by len()).
+        key = tuple((id(sim), dict.__len__(sim) if isinstance(sim, dict)
+                     else None) for sim in list.__iter__(sims))
+        if key == self._key:
+            return self._matrix
+        rows = {}
+        for sim, (sim_id, n_variables) in zip(list.__iter__(sims), key):
+            row = self._rows.get(sim_id)
+            if row is None or row[1] != n_variables:
+                row = sim, n_variables, self._bitset(sim)
+            rows[sim_id] = row
+        self._rows = rows
+        matrix = np.zeros((len(key), (len(self.names) + 7) // 8), np.uint8)
+        for row, (sim_id, _) in zip(matrix, key):
+            bitset = rows[sim_id][2]
+            row[:len(bitset)] = bitset
+        self._key = key
+        self._matrix = matrix
+        return matrix
+
+    def select(self, bitset):
+        """Return a sorted list of the names in a packed bitset."""
+        indices = np.flatnonzero(np.unpackbits(bitset)[:len(self.names)])
+        return sorted(self.names[i] for i in indices)
+
+    def common(self, sims):
+        """Return a sorted list of the names in all of the simulations."""
+        matrix = self.sync(sims)
+        if not len(matrix):
+            return []
+        return self.select(np.bitwise_and.reduce(matrix, axis=0))
+
+    def membership(self, sims, name):
+        """Return a Boolean array indicating which simulations contain a
+        name.
+        """
+        matrix = self.sync(sims)
+        try:
+            position = self._positions[name]
+        except KeyError:
+            return np.zeros(len(matrix), bool)
+        return (matrix[:, position // 8] & (128 >> position % 8)) > 0
+
+    def partial(self, sims):
+        """Return a sorted list of the names that are in some but not all of
+        the simulations.
+        """
+        matrix = self.sync(sims)
+        if not len(matrix):
+            return []
+        return self.select(np.bitwise_or.reduce(matrix, axis=0)
+                           & ~np.bitwise_and.reduce(matrix, axis=0))
+
+
+class _SimResLoader(object):
+    """Load simulation results on demand for :class:`LazySimRes` instances,
+    keeping at most *max_loaded* of them and reading up to *prefetch* more
+    ahead on a background thread
+
+    The loader may be used from several threads.  Its background thread is
+    stopped by :meth:`close` or when the loader is deleted.
+    """
+
+    def __init__(self, max_loaded, prefetch=1):
+        assert max_loaded >= 1, "At least one simulation must be kept loaded."
+        self.max_loaded = max_loaded
+        self.prefetch = prefetch
+        self._loaded = OrderedDict() # fname -> SimRes, most recently used last
+        self._pending = OrderedDict() # fname -> AsyncResult
+        self._pool = None
+        self._lock = Lock() # Guards _loaded, _pending, and _pool
+
+    def __del__(self):
+        """Stop the background thread once it finishes the current read."""
+        pool = getattr(self, '_pool', None)
+        if pool is not None:
+            pool.close()
+
+    def __reduce__(self):
+        """Pickle the settings but not the loaded simulations."""
+        return (self.__class__, (self.max_loaded, self.prefetch))
+
+    def close(self):
+        """Stop the background thread and forget the pending reads.
+
+        The loaded simulations are kept, and later reads are done in the
+        calling thread until :meth:`read_ahead` is used again.
+        """
+        with self._lock:
+            pool, self._pool = self._pool, None
+            self._pending.clear()
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    def is_loaded(self, fname):
+        """Return *True* if the simulation from a file is loaded."""
+        return fname in self._loaded
+
+    def load(self, fname):
+        """Return the simulation from a file, loading it if necessary and
+        unloading the least recently used one if there are too many.
+        """
+        with self._lock:
+            sim = self._loaded.pop(fname, None)
+            pending = (self._pending.pop(fname, None) if sim is None
+                       else None)
+        if sim is None:
+            # Read outside of the lock so that other simulations can be used.
+            sim = SimRes(fname) if pending is None else pending.get()
+        with self._lock:
+            self._loaded.pop(fname, None) # It may have been loaded meanwhile.
+            while len(self._loaded) >= self.max_loaded:
+                self._loaded.popitem(last=False)
+            self._loaded[fname] = sim
+        return sim
+
+    def read_ahead(self, fnames):
+        """Start loading simulations from files in the background.
+
+        Only the first *prefetch* files are considered.  While *prefetch*
+        simulations are pending, further requests are skipped rather than
+        queued.  Finished reads that are no longer requested are forgotten.
+        """
+        wanted = fnames[:self.prefetch]
+        with self._lock:
+            for fname, result in list(self._pending.items()):
+                if fname not in wanted and result.ready():
+                    del self._pending[fname]
+            for fname in wanted:
+                if fname in self._loaded or fname in self._pending:
+                    continue
+                if len(self._pending) >= self.prefetch:
+                    break
+                if self._pool is None:
+                    from multiprocessing.pool import ThreadPool
+                    self._pool = ThreadPool(1)
+                self._pending[fname] = self._pool.apply_async(SimRes, (fname,))
+
+
+class LazySimRes(Res):
+    """Placeholder for simulation results that are loaded on first use
+
+    Instances are created by :class:`SimResList` when *max_loaded* is given.
+    The attributes, items, and methods of the underlying :class:`SimRes`
+    instance are available directly.  Only a limited number of simulations are
+    kept loaded at once; a simulation that was unloaded is loaded again when
+    it is used.
+
+    **Example:**
+
+    >>> sims = SimResList('examples/ChuaCircuit/*/', max_loaded=1)
+    >>> sims.sort()
+    >>> sim = sims[0]
+    >>> sim.loaded
+    False
+    >>> print(sim['L.L'].value)
+    15 H
+    >>> sim.loaded
+    True
+    """
+
+    def __init__(self, fname, loader):
+        super(LazySimRes, self).__init__(fname)
+        self._loader = loader
+
+    def __contains__(self, name):
+        """Return *True* if a variable is in the simulation."""
+        return name in self.sim
+
+    def __getattr__(self, attr):
+        """Look up an attribute of the simulation (loading it if necessary)."""
+        if attr.startswith('_'):
+            raise AttributeError(attr)
+        return getattr(self.sim, attr)
+
+    def __getitem__(self, key):
+        """Return a variable from the simulation."""
+        return self.sim[key]
+
+    def __iter__(self):
+        """Iterate over the names of the variables in the simulation."""
+        return iter(self.sim)
+
+    def __len__(self):
+        """Return the number of variables in the simulation."""
+        return len(self.sim)
+
+    def __str__(self):
+        """Return str(self)."""
+        return str(self.sim)
+
+    @property
+    def loaded(self):
+        """*True* if the simulation is currently loaded"""
+        return self._loader.is_loaded(self.fname)
+
+    @property
+    def sim(self):
+        """The :class:`SimRes` instance (loaded if necessary)"""
+        return self._loader.load(self.fname)
+
+
 class SimResList(ResList):
     r"""Special list of simulation results (:class:`SimRes` instances)
 
@@ -1791,6 +4144,17 @@ class SimResList(ResList):
          Each file will be opened once at most; duplicate filename matches are
          ignored.
 
+    - :class:`SimResList`\(*filespec1*, ..., max_loaded=*n*, prefetch=*m*):
+      Checks only the headers of the files and returns a :class:`SimResList`
+      of :class:`LazySimRes` instances, which load the simulation results on
+      first use
+
+         At most *n* simulations are kept loaded at once; the least recently
+         used one is unloaded to make room for another.  While iterating over
+         the list, the next *m* simulations (default: 1) are loaded on a
+         background thread.  This overlaps reading files with processing them
+         in bounded memory.
+
     **Built-in methods:**
 
     The list has all of the methods of a standard Python_ list (e.g., + or
@@ -1855,14 +4219,40 @@ class SimResList(ResList):
 
     **Additional methods:**
 
+    - :meth:`crossings` - Return the times at which variables cross a level in
+      each of the simulations.
+
+    - :meth:`ensemble` - Return statistics of a variable across the
+      simulations at each of some times.
+
     - :meth:`find` - Find the names of variables that are present in all of the
       simulations and that match a pattern.
 
+    - :meth:`first_exceedance` - Return the times at which variables first
+      exceed a level in each of the simulations.
+
+    - :meth:`from_catalog` - Return a list of the simulations in a catalog that
+      meet a condition.
+
     - :meth:`plot` - Plot data from the simulations in 2D Cartesian coordinates.
 
     - :meth:`get_unique_IVs` - Return a dictionary of initial values that are
       different among the variables that the simulations share.
 
+    - :meth:`groupby` - Group the simulations by the values of parameters.
+
+    - :meth:`memory_usage` - Return a dictionary of the memory used by the
+      simulation results.
+
+    - :meth:`params` - Return a `pandas DataFrame`_ of the parameters of the
+      simulations.
+
+    - :meth:`stack` - Return the values of variables across all of the
+      simulations as a single array.
+
+    - :meth:`where` - Return a list of the simulations with parameters that
+      meet a condition.
+
     **Properties:**
 
     - :attr:`dirname` - Highest common directory that the result files share
@@ -1907,6 +4297,9 @@ class SimResList(ResList):
         'L.L': [15.0, 21.0],
        ...}
 
+    .. _pandas DataFrame:
+       http://pandas.pydata.org/pandas-docs/stable/generated/pandas.DataFrame.html
+
     .. testcleanup::
 
        >>> sims.sort()
@@ -1930,12 +4323,17 @@ class SimResList(ResList):
        [15.0, 21.0]
     """
 
-    def __init__(self, *args):
+    _name_indices = None # Name indices by constants_only (see _name_index())
+    _params = None # Simulations and their parameter table
+
+    def __init__(self, *args, **kwargs):
         """Initialize as a list of :class:`SimRes` instances, loading files as
         necessary.
 
         See the top-level class documentation.
         """
+        loader = _get_loader(kwargs)
+
         if not args: # Empty list
             super(SimResList, self).__init__([])
 
@@ -1947,13 +4345,13 @@ class SimResList(ResList):
                     "The simulation list can only be initialized by "
                     "providing a list of SimRes instances or a series of "
                     "arguments, each of which is a filename or directory.")
-            list.__init__(self, _get_sims(fnames))
+            list.__init__(self, _get_sims(fnames, loader))
 
         elif len(args) == 1: # List or iterable of SimRes instances
             sims = list(args[0])
             for sim in sims:
-                assert isinstance(sim, SimRes), ("All entries in the list must "
-                                                 "be SimRes instances.")
+                assert isinstance(sim, (SimRes, LazySimRes)), (
+                    "All entries in the list must be SimRes instances.")
             list.__init__(self, sims)
 
         else:
@@ -2007,14 +4405,241 @@ class SimResList(ResList):
               ChuaCircuit/2/dsres.mat
               ThreeTanks.mat
         """
-        if isinstance(item, SimRes):
+        if isinstance(item, (SimRes, LazySimRes)):
             list.append(self, item)
         else:
             assert isinstance(item, string_types), (
                 "The simulation list can ony be appended by providing a SimRes "
                 "instance, filename, or directory.")
             fnames = multiglob(item)
-            self.extend(SimResList(_get_sims(fnames)))
+            # If the list is lazy, the new entries are too.
+            loaders = [sim._loader for sim in list.__iter__(self)
+                       if isinstance(sim, LazySimRes)]
+            self.extend(SimResList(_get_sims(fnames, loaders[0] if loaders
+                                             else None)))
+
+    def crossings(self, names, level, direction='both'):
+        """Return the times at which variables cross a level in each of the
+        simulations.
+
+        The parameters are the same as those of :meth:`SimRes.crossings`.
+
+        **Returns:**
+
+        1. Array of the indices of the simulations
+
+        2. Array of the indices (in *names*) of the variables
+
+        3. Array of the corresponding crossing times in seconds
+
+        The crossings are sorted by simulation, then by variable, and then by
+        time.
+
+        **Example:**
+
+        >>> sims = SimResList('examples/ChuaCircuit/*/')
+        >>> sims.sort()
+        >>> sim_indices, indices, times = sims.crossings('C1.v', 0, 'rising')
+        >>> sim_indices, indices
+        (array([1, 1]), array([0, 0]))
+        >>> [round(time, 1) for time in times]
+        [480.2, 1333.7]
+        """
+        sim_indices = []
+        all_indices = []
+        all_times = []
+        for i, sim in enumerate(self):
+            indices, times = sim.crossings(names, level, direction)
+            sim_indices.append(np.repeat(i, len(indices)))
+            all_indices.append(indices)
+            all_times.append(times)
+        return (np.concatenate(sim_indices), np.concatenate(all_indices),
+                np.concatenate(all_times))
+
+    def ensemble(self, name, times=None,
+                 stats=['mean', 'p05', 'p95', 'min', 'max'], sketch_size=1000,
+                 seed=0):
+        """Return statistics of a variable across the simulations at each of
+        some times.
+
+        The simulations are processed one at a time, so the trajectories of
+        all the simulations are never held at once.  This works well with a
+        lazily loaded list (see the *max_loaded* argument of
+        :class:`SimResList`), which reads the next simulations in the
+        background.
+
+        **Parameters:**
+
+        - *name*: Name of the variable
+
+        - *times*: Times in seconds at which the variable should be sampled
+
+             If *times* is 'None' (default), the recorded times of the
+             variable in the first simulation are used.  Values are linearly
+             interpolated as in :meth:`stack`.
+
+        - *stats*: List of the statistics to calculate:
+
+             - 'mean', 'var' (variance), and 'std' (standard deviation):
+               Calculated in one pass using Welford's method (with the
+               population variance)
+
+             - 'min' and 'max'
+
+             - 'p*NN*' (e.g., 'p05' or 'p99.5'): Percentile *NN*
+
+        - *sketch_size*: Maximum number of simulations used for the
+          percentiles
+
+             If there are more simulations, the percentiles are estimated from
+             a uniform random sample of this many simulations (reservoir
+             sampling).  The memory used is proportional to *sketch_size* times
+             the number of times.
+
+        - *seed*: Seed for the random sample (so that the estimates are
+          repeatable)
+
+        **Returns:** Ordered dictionary with the statistics as keys and arrays
+        of their values (in base units) at the times as values
+
+        A :class:`ValueError` is raised if the list is empty.
+
+        **Example:**
+
+        >>> sims = SimResList('examples/ChuaCircuit/*/')
+        >>> stats = sims.ensemble('L.L', times=[0, 1000],
+        ...                       stats=['mean', 'std', 'p50', 'max'])
+        >>> for stat, values in stats.items():
+        ...     print(stat, values.tolist())
+        ('mean', [18.0, 18.0])
+        ('std', [3.0, 3.0])
+        ('p50', [18.0, 18.0])
+        ('max', [21.0, 21.0])
+
+        >>> SimResList().ensemble('L.L')
+        Traceback (most recent call last):
+        ...
+        ValueError: There are no simulations to summarize.
+        """
+        if not len(self):
+            raise ValueError("There are no simulations to summarize.")
+
+        # Parse the percentiles.
+        percentiles = []
+        for stat in stats:
+            if stat in ['mean', 'var', 'std', 'min', 'max']:
+                continue
+            match = regexp.match(r'p(\d+(?:\.\d*)?)$', stat)
+            if not match or float(match.group(1)) > 100:
+                raise ValueError("The statistic must be 'mean', 'var', 'std', "
+                                 "'min', 'max', or 'p' followed by a "
+                                 "percentile (e.g., 'p05'), not %r." % stat)
+            percentiles.append(float(match.group(1)))
+
+        # Accumulate the statistics one simulation at a time.
+        buffers = []
+
+        def allocate(run, n_times):
+            """Return the array to hold the values of a simulation."""
+            if not buffers:
+                buffers.append(np.empty((n_times, 1)))
+            return buffers[0]
+
+        random = np.random.RandomState(seed)
+        reservoir = None
+        count = 0
+        for values in _resample(self, [name], times, allocate):
+            values = values[:, 0]
+            count += 1
+            if count == 1:
+                mean = values.copy()
+                M2 = np.zeros_like(values)
+                minimum = values.copy()
+                maximum = values.copy()
+            else:
+                delta = values - mean
+                mean += delta / count
+                M2 += delta * (values - mean)
+                np.minimum(minimum, values, out=minimum)
+                np.maximum(maximum, values, out=maximum)
+            if percentiles:
+                if reservoir is None:
+                    reservoir = np.empty((min(sketch_size, len(self)),
+                                          len(values)))
+                if count <= sketch_size:
+                    reservoir[count - 1] = values
+                else:
+                    i = random.randint(count)
+                    if i < sketch_size:
+                        reservoir[i] = values
+        assert count > 0, "There are no simulations."
+
+        # Collect the results.
+        if percentiles:
+            percentiles = dict(zip(percentiles, np.percentile(
+                reservoir[:min(count, sketch_size)], percentiles, axis=0)))
+        results = OrderedDict()
+        for stat in stats:
+            if stat == 'mean':
+                results[stat] = mean
+            elif stat == 'var':
+                results[stat] = M2 / count
+            elif stat == 'std':
+                results[stat] = np.sqrt(M2 / count)
+            elif stat == 'min':
+                results[stat] = minimum
+            elif stat == 'max':
+                results[stat] = maximum
+            else:
+                results[stat] = percentiles[float(stat[1:])]
+        return results
+
+    @classmethod
+    def from_catalog(cls, condition=None, catalog='catalog.sqlite', **kwargs):
+        """Return a list of the simulations in a catalog that meet a
+        condition.
+
+        The simulations are selected without opening their files.  The paths
+        in the catalog are used as they are (without wildcards).
+
+        **Parameters:**
+
+        - *condition*: Condition as an SQL expression of the constants of the
+          simulations (e.g., ``"L.L > 15 and StopTime >= 1e4"``; see
+          :meth:`modelicares.catalog.Catalog.query`)
+
+        - *catalog*: :class:`~modelicares.catalog.Catalog` or the filename of
+          its database
+
+             An :class:`IOError` is raised if the file doesn't exist.
+
+        - *\*\*kwargs*: Additional arguments for :class:`SimResList` (e.g.,
+          *max_loaded* to load the simulations lazily)
+
+        **Example:**
+
+        >>> from modelicares.catalog import Catalog
+        >>> catalog = Catalog(':memory:')
+        >>> catalog.refresh('examples/ChuaCircuit', processes=1)
+        2
+        >>> sims = SimResList.from_catalog('L.L < 20', catalog)
+        >>> sims['L.L'].value
+        [15 H]
+
+        >>> SimResList.from_catalog(catalog='missing.sqlite')
+        Traceback (most recent call last):
+        ...
+        IOError: The catalog "missing.sqlite" doesn't exist.
+        """
+        if isinstance(catalog, string_types):
+            if not os.path.isfile(catalog):
+                raise IOError('The catalog "%s" doesn\'t exist.' % catalog)
+            from .catalog import Catalog
+            with Catalog(catalog) as catalog:
+                return cls.from_catalog(condition, catalog, **kwargs)
+        loader = _get_loader(kwargs)
+        fnames = catalog.query(condition)
+        return cls(_get_sims(fnames, loader)) if fnames else cls()
 
     def find(self, pattern=None, re=False, constants_only=False):
         r"""Find the names of variables that are present in all of the
@@ -2072,12 +4697,34 @@ class SimResList(ResList):
            >>> sorted(sims.find('^[^.]*.v$', re=True))
            ['C1.v', 'C2.v', 'G.v', 'L.v', 'Nr.v', 'Ro.v']
         """
-        # Get a set of all the variables or just the constants.
-        names = set.intersection(*[set(sim.find(pattern, re, constants_only))
-                                   for sim in self])
+        # Find the names of all the variables or just the constants that are
+        # in all of the simulations and match them against the pattern.
+        names = self._name_index(constants_only).common(self)
+        return util.match(names, pattern, re)
 
-        # Return the set as a sorted list.
-        return sorted(names)
+    def first_exceedance(self, names, level):
+        """Return the times at which variables first exceed a level in each of
+        the simulations.
+
+        The parameters are the same as those of
+        :meth:`SimRes.first_exceedance`.
+
+        **Returns:** 2D array of the times in seconds, with a row for each
+        simulation and a column for each variable
+
+        **Example:**
+
+        >>> sims = SimResList('examples/ChuaCircuit/*/')
+        >>> sims.sort()
+        >>> sims.first_exceedance(['C1.v', 'L.v'], 0.5).shape
+        (2, 2)
+        """
+        if isinstance(names, string_types):
+            names = [names]
+        results = np.empty((len(self), len(names)))
+        for i, sim in enumerate(self):
+            results[i] = sim.first_exceedance(names, level)
+        return results
 
     def get_unique_IVs(self, constants_only=False, tolerance=1e-10):
         """Return a dictionary of initial values that are different among the
@@ -2092,6 +4739,8 @@ class SimResList(ResList):
         - *tolerance*: Maximum variation allowed for values to still be
           considered the same
 
+             The variation is compared in base units.
+
         **Example:**
 
         .. testsetup::
@@ -2117,14 +4766,96 @@ class SimResList(ResList):
               2/dsres.mat
            >>> sims.get_unique_IVs()['L.L']
            [15.0, 21.0]
+
+        With more runs, each value has an entry per run:
+
+        >>> sims = SimResList('examples/ChuaCircuit/*/',
+        ...                   'examples/ChuaCircuit.mat')
+        >>> sims.sort()
+        >>> IVs = sims.get_unique_IVs(constants_only=True)
+        >>> sorted(IVs)
+        ['L.L']
+        >>> IVs['L.L']
+        [18 H, 15 H, 21 H]
         """
-        unique_IVs = {}
-        for name in self.find(constants_only=constants_only):
-            IVs = self[name].IV
-            if max(IVs) - min(IVs) > tolerance:
-                unique_IVs[name] = IVs
+        # Build a matrix of the initial values (simulations by names) from the
+        # first row of each trajectory block, one block at a time.
+        names = self.names
+        IVs = np.empty((len(self), len(names)))
+        constant = np.ones(len(names), bool)
+        for run, sim in enumerate(self):
+            variables = [sim[name] for name in names]
+            groups, others = _group_by_block(variables)
+            for block, timebase, indices, columns, signs in groups:
+                IVs[run, indices] = block[0, columns] * signs
+                if constants_only:
+                    constant[indices] &= _BATCH_STATS['is_constant'](
+                        block, columns, signs, timebase)
+            for i in others:
+                values = variables[i]._samples.values
+                IVs[run, i] = values[0]
+                if constants_only:
+                    constant[i] &= np.max(values) == np.min(values)
+
+        # Select the variables with initial values that vary.
+        indices = np.flatnonzero((np.ptp(IVs, axis=0) > tolerance) & constant)
+        unique_names = [names[i] for i in indices]
+        if not U._use_quantities:
+            return dict(zip(unique_names, IVs[:, indices].T.tolist()))
+        unique_IVs = dict((name, []) for name in unique_names)
+        for sim, row in zip(self, IVs[:, indices]):
+            for name, value in zip(unique_names, row):
+                unique_IVs[name].append(sim[name]._wrap(value))
         return unique_IVs
 
+    def groupby(self, names):
+        """Group the simulations by the values of parameters.
+
+        **Parameters:**
+
+        - *names*: Name of a parameter or list of names (see :meth:`params`)
+
+        **Returns:** Ordered dictionary with the values of the parameter (or
+        tuples of values of the parameters) as keys, in ascending order, and
+        :class:`SimResList` instances as values
+
+        Simulations without the parameters are excluded.  The trajectories
+        aren't accessed.
+
+        **Example:**
+
+        >>> sims = SimResList('examples/ChuaCircuit/*/')
+        >>> groups = sims.groupby('L.L')
+        >>> list(groups)
+        [15.0, 21.0]
+        >>> len(groups[15.0])
+        1
+        """
+        entries = list(list.__iter__(self))
+        groups = OrderedDict()
+        for key, positions in sorted(self.params().groupby(names).indices
+                                     .items()):
+            groups[key] = self.__class__([entries[i] for i in positions])
+        return groups
+
+    def memory_usage(self, deep=True):
+        """Return a dictionary of the memory used by the simulation results in
+        bytes.
+
+        The entries are the same as those from :meth:`SimRes.memory_usage`,
+        except that *owned* and *shared* refer to memory used by one or by
+        several of the simulations.  Memory that several simulations share is
+        only counted once.
+
+        **Example:**
+
+        >>> sims = SimResList('examples/ChuaCircuit/*/')
+        >>> usage = sims.memory_usage()
+        >>> usage['shared']
+        0
+        """
+        return _memory_usage(self, deep, by_sim=True)
+
     @property
     def names(self):
         """List of all of the names of variables that are present in all of the
@@ -2138,8 +4869,128 @@ class SimResList(ResList):
         >>> sims.names # doctest: +ELLIPSIS
         ['C1.C', 'C1.der(v)', 'C1.i', 'C1.n.i', ..., 'Time']
         """
-        names = set.intersection(*[set(sim) for sim in self])
-        return sorted(names)
+        return self._name_index().common(self)
+
+    def params(self):
+        """Return a `pandas DataFrame`_ of the parameters of the simulations.
+
+        The rows are the simulations (by index in the list) and the columns are
+        the names of the constants recorded in the first trajectory matrix
+        (e.g., parameters).  The values are in base units.  A constant that
+        isn't in a simulation is NaN.
+
+        The table is built once from the first trajectory matrix of each
+        simulation and is kept until simulations are added or removed.  Lazily
+        loaded simulations (see the *max_loaded* argument of
+        :class:`SimResList`) that aren't loaded are read only up to that
+        matrix.  Each call returns a new copy of the table.
+
+        **Example:**
+
+        >>> sims = SimResList('examples/ChuaCircuit/*/')
+        >>> sims.sort()
+        >>> sims.params()['L.L'].tolist()
+        [15.0, 21.0]
+
+        The simulations of a lazily loaded list aren't loaded:
+
+        >>> sims = SimResList('examples/ChuaCircuit/*/', max_loaded=1)
+        >>> sims.sort()
+        >>> params = sims.params()
+        >>> params['L.L'] = 0 # Doesn't change the cached table
+        >>> sims.params()['L.L'].tolist()
+        [15.0, 21.0]
+        >>> sims[0].loaded
+        False
+        """
+        # The cache holds the simulations themselves (not only their ids) so
+        # that a new simulation can't be mistaken for one that was removed.
+        sims = tuple(list.__iter__(self))
+        if (self._params is not None and len(self._params[0]) == len(sims)
+                and all(cached is sim for cached, sim
+                        in zip(self._params[0], sims))):
+            return self._params[1].copy()
+
+        # Gather the constants of each simulation and place them by name.
+        positions = OrderedDict()
+        runs = []
+        for sim in sims:
+            if isinstance(sim, LazySimRes) and not sim.loaded:
+                # Read only the first data matrix instead of loading the
+                # simulation.
+                names, values = _run_constants(dymola(sim.fname,
+                                                      constants_only=True))
+            else:
+                names, values = _run_constants(sim)
+            runs.append((np.array([positions.setdefault(name, len(positions))
+                                   for name in names], int), values))
+        table = np.full((len(runs), len(positions)), np.nan)
+        for row, (columns, values) in zip(table, runs):
+            row[columns] = values
+        frame = DataFrame(table, columns=list(positions), copy=False)
+        self._params = sims, frame
+        return frame.copy()
+
+    def stack(self, names, times=None):
+        """Return the values of variables across all of the simulations as a
+        single array.
+
+        **Parameters:**
+
+        - *names*: Name of a variable or list of names
+
+        - *times*: Times in seconds at which the values should be sampled
+
+             If *times* is 'None' (default), the recorded times of the first
+             variable in the first simulation are used.  Values recorded at
+             other times are linearly interpolated and held constant beyond
+             the recorded times.
+
+        **Returns:** Array of the values (in base units, as from
+        :meth:`Variable.raw_values`) with dimensions of simulations by times if
+        *names* is a string or simulations by times by variables if *names* is
+        a list
+
+        The result is a new array, so the values are always copied.  They are
+        gathered with one operation per trajectory block of each simulation.
+        Blocks with recorded times that match the requested times are copied
+        without interpolation; the others are interpolated using a plan that is
+        computed once for each distinct set of recorded times.
+
+        A :class:`ValueError` is raised if the list is empty.
+
+        **Example:**
+
+        >>> sims = SimResList('examples/ChuaCircuit/*/')
+        >>> sims.sort()
+        >>> values = sims.stack(['C1.v', 'L.L'], times=[0, 10])
+        >>> values.shape
+        (2, 2, 2)
+        >>> [round(value, 3) for value in values[:, 1, 0]]
+        [3.803, 3.803]
+        >>> values[:, 1, 1].tolist()
+        [15.0, 21.0]
+
+        >>> SimResList().stack('L.L')
+        Traceback (most recent call last):
+        ...
+        ValueError: There are no simulations to stack.
+        """
+        if not len(self):
+            raise ValueError("There are no simulations to stack.")
+        single = isinstance(names, string_types)
+        names = [names] if single else list(names)
+        arrays = [] # The result (once its size is known)
+
+        def allocate(run, n_times):
+            """Return the part of the result for a simulation."""
+            if not arrays:
+                arrays.append(np.empty((len(self), n_times, len(names))))
+            return arrays[0][run]
+
+        for _ in _resample(self, names, times, allocate):
+            pass
+        return arrays[0][:, :, 0] if single else arrays[0]
 
     def __contains__(self, item):
         """Return `True` if a variable is present in all of the simulation
@@ -2165,7 +5016,7 @@ class SimResList(ResList):
         True
         """
         if isinstance(item, string_types):
-            return all(item in sim for sim in self)
+            return bool(np.all(self._name_index().membership(self, item)))
         return list.__contains__(self, item)
 
     def __getattr__(self, attr):
@@ -2224,6 +5075,79 @@ class SimResList(ResList):
         # Return a single simulation (SimRes instance).
         return list.__getitem__(self, i)
 
+    def where(self, condition):
+        """Return a list of the simulations with parameters that meet a
+        condition.
+
+        **Parameters:**
+
+        - *condition*: Function that takes the table of parameters (see
+          :meth:`params`) and returns a Boolean array or series with an entry
+          for each simulation
+
+             The trajectories aren't accessed.
+
+        **Example:**
+
+        >>> sims = SimResList('examples/ChuaCircuit/*/')
+        >>> sims.sort()
+        >>> selected = sims.where(lambda p: p['L.L'] > 15)
+        >>> selected['L.L'].value
+        [21 H]
+        """
+        mask = np.asarray(condition(self.params()), bool)
+        entries = list(list.__iter__(self))
+        return self.__class__([entries[i] for i in np.flatnonzero(mask)])
+
+    def _name_index(self, constants_only=False):
+        """Return the index of the names of all the variables or just the
+        constants in the simulations (see :class:`_NameIndex`).
+
+        The index is kept with the list and updated for the simulations that
+        have been added or removed since it was last used.
+        """
+        if self._name_indices is None:
+            self._name_indices = {}
+        try:
+            return self._name_indices[constants_only]
+        except KeyError:
+            index = self._name_indices[constants_only] = _NameIndex(
+                constants_only)
+            return index
+
+    def __iter__(self):
+        """Iterate over the simulations.
+
+        The next simulations that are loaded lazily (see :class:`LazySimRes`)
+        are read ahead on a background thread.
+        """
+        for i, sim in enumerate(list.__iter__(self)):
+            if isinstance(sim, LazySimRes) and sim._loader.prefetch:
+                upcoming = list.__getitem__(
+                    self, slice(i + 1, i + 1 + sim._loader.prefetch))
+                sim._loader.read_ahead([entry.fname for entry in upcoming
+                                        if isinstance(entry, LazySimRes)
+                                        and entry._loader is sim._loader])
+            yield sim
+
+    def __reduce__(self):
+        """Pickle the list of simulation results.
+
+        Each simulation is pickled as described in :meth:`SimRes.__reduce__`.
+        Entries that are loaded lazily are pickled as references to their
+        files.
+
+        **Example:**
+
+        >>> import pickle
+        >>> sims = SimResList('examples/ChuaCircuit/*/')
+        >>> len(pickle.loads(pickle.dumps(sims, 2)))
+        2
+        """
+        state = dict((key, value) for key, value in self.__dict__.items()
+                     if key not in ['_name_indices', '_params'])
+        return (self.__class__, (list(list.__iter__(self)),), state or None)
+
     def __str__(self):
         """Return str(self).
 
@@ -2274,7 +5198,8 @@ class SimResList(ResList):
         *\*args* and *\*\*kwargs* are propagated to :meth:`SimRes.plot`
         (then to :func:`modelicares.util.plot` and finally to
         :func:`matplotlib.pyplot.plot`), except for the following keyword
-        arguments:
+        arguments.  This includes *decimate*, so the curves of each simulation
+        can be reduced to the resolution of the axes.
 
         - *suffixes*: Suffix or list of suffixes for the legends (see
           :meth:`SimRes.plot`)
@@ -2374,10 +5299,9 @@ class SimResList(ResList):
            >>> sims.unique_names['L.L']
            [True, False]
         """
-        sets = [set(sim.names) for sim in self]
-        all_names = set.union(*sets)
-        unique_names = all_names
-        return {name: [name in sim for sim in self] for name in unique_names}
+        index = self._name_index()
+        return {name: index.membership(self, name).tolist()
+                for name in index.partial(self)}
 
 
 class SimResSequence(SimRes):
@@ -2416,6 +5340,16 @@ class SimResSequence(SimRes):
     The :attr:`description` and :attr:`display_unit` of each variable is taken
     from the first simulation.  It is assumed but not checked that these are the
     same for all of the simulations.
+
+    The values of the simulations aren't copied into one array.  Each variable
+    refers to its values in each of the simulations, which are concatenated
+    only when all of them are requested (e.g., by :meth:`Variable.values` with
+    no arguments).  Statistics, time ranges, and interpolation are calculated
+    from the simulations separately.
+
+    Use :meth:`append` to add a simulation that continues from the end of the
+    sequence without reloading the others and :meth:`copy` to keep a sequence
+    that isn't changed by later appends.
     """
 
     def __init__(self, *args):
@@ -2425,22 +5359,32 @@ class SimResSequence(SimRes):
         """
         # Load and sort the simulations by start time.
         sims = SimResList(*args)
-        sims.sort(key=lambda sim: sim['Time'].IV)
+        sims.sort(key=lambda sim: sim['Time']._raw_stat('IV'))
 
         # Check for overlap.
-        times = sims['Time']
-        if np.any(times.FV[0:-1] > times.IV[1:]):
+        starts = np.array([sim['Time']._raw_stat('IV') for sim in sims])
+        stops = np.array([sim['Time']._raw_stat('FV') for sim in sims])
+        if np.any(stops[0:-1] > starts[1:]):
             raise ValueError("The simulations overlap.")
 
-        # Retrieve the times and values of each variable from the simulations.
-        # Take the description, unit, and display unit of each variable from the
-        # first simulation.
+        # Refer to the samples of each variable in each of the simulations
+        # rather than concatenating them (see ChunkedSamples).  Take the
+        # description, unit, and display unit of each variable from the first
+        # simulation.  The variables that share time bases in all of the
+        # simulations also share the chunked time base.
+        timebases = {}
         def get_variable(name):
             entries = sims[name]
             first = entries[0]
+            chunks = [entry._samples for entry in entries]
+            key = tuple(id(chunk.timebase) for chunk in chunks)
+            try:
+                timebase = timebases[key]
+            except KeyError:
+                timebase = timebases[key] = ChunkedTimeBase(
+                    [chunk.timebase for chunk in chunks])
 
-            return Variable(Samples(np.concatenate(entries.times()),
-                                    np.concatenate(entries.values())),
+            return Variable(ChunkedSamples(timebase, chunks),
                             first.dimension,
                             first.display_unit,
                             first.description)
@@ -2449,9 +5393,106 @@ class SimResSequence(SimRes):
 
         # Set the other attributes.
         sim0 = sims[0]
-        self.tool = sim0.tool if len(set(sims.tool)) == 1 else "multiple tools"
+        tools = set(sim.tool for sim in sims)
+        self.tool = sim0.tool if len(tools) == 1 else "multiple tools"
         self.fname = sim0.fname
-        self.fnames = sims.fnames
+        self.fnames = [sim.fname for sim in sims]
+
+    def append(self, sim):
+        """Add a simulation that continues from the end of the sequence.
+
+        **Parameters:**
+
+        - *sim*: :class:`SimRes` instance or the name of a file that can be
+          loaded by :class:`SimRes`
+
+             The simulation must not start before the last one in the sequence
+             stops.
+
+        Only the new simulation is loaded; the values of the simulations
+        already in the sequence aren't accessed.  The variables that aren't in
+        the new simulation are removed from the sequence.  Derived variables
+        (e.g., from :meth:`Variable.cumintegral`) are discarded.
+
+        **Example:**
+
+        >>> sims = SimResSequence('examples/ChuaCircuit-intervals/dsres1.mat',
+        ...                       'examples/ChuaCircuit-intervals/dsres2.mat')
+        >>> print(sims['Time'].FV)
+        1480 s
+        >>> sims.append('examples/ChuaCircuit-intervals/dsres3.mat')
+        >>> print(sims['Time'].FV)
+        2500 s
+        >>> [os.path.basename(fname) for fname in sims.fnames]
+        ['dsres1.mat', 'dsres2.mat', 'dsres3.mat']
+
+        Between 1480 and 1530 s (the gap before the third simulation), the
+        values are interpolated:
+
+        >>> print(sims['C1.v'].values(t=1505))
+        -2.36078 V
+        """
+        if isinstance(sim, string_types):
+            sim = SimRes(sim)
+        if sim['Time']._raw_stat('IV') < self['Time']._raw_stat('FV'):
+            raise ValueError("The simulation starts before the last one in the "
+                             "sequence stops.")
+
+        # Add the samples of the new simulation to each variable.  The
+        # variables that share time bases in all of the simulations continue
+        # to share them.
+        timebases = {}
+        for name in list(self):
+            if name not in sim:
+                dict.__delitem__(self, name)
+                continue
+            variable = self[name]
+            samples = variable._samples
+            new = sim[name]._samples
+            new_chunks = getattr(new, 'chunks', [new])
+            key = id(samples.timebase), id(new.timebase)
+            try:
+                timebase = timebases[key]
+            except KeyError:
+                timebase = timebases[key] = ChunkedTimeBase(
+                    samples.timebase.chunks
+                    + [chunk.timebase for chunk in new_chunks])
+            variable._samples = ChunkedSamples(timebase,
+                                               samples.chunks + new_chunks)
+            variable._cache = None
+
+        # Update the other attributes.
+        if sim.tool != self.tool:
+            self.tool = "multiple tools"
+        self.fnames += getattr(sim, 'fnames', [sim.fname])
+
+    def copy(self):
+        """Return a copy of the sequence that isn't changed by :meth:`append`.
+
+        The variables are new, but they refer to the same samples, so the
+        values aren't copied.  The cost is proportional to the number of
+        variables, not to the number of simulations.
+
+        **Example:**
+
+        >>> sims = SimResSequence('examples/ChuaCircuit-intervals/dsres1.mat',
+        ...                       'examples/ChuaCircuit-intervals/dsres2.mat')
+        >>> earlier = sims.copy()
+        >>> sims.append('examples/ChuaCircuit-intervals/dsres3.mat')
+        >>> print(earlier['Time'].FV)
+        1480 s
+        >>> len(earlier.fnames)
+        2
+        """
+        sequence = self.__class__.__new__(self.__class__)
+        sequence.__dict__.update(self.__dict__)
+        sequence.fnames = list(self.fnames)
+        dict.update(sequence, ((name, Variable(variable._samples,
+                                               variable._dimension,
+                                               variable._display_unit,
+                                               variable.description))
+                               for name, variable in self.items()))
+        return sequence
 
 
 if __name__ == '__main__':
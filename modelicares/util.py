@@ -44,6 +44,8 @@ r"""Classes and functions to help plot and interpret experimental data
 - :func:`cleanpath` - Clean up a file path by replacing '~' with the user
   directory, making the path absolute, and replacing '/' with '\' on Windows.
 
+- :func:`decimate` - Reduce the number of points in a curve for plotting.
+
 - :func:`figure` - Create a figure and set its label.
 
 - :func:`flatten_dict` - Flatten a nested dictionary.
@@ -58,6 +60,9 @@ r"""Classes and functions to help plot and interpret experimental data
 
 - :func:`match` - Reduce a list of strings to those that match a pattern.
 
+- :func:`match_lists` - Reduce each of several lists of strings to those that
+  match a pattern.
+
 - :func:`modelica_str` - Express a Python_ value as a Modelica_ string.
 
 - :func:`next_nonblank` - Advance to the next non-blank line of a file and
@@ -117,9 +122,9 @@ import subprocess
 import sys
 import time
 
-from collections import MutableMapping
+from collections import MutableMapping, OrderedDict
 from decimal import Decimal
-from fnmatch import fnmatchcase
+from fnmatch import translate
 from functools import wraps
 from glob import glob
 from itertools import cycle
@@ -130,6 +135,7 @@ from matplotlib.cbook import iterable
 from matplotlib.lines import Line2D
 from natu.util import flatten_list
 from six import string_types
+from threading import Lock
 
 # Load the getSaveFileName function from an available Qt installation.
 try:
@@ -152,6 +158,12 @@ except ImportError:
 # Function to close all open figures
 closeall = Gcf.destroy_all
 
+# Compiled matchers for match() and match_lists(), keyed by (pattern, re) and
+# ordered from the least to the most recently used
+_MATCHERS = OrderedDict()
+_MATCHERS_LOCK = Lock()
+_MATCHERS_MAXSIZE = 256
+
 
 def accept_dict(func):
     """Decorator to also accept a dictionary as a single positional argument
@@ -411,6 +423,101 @@ def cleanpath(path):
     return os.path.abspath(os.path.expanduser(os.path.normpath(path)))
 
 
+def _decimate_minmax(y, n_points):
+    """Return the indices of the minimum and maximum of *y* in each of
+    *n_points*/2 bins, in order.
+    """
+    n = len(y)
+    n_bins = max(n_points // 2, 1)
+    bin_size = -(-n // n_bins) # Ceiling division
+    padded = np.empty(n_bins * bin_size, dtype=np.result_type(y, float))
+    padded[:n] = y
+    padded[n:] = y[-1]
+    bins = padded.reshape(n_bins, bin_size)
+    offsets = np.arange(n_bins)[:, np.newaxis] * bin_size
+    indices = np.hstack([bins.argmin(axis=1)[:, np.newaxis],
+                         bins.argmax(axis=1)[:, np.newaxis]]) + offsets
+    indices = np.minimum(np.sort(indices, axis=1).ravel(), n - 1)
+    return np.unique(np.concatenate([[0], indices, [n - 1]]))
+
+
+def _decimate_lttb(x, y, n_points):
+    """Return the indices of the points selected by the
+    largest-triangle-three-buckets algorithm.
+    """
+    n = len(y)
+    edges = np.linspace(1, n - 1, n_points - 1).astype(int)
+    indices = np.empty(n_points, int)
+    indices[0] = 0
+    indices[-1] = n - 1
+    a = 0
+    for i in range(n_points - 2):
+        lo, hi = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            x_next = x[hi:edges[i + 2]].mean()
+            y_next = y[hi:edges[i + 2]].mean()
+        else:
+            x_next = x[-1]
+            y_next = y[-1]
+        areas = np.abs((x[a] - x_next) * (y[lo:hi] - y[a])
+                       - (x[a] - x[lo:hi]) * (y_next - y[a]))
+        a = lo + areas.argmax()
+        indices[i + 1] = a
+    return indices
+
+
+def decimate(x, y, n_points, method='minmax'):
+    """Reduce the number of points in a curve for plotting.
+
+    **Parameters:**
+
+    - *x*: Monotonic x-axis values (e.g., time)
+
+    - *y*: y-axis values
+
+    - *n_points*: Approximate maximum number of points to keep
+
+         For plotting, this is typically twice the width of the axes in
+         pixels.  If there aren't more points than this, the curve is returned
+         as is.
+
+    - *method*: 'minmax' (default) to keep the minimum and maximum of each
+      group of points or 'lttb' to use the largest-triangle-three-buckets
+      algorithm
+
+         The 'minmax' method draws the same envelope as the full curve, so
+         peaks and events are always preserved.  The 'lttb' method gives a
+         closer look to the original curve at a given number of points but
+         may round off narrow peaks.
+
+    **Returns:**
+
+    1. Decimated x-axis values
+
+    2. Decimated y-axis values
+
+    **Example:**
+
+    >>> x = np.linspace(0, 1, 10001)
+    >>> y = np.sin(20*x)
+    >>> y[5000] = 10
+    >>> x_dec, y_dec = decimate(x, y, 200)
+    >>> len(x_dec) <= 202, y_dec.max()
+    (True, 10.0)
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    if len(y) <= max(n_points, 2):
+        return x, y
+    if method == 'minmax':
+        indices = _decimate_minmax(y, n_points)
+    elif method == 'lttb':
+        indices = _decimate_lttb(x, y, max(n_points, 3))
+    else:
+        raise ValueError("The decimation method must be 'minmax' or 'lttb'.")
+    return x[indices], y[indices]
+
+
 def figure(label='', *args, **kwargs):
     r"""Create a figure and set its label.
 
@@ -688,6 +795,113 @@ def load_csv(fname, header_row=0, first_data_row=None, types=None, **kwargs):
     return data
 
 
+def _literal_fnmatch(pattern):
+    """Return the longest substring that every string matching a shell-style
+    pattern must contain.
+    """
+    runs = ['']
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char in '*?':
+            runs.append('')
+        elif char == '[':
+            # Skip the sequence.  As in fnmatch, an unclosed bracket is a
+            # literal character.
+            j = i + 1
+            if j < len(pattern) and pattern[j] == '!':
+                j += 1
+            if j < len(pattern) and pattern[j] == ']':
+                j += 1
+            j = pattern.find(']', j)
+            if j < 0:
+                runs[-1] += char
+            else:
+                runs.append('')
+                i = j
+        else:
+            runs[-1] += char
+        i += 1
+    return max(runs, key=len)
+
+
+def _literal_re(pattern):
+    """Return the longest substring that every string matching a regular
+    expression must contain.
+
+    This is conservative; it returns '' if the pattern has alternatives, groups,
+    or escapes that it does not recognize.
+    """
+    if '|' in pattern or '(' in pattern:
+        return ''
+    runs = ['']
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '\\':
+            i += 1
+            if i == len(pattern):
+                return ''
+            char = pattern[i]
+            if char in 'dDsSwWbBAZ':
+                runs.append('')
+            elif char.isalnum():
+                return '' # Hex or octal escape, backreference, etc.
+            else:
+                runs[-1] += char
+        elif char in '*?{':
+            # The previous character is optional.
+            runs[-1] = runs[-1][:-1]
+            runs.append('')
+            if char == '{':
+                i = pattern.find('}', i)
+                if i < 0:
+                    return ''
+        elif char == '+':
+            runs.append('')
+        elif char == '[':
+            # Skip the set.
+            j = i + 1
+            if j < len(pattern) and pattern[j] == '^':
+                j += 1
+            if j < len(pattern) and pattern[j] == ']':
+                j += 1
+            while j < len(pattern) and pattern[j] != ']':
+                j += 2 if pattern[j] == '\\' else 1
+            runs.append('')
+            i = j
+        elif char in '.^$]}':
+            runs.append('')
+        else:
+            runs[-1] += char
+        i += 1
+    return max(runs, key=len)
+
+
+def _get_matcher(pattern, re=False):
+    """Return a literal substring required by a pattern and a function that
+    returns a true value if a string matches the pattern.
+
+    The results are cached for the most recently used patterns.  See
+    :func:`match` for a description of the arguments.
+    """
+    key = (pattern, re)
+    with _MATCHERS_LOCK:
+        try:
+            matcher = _MATCHERS.pop(key)
+        except KeyError:
+            if re:
+                matcher = (_literal_re(pattern),
+                           regexp.compile(pattern).search)
+            else:
+                matcher = (_literal_fnmatch(pattern),
+                           regexp.compile(translate(pattern)).match)
+            if len(_MATCHERS) >= _MATCHERS_MAXSIZE:
+                _MATCHERS.popitem(last=False)
+        _MATCHERS[key] = matcher
+    return matcher
+
+
 def match(strings, pattern=None, re=False):
     r"""Reduce a list of strings to those that match a pattern.
 
@@ -736,6 +950,10 @@ def match(strings, pattern=None, re=False):
     >>> match(['apple', 'orange', 'banana'], '*e')
     ['apple', 'orange']
 
+    The compiled form of the most recently used patterns is cached.  If every
+    match must contain a literal substring (e.g., 'Ro.' in 'Ro.*'), then the
+    strings are screened for it before the pattern is applied.
+
 
     .. _Modelica: http://www.modelica.org/
     """
@@ -743,13 +961,46 @@ def match(strings, pattern=None, re=False):
                            else pattern == '*'):
         return list(strings)  # Shortcut
     else:
-        if re:
-            matcher = regexp.compile(pattern).search
-        else:
-            matcher = lambda name: fnmatchcase(name, pattern)
+        literal, matcher = _get_matcher(pattern, re)
+        if literal:
+            strings = [string for string in strings if literal in string]
         return list(filter(matcher, strings))
 
 
+def match_lists(lists, pattern=None, re=False):
+    r"""Reduce each of several lists of strings to those that match a pattern.
+
+    This is the same as ``[match(strings, pattern, re) for strings in lists]``,
+    except that lists with the same contents (e.g., the variable names from
+    runs of the same model) are only matched once.  The entries of the result
+    are the same list object in that case.
+
+    **Parameters:**
+
+    - *lists*: Iterable of lists of strings
+
+    - *pattern*: Case-sensitive string used for matching (see :func:`match`)
+
+    - *re*: `True` to use regular expressions (*False* to use shell style)
+
+    **Example:**
+
+    >>> fruits = ['apple', 'orange', 'banana']
+    >>> match_lists([fruits, ['grape', 'kiwi'], list(fruits)], '*e')
+    [['apple', 'orange'], ['grape'], ['apple', 'orange']]
+    """
+    matches = {}
+    results = []
+    for strings in lists:
+        key = tuple(strings)
+        try:
+            results.append(matches[key])
+        except KeyError:
+            matches[key] = match(key, pattern, re)
+            results.append(matches[key])
+    return results
+
+
 def modelica_str(value):
     """Express a Python_ value as a Modelica_ string.
 